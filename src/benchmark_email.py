@@ -0,0 +1,184 @@
+import argparse
+import html
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from nurture_feed.config import TARGET_URL
+from nurture_feed.email_templates import FragmentCache, render_digest, truncate_email_text
+from nurture_feed.models import Announcement
+from nurture_feed.utils import make_id
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark notification email rendering for a large digest.")
+    parser.add_argument("--items", type=int, default=1000, help="Announcements in the digest (default: 1000).")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed renders per variant; best is reported (default: 20).")
+    return parser.parse_args()
+
+
+def make_items(count: int) -> list[Announcement]:
+    base = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=8)))
+    items: list[Announcement] = []
+    for index in range(count):
+        title = f"Announcement {index}: P{index % 6 + 1} <Science> & Maths update"
+        link = f"https://nurture.diveanalytics.com/announcements/{index}"
+        items.append(
+            Announcement(
+                id=make_id(title, link),
+                title=title,
+                link=link,
+                author=f"Teacher {index % 37}",
+                description=("Please return the \"consent\" form & payment by Friday. " * 8).strip(),
+                pub_date_raw=f"{index % 23 + 1} hours ago",
+                pub_date=(base + timedelta(minutes=index)).isoformat(),
+            )
+        )
+    return items
+
+
+# Inline f-string renderer as it existed before templates were introduced,
+# kept here only as the benchmark reference.
+def legacy_render(new_items: list[Announcement]) -> tuple[str, str, str]:
+    plain_lines = [f"{len(new_items)} new announcement(s) detected on Nurture:", ""]
+    for item in new_items:
+        plain_lines.append(f"- {item.title}")
+        plain_lines.append(f"  {item.link}")
+        if item.pub_date:
+            plain_lines.append(f"  Date: {item.pub_date}")
+        plain_lines.append("")
+    plain_lines.append(f"Source: {TARGET_URL}")
+
+    html_rows: list[str] = []
+    for item in new_items:
+        safe_title = html.escape(item.title)
+        safe_link = html.escape(item.link, quote=True)
+        safe_date = html.escape(item.pub_date) if item.pub_date else ""
+        safe_date_raw = html.escape(item.pub_date_raw) if item.pub_date_raw else ""
+        safe_author = html.escape(item.author) if item.author else ""
+        safe_desc = html.escape(item.description) if item.description else ""
+        safe_desc = html.escape(truncate_email_text(item.description))
+
+        meta_parts = []
+        if safe_date_raw:
+            meta_parts.append(f"Posted: {safe_date_raw}")
+        elif safe_date:
+            meta_parts.append(f"Posted: {safe_date}")
+        if safe_author:
+            meta_parts.append(f"By: {safe_author}")
+        meta_html = " | ".join(meta_parts)
+
+        date_line = (
+            f"<div style=\"margin:6px 0 0;color:#667085;font-size:12px;line-height:1.4;\">{meta_html}</div>"
+            if meta_html
+            else ""
+        )
+        desc_html = (
+            f"<div style=\"margin:8px 0 0;color:#344054;font-size:13px;line-height:1.5;\">{safe_desc}</div>"
+            if safe_desc
+            else ""
+        )
+        html_rows.append(
+            (
+                "<tr><td style=\"padding:0 0 10px 0;\">"
+                "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
+                "style=\"border-collapse:separate;border-spacing:0;background:#ffffff;border:1px solid #eaecf0;"
+                "border-radius:12px;\">"
+                "<tr><td style=\"padding:14px 16px;\">"
+                f"<div style=\"font-size:15px;line-height:1.35;font-weight:700;color:#101828;\">"
+                f"<a href=\"{safe_link}\" style=\"color:#101828;text-decoration:none;\">{safe_title}</a></div>"
+                f"{date_line}"
+                f"{desc_html}"
+                f"<div style=\"margin-top:10px;\"><a href=\"{safe_link}\" "
+                "style=\"color:#155eef;font-size:13px;font-weight:600;text-decoration:none;\">Open announcement →</a></div>"
+                "</td></tr></table>"
+                "</td></tr>"
+            )
+        )
+
+    return (
+        f"[Nurture] {len(new_items)} new announcement(s)",
+        "\n".join(plain_lines),
+        (
+            "<!doctype html><html><body style=\"margin:0;padding:0;background:#f2f4f7;\">"
+            "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
+            "style=\"border-collapse:collapse;background:#f2f4f7;\">"
+            "<tr><td align=\"center\" style=\"padding:20px 12px;\">"
+            "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
+            "style=\"max-width:700px;border-collapse:collapse;\">"
+            "<tr><td style=\"padding:0 0 12px 0;\">"
+            "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
+            "style=\"border-collapse:separate;border-spacing:0;background:linear-gradient(135deg,#155eef,#0ea5e9);"
+            "border-radius:16px;\">"
+            "<tr><td style=\"padding:18px 20px;color:#ffffff;\">"
+            "<div style=\"font-size:12px;letter-spacing:.08em;text-transform:uppercase;opacity:.9;\">Nurture Feed</div>"
+            f"<div style=\"margin-top:6px;font-size:22px;line-height:1.2;font-weight:700;\">"
+            f"{len(new_items)} new announcement(s)</div>"
+            "<div style=\"margin-top:6px;font-size:13px;line-height:1.4;opacity:.95;\">"
+            "This notification was generated by your GitHub Actions RSS monitor.</div>"
+            "</td></tr></table>"
+            "</td></tr>"
+            "<tr><td style=\"padding:0 0 10px 0;\">"
+            "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
+            "style=\"border-collapse:separate;border-spacing:0;background:#ffffff;border:1px solid #eaecf0;"
+            "border-radius:12px;\">"
+            "<tr><td style=\"padding:12px 16px;color:#475467;font-size:13px;line-height:1.5;\">"
+            "Announcements are listed below. Click any item to open the original Nurture page."
+            "</td></tr></table>"
+            "</td></tr>"
+            f"{''.join(html_rows)}"
+            "<tr><td style=\"padding-top:4px;\">"
+            "<div style=\"color:#667085;font-size:12px;line-height:1.5;padding:6px 2px;\">"
+            f"Source: <a href=\"{TARGET_URL}\" style=\"color:#155eef;text-decoration:none;\">{TARGET_URL}</a>"
+            "</div></td></tr>"
+            "</table>"
+            "</td></tr></table>"
+            "</body></html>"
+        ),
+    )
+
+
+def best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    args = parse_args()
+    items = make_items(args.items)
+
+    if legacy_render(items) != render_digest(items, cache=FragmentCache()):
+        print("Template output differs from the legacy renderer", file=sys.stderr)
+        return 1
+
+    def cold() -> None:
+        render_digest(items, cache=FragmentCache())
+
+    warm_cache = FragmentCache()
+    render_digest(items, cache=warm_cache)
+
+    legacy_seconds = best_of(args.repeat, lambda: legacy_render(items))
+    cold_seconds = best_of(args.repeat, cold)
+    warm_seconds = best_of(args.repeat, lambda: render_digest(items, cache=warm_cache))
+    print(
+        json.dumps(
+            {
+                "items": args.items,
+                "legacy_inline_ms": round(legacy_seconds * 1000, 3),
+                "templates_cold_ms": round(cold_seconds * 1000, 3),
+                "templates_cached_ms": round(warm_seconds * 1000, 3),
+                "cached_speedup_vs_legacy": round(legacy_seconds / warm_seconds, 2) if warm_seconds else None,
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from nurture_feed.extractors import extract_announcements_from_html
+from nurture_feed.metrics import metrics
+from nurture_feed.mock_site import start_mock_site_thread, synthetic_list_html
+from nurture_feed.models import Announcement
+from nurture_feed.scraper import stream_enriched_announcements
+from nurture_feed.settings import configure_settings, settings
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare detail enrichment with a fresh tab per page against the reusable tab pool."
+    )
+    parser.add_argument("--items", type=int, default=40, help="Detail pages to enrich per run (default: 40).")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help=f"Tabs in use at once (default: detail_enrich_concurrency, {settings.detail_enrich_concurrency}).",
+    )
+    parser.add_argument(
+        "--max-uses",
+        type=int,
+        help=f"Navigations per pooled tab (default: detail_tab_max_uses, {settings.detail_tab_max_uses}).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant; the median run is reported (default: 3).")
+    parser.add_argument(
+        "--recorded-dir",
+        type=Path,
+        help="Serve recorded pages (announcements.html and <id>.html) instead of synthetic ones.",
+    )
+    parser.add_argument("--output", help="Also write the results to this JSON file.")
+    return parser.parse_args()
+
+
+def load_items(url: str, item_count: int, recorded_dir: Path | None) -> list[Announcement]:
+    if recorded_dir is not None:
+        list_html = (recorded_dir / "announcements.html").read_text(encoding="utf-8")
+    else:
+        list_html = synthetic_list_html(item_count)
+    return extract_announcements_from_html(list_html, base_url=url)[:item_count]
+
+
+async def enrich(items: list[Announcement], concurrency: int) -> list[float]:
+    """Enrich ``items`` and return when each one arrived, in ms from the start."""
+    arrivals: list[float] = []
+    started = time.perf_counter()
+    async for _ in stream_enriched_announcements(items, limit=len(items), concurrency=concurrency):
+        arrivals.append((time.perf_counter() - started) * 1000)
+    return arrivals
+
+
+def run_variant(name: str, url: str, args: argparse.Namespace, max_uses: int, concurrency: int) -> dict:
+    configure_settings(overrides={"detail_tab_max_uses": max_uses})
+    runs: list[dict] = []
+    for _ in range(max(args.repeat, 1)):
+        items = load_items(url, args.items, args.recorded_dir)
+        metrics.reset()
+        started = time.perf_counter()
+        arrivals = asyncio.run(enrich(items, concurrency))
+        elapsed = time.perf_counter() - started
+        latencies = sorted(page.navigation_ms + page.parse_ms for page in metrics.pages if page.kind == "detail")
+        runs.append(
+            {
+                "elapsed_ms": round(elapsed * 1000, 3),
+                "items_per_second": round(len(arrivals) / elapsed, 2) if elapsed else None,
+                "first_item_ms": round(arrivals[0], 3) if arrivals else None,
+                "latency_p50_ms": round(statistics.median(latencies), 3) if latencies else None,
+                "latency_p95_ms": round(latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], 3)
+                if latencies
+                else None,
+                "enriched": len(arrivals),
+                "tabs_opened": metrics.counters.get("detail_tabs_opened", 0),
+                "tabs_replaced": metrics.counters.get("detail_tabs_replaced", 0),
+            }
+        )
+    median_run = sorted(runs, key=lambda run: run["elapsed_ms"])[len(runs) // 2]
+    return {"variant": name, "max_uses": max_uses, "concurrency": concurrency, "runs": len(runs), **median_run}
+
+
+def main() -> int:
+    args = parse_args()
+    # Per-page warnings would drown the summary.
+    logging.getLogger().setLevel(logging.WARNING)
+
+    server, url = start_mock_site_thread(item_count=args.items, recorded_dir=args.recorded_dir)
+    # The scraper skips the login check for a local target.
+    os.environ["NURTURE_TARGET_URL"] = url
+    concurrency = args.concurrency or settings.detail_enrich_concurrency
+    expected = len(load_items(url, args.items, args.recorded_dir))
+    pooled_uses = args.max_uses or settings.detail_tab_max_uses
+    try:
+        results = [
+            run_variant("tab_per_item", url, args, 1, concurrency),
+            run_variant("tab_pool", url, args, pooled_uses, concurrency),
+        ]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    for result in results:
+        print(
+            f"{result['variant']:<14} {result['enriched']:>4} pages  {result['elapsed_ms']:>10.1f} ms  "
+            f"{result['items_per_second'] or 0:>7} pages/s  p50 {result['latency_p50_ms']} ms  "
+            f"p95 {result['latency_p95_ms']} ms  tabs opened {result['tabs_opened']}"
+        )
+    baseline, pooled = results
+    if baseline["enriched"] and pooled["enriched"]:
+        print(f"Tab pool speedup: {baseline['elapsed_ms'] / pooled['elapsed_ms']:.2f}x")
+    if args.output:
+        Path(args.output).write_text(json.dumps({"items": expected, "results": results}, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+    return 0 if all(result["enriched"] == expected for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
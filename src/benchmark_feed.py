@@ -0,0 +1,167 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from nurture_feed.models import Announcement
+from nurture_feed.rss_writer import (
+    _ATOM_FOOTER,
+    _RSS_FOOTER,
+    _atom_entry,
+    _atom_header,
+    _published_dates,
+    _rss_header,
+    _rss_item,
+)
+from nurture_feed.utils import make_id, to_rfc2822
+
+DEFAULT_SIZES = (50, 5000, 50000)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare the streaming feed writer against feedgen on RSS + Atom (time and peak RSS)."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Item counts to benchmark (default: 50 5000 50000).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per size; best run is reported (default: 3).")
+    parser.add_argument("--child", nargs=2, metavar=("WRITER", "SIZE"), help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def make_items(count: int) -> list[Announcement]:
+    base = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=8)))
+    items: list[Announcement] = []
+    for index in range(count):
+        title = f"Announcement {index}: Term {index % 4 + 1} update & <reminder>"
+        link = f"https://nurture.diveanalytics.com/announcements/{index}"
+        items.append(
+            Announcement(
+                id=make_id(title, link),
+                title=title,
+                link=link,
+                source_id=str(index),
+                author=f"Teacher {index % 37}",
+                description=("Please bring the signed consent form \"before\" Friday. " * 6).strip(),
+                pub_date_raw=f"{index % 23 + 1} hours ago",
+                pub_date=(base + timedelta(minutes=index)).isoformat(),
+            )
+        )
+    return items
+
+
+def write_with_feedgen(items: list[Announcement], out_dir: Path) -> None:
+    from feedgen.feed import FeedGenerator
+
+    fg = FeedGenerator()
+    fg.title("Nurture Announcements")
+    fg.link(href="https://nurture.diveanalytics.com/announcements", rel="alternate")
+    fg.description("Announcements feed generated from nurture.diveanalytics.com")
+    fg.language("en")
+    for item in items:
+        fe = fg.add_entry(order="append")
+        fe.guid(item.id, permalink=False)
+        fe.title(item.title)
+        fe.link(href=item.link, rel="alternate")
+        if item.author:
+            fe.author({"name": item.author})
+        if item.description:
+            fe.description(item.description)
+        pub_date = to_rfc2822(item.pub_date)
+        if pub_date:
+            fe.pubDate(pub_date)
+    # feedgen needs a separate tree walk per format.
+    (out_dir / "feedgen.xml").write_bytes(fg.rss_str(pretty=True))
+    (out_dir / "feedgen.atom").write_bytes(fg.atom_str(pretty=True))
+
+
+def write_with_streaming(items: list[Announcement], out_dir: Path) -> None:
+    # The same two formats feedgen writes: no JSON Feed and no compressed copies.
+    published, updated = _published_dates(items)
+    with (
+        (out_dir / "feed.xml").open("w", encoding="utf-8") as rss,
+        (out_dir / "atom.xml").open("w", encoding="utf-8") as atom,
+    ):
+        rss.write(_rss_header(updated, []))
+        atom.write(_atom_header(updated))
+        for item, item_published in zip(items, published):
+            rss.write(_rss_item(item, item_published))
+            atom.write(_atom_entry(item, item_published, updated))
+        rss.write(_RSS_FOOTER)
+        atom.write(_ATOM_FOOTER)
+
+
+WRITERS: dict[str, Callable[[list[Announcement], Path], None]] = {
+    "streaming": write_with_streaming,
+    "feedgen": write_with_feedgen,
+}
+
+
+def _max_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_child(writer: str, size: int, repeat: int) -> dict[str, float]:
+    func = WRITERS[writer]
+    items = make_items(size)
+    if writer == "feedgen":
+        import feedgen.feed  # noqa: F401  # lxml's own footprint is not part of a write
+    # ru_maxrss only grows, so the difference is what writing added on top of the input.
+    baseline = _max_rss_bytes()
+    best_seconds = float("inf")
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            func(items, Path(tmp))
+            best_seconds = min(best_seconds, time.perf_counter() - start)
+    peak = _max_rss_bytes() - baseline
+    return {"seconds": round(best_seconds, 6), "peak_rss_mib": round(peak / (1024 * 1024), 3)}
+
+
+def measure(writer: str, size: int, repeat: int) -> dict[str, float]:
+    # A fresh process per writer and size, so one run's peak cannot hide the next one's.
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", writer, str(size), "--repeat", str(repeat)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def main() -> int:
+    args = parse_args()
+    if args.child:
+        writer, size = args.child
+        print(json.dumps(run_child(writer, int(size), args.repeat)))
+        return 0
+    try:
+        import feedgen  # noqa: F401
+    except ImportError:
+        feedgen_available = False
+    else:
+        feedgen_available = True
+
+    results = []
+    for size in args.sizes:
+        row: dict[str, object] = {"items": size, "streaming": measure("streaming", size, args.repeat)}
+        row["feedgen"] = measure("feedgen", size, args.repeat) if feedgen_available else "not installed"
+        results.append(row)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
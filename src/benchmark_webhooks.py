@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmark_email import make_items
+from nurture_feed.notifiers import FORMATTERS, HttpConnectionPool, WebhookEndpoint, WebhookNotifier, notify_all
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Fan notifications out to a local webhook stand-in and report throughput and failures."
+    )
+    parser.add_argument("--items", type=int, default=200, help="Announcements to deliver (default: 200).")
+    parser.add_argument("--endpoints", type=int, default=6, help="Webhook endpoints, cycling formats (default: 6).")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Stand-in response delay (default: 50).")
+    parser.add_argument(
+        "--fail-every",
+        type=int,
+        default=7,
+        help="Answer every Nth request with 503 to exercise retries; 0 disables (default: 7).",
+    )
+    return parser.parse_args()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    fail_every = 0
+    lock = threading.Lock()
+    received = 0
+    failed = 0
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        json.loads(body)
+        with self.lock:
+            type(self).received += 1
+            fail = self.fail_every > 0 and self.received % self.fail_every == 0
+            if fail:
+                type(self).failed += 1
+        time.sleep(self.latency)
+        status = 503 if fail else 204
+        self.send_response(status)
+        if fail:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+async def run(args: argparse.Namespace, url: str) -> tuple[dict[str, bool], HttpConnectionPool]:
+    client = HttpConnectionPool()
+    formats = list(FORMATTERS)
+    notifiers = [
+        WebhookNotifier(
+            WebhookEndpoint(name=f"standin-{index}", url=f"{url}/hook/{index}", format=formats[index % len(formats)]),
+            client,
+        )
+        for index in range(args.endpoints)
+    ]
+    try:
+        return await notify_all(notifiers, make_items(args.items)), client
+    finally:
+        client.close()
+
+
+def main() -> int:
+    args = parse_args()
+    StandInHandler.latency = args.latency_ms / 1000
+    StandInHandler.fail_every = args.fail_every
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    start = time.perf_counter()
+    try:
+        results, client = asyncio.run(run(args, f"http://127.0.0.1:{server.server_address[1]}"))
+    finally:
+        server.shutdown()
+        server.server_close()
+    elapsed = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "items": args.items,
+                "endpoints": args.endpoints,
+                "elapsed_ms": round(elapsed * 1000, 3),
+                "requests": StandInHandler.received,
+                "requests_per_second": round(StandInHandler.received / elapsed, 1) if elapsed else None,
+                "injected_failures": StandInHandler.failed,
+                "connections_opened": client.connections_opened,
+                "endpoints_ok": sum(results.values()),
+            },
+            indent=2,
+        )
+    )
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
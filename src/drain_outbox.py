@@ -0,0 +1,23 @@
+import argparse
+import sys
+
+from nurture_feed.config import OUTBOX_DRAIN_BUDGET_SECONDS
+from nurture_feed.emailer import drain_email_outbox
+from nurture_feed.logging_utils import configure_logging
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Deliver queued notification emails from the outbox.")
+    parser.add_argument(
+        "--budget-seconds",
+        type=float,
+        default=OUTBOX_DRAIN_BUDGET_SECONDS,
+        help=f"Stop starting new SMTP sends after this many seconds (default: {OUTBOX_DRAIN_BUDGET_SECONDS}).",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    configure_logging()
+    sys.exit(0 if drain_email_outbox(budget_seconds=args.budget_seconds) else 1)
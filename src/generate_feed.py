@@ -1,7 +1,10 @@
 import argparse
+import os
 import sys
+from pathlib import Path
 
 from nurture_feed.pipeline import run_pipeline
+from nurture_feed.settings import PROFILES, configure_settings, parse_overrides
 
 
 def parse_args() -> argparse.Namespace:
@@ -9,11 +12,99 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--skip-email",
         action="store_true",
-        help="Update feed.xml/cache.json but do not send email notifications.",
+        help="Update feed.xml/cache.json but do not queue or send email notifications.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--skip-webhooks",
+        action="store_true",
+        help="Do not post to the configured webhook endpoints.",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile",
+        metavar="DIR",
+        help=(
+            "Run stages serially under cProfile and tracemalloc and write per-stage pstats, top "
+            "allocators and an import-time breakdown to DIR (default: profile). Uses the mock site "
+            "unless --recorded-site is given, and never sends notifications."
+        ),
+    )
+    parser.add_argument(
+        "--mock-site",
+        type=int,
+        nargs="?",
+        const=30,
+        metavar="ITEMS",
+        help="Scrape a local synthetic copy of the site with ITEMS announcements (default: 30).",
+    )
+    parser.add_argument(
+        "--recorded-site",
+        metavar="DIR",
+        help="Scrape saved pages from DIR (announcements.html plus <id>.html detail pages).",
+    )
+    parser.add_argument(
+        "--perf-profile",
+        metavar="NAME",
+        help=f"Named tuning profile ({', '.join(PROFILES)}, or one defined in the settings file).",
+    )
+    parser.add_argument(
+        "--config",
+        metavar="PATH",
+        help="TOML settings file (default: nurture_feed.toml in the working directory, if present).",
+    )
+    parser.add_argument(
+        "--set",
+        dest="overrides",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Override one setting, e.g. --set detail_enrich_concurrency=2; repeatable, applied last.",
+    )
+    args = parser.parse_args()
+    try:
+        configure_settings(
+            profile=args.perf_profile,
+            config_path=Path(args.config).resolve() if args.config else None,
+            overrides=parse_overrides(args.overrides),
+        )
+    except (ValueError, OSError) as exc:
+        parser.error(str(exc))
+    return args
 
 
-if __name__ == "__main__":
+def main() -> int:
     args = parse_args()
-    sys.exit(run_pipeline(enable_email=not args.skip_email))
+    profile_dir = Path(args.profile).resolve() if args.profile else None
+    mock_items = args.mock_site
+    if profile_dir is not None and mock_items is None and not args.recorded_site:
+        mock_items = 30
+
+    server = None
+    if mock_items is not None or args.recorded_site:
+        from nurture_feed.mock_site import start_mock_site_thread
+
+        server, url = start_mock_site_thread(
+            item_count=mock_items or 0,
+            recorded_dir=Path(args.recorded_site).resolve() if args.recorded_site else None,
+        )
+        os.environ["NURTURE_TARGET_URL"] = url
+        # Keep the real feed, cache and queues untouched when scraping a stand-in site.
+        workspace = (profile_dir or Path("mock-run").resolve()) / "workspace"
+        workspace.mkdir(parents=True, exist_ok=True)
+        os.chdir(workspace)
+
+    try:
+        return run_pipeline(
+            enable_email=not args.skip_email and server is None,
+            enable_webhooks=not args.skip_webhooks and server is None,
+            profile_dir=profile_dir,
+        )
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import argparse
+import json
+import sys
+
+from nurture_feed.config import LAZY_IMPORT_MODULES, STARTUP_IMPORT_BUDGET_MS
+from nurture_feed.profiling import format_import_rows, measure_import_time
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Report the import cost of each module pulled in when the pipeline starts."
+    )
+    parser.add_argument(
+        "--module",
+        default="nurture_feed.pipeline",
+        help="Module to import in a fresh interpreter (default: nurture_feed.pipeline).",
+    )
+    parser.add_argument("--top", type=int, default=30, help="Rows to print, slowest first (default: 30).")
+    parser.add_argument("--json", action="store_true", help="Print the full breakdown as JSON.")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit 1 if the import exceeds the budget or loads a dependency that should stay lazy.",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=STARTUP_IMPORT_BUDGET_MS,
+        help=f"Cold-import budget for --check in milliseconds (default: {STARTUP_IMPORT_BUDGET_MS}).",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="Fresh interpreters to measure; the fastest is reported to damp noise (default: 3).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    best_rows: list[dict] = []
+    best_total_us: int | None = None
+    for _ in range(max(args.runs, 1)):
+        rows, ok = measure_import_time(args.module)
+        if not ok:
+            print(f"Importing {args.module} failed", file=sys.stderr)
+            return 1
+        total_us = next((row["cumulative_us"] for row in rows if row["module"] == args.module), 0)
+        if best_total_us is None or total_us < best_total_us:
+            best_rows, best_total_us = rows, total_us
+    total_ms = (best_total_us or 0) / 1000
+
+    eager = sorted(
+        {
+            row["module"]
+            for row in best_rows
+            if row["module"].split(".", 1)[0] in LAZY_IMPORT_MODULES
+        }
+    )
+
+    if args.json:
+        print(json.dumps({"module": args.module, "total_ms": total_ms, "eager_heavy": eager, "rows": best_rows}, indent=2))
+    else:
+        print(f"{'cumulative':>12}  {'self':>14}  module")
+        print(format_import_rows(best_rows, limit=args.top), end="")
+        print(f"\nimport {args.module}: {total_ms:.1f} ms (best of {max(args.runs, 1)})")
+
+    if not args.check:
+        return 0
+    failed = False
+    if total_ms > args.budget_ms:
+        print(f"Startup import budget exceeded: {total_ms:.1f} ms > {args.budget_ms:.0f} ms", file=sys.stderr)
+        failed = True
+    for name in eager:
+        print(f"Heavy dependency imported at startup: {name}", file=sys.stderr)
+        failed = True
+    if not failed:
+        print(f"Within the {args.budget_ms:.0f} ms startup budget; no heavy dependencies loaded eagerly")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from .email_templates import FragmentCache, render_digest
+from .extractors import extract_announcements_from_html, extract_detail_fields_from_html
+from .mock_site import synthetic_description, synthetic_detail_html, synthetic_list_html, synthetic_title
+from .models import Announcement
+from .rss_writer import generate_rss_feed
+from .storage import load_cache, save_cache
+from .utils import estimate_pub_datetime, make_id, sort_announcements_for_feed
+
+RESULTS_SCHEMA_VERSION = 1
+DEFAULT_SIZES = (10, 100, 1000)
+DEFAULT_THRESHOLD = 0.25
+# Differences below this are timer noise, whatever the ratio.
+NOISE_FLOOR_MS = 0.05
+
+_RAW_DATE_SHAPES = (
+    "{n} hours ago",
+    "an hour ago",
+    "{n} days ago",
+    "a week ago",
+    "{n} minutes ago",
+    "2024-01-{day:02d}T08:30:00+08:00",
+    "{day} Jan 2024",
+)
+
+
+def make_announcements(count: int) -> list[Announcement]:
+    base = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=8)))
+    items: list[Announcement] = []
+    for index in range(count):
+        title = synthetic_title(index)
+        link = f"https://nurture.diveanalytics.com/announcements/{index}"
+        items.append(
+            Announcement(
+                id=make_id(title, link),
+                title=title,
+                link=link,
+                source_id=str(index),
+                author=f"Teacher {index % 37}",
+                description="\n".join(synthetic_description(index)),
+                pub_date_raw=f"{index % 23 + 1} hours ago",
+                # Shuffled so sorting has real work to do; every 10th item is undated.
+                pub_date=None if index % 10 == 9 else (base + timedelta(minutes=(index * 7919) % 100_003)).isoformat(),
+            )
+        )
+    return items
+
+
+def make_raw_dates(count: int) -> list[str]:
+    return [
+        _RAW_DATE_SHAPES[index % len(_RAW_DATE_SHAPES)].format(n=index % 23 + 2, day=index % 28 + 1)
+        for index in range(count)
+    ]
+
+
+@contextmanager
+def _scratch_dir() -> Iterator[None]:
+    # Storage and feed writers use paths relative to the working directory.
+    previous = Path.cwd()
+    with tempfile.TemporaryDirectory(prefix="nurture-bench-") as tmp:
+        os.chdir(tmp)
+        try:
+            yield
+        finally:
+            os.chdir(previous)
+
+
+def _clear_working_dir() -> None:
+    for path in Path.cwd().iterdir():
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+
+
+def _seed_cache(items: list[Announcement]) -> None:
+    _clear_working_dir()
+    save_cache(items)
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    size: int
+    run: Callable[[], Any]
+    # Untimed preparation before every repetition, e.g. to reset files on disk.
+    setup: Callable[[], Any] | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+
+def build_suite(sizes: tuple[int, ...] = DEFAULT_SIZES) -> list[BenchmarkCase]:
+    cases: list[BenchmarkCase] = []
+    for size in sizes:
+        items = make_announcements(size)
+        list_html = synthetic_list_html(size)
+        detail_html = synthetic_detail_html(size, paragraphs=size)
+        raw_dates = make_raw_dates(size)
+
+        cases.extend(
+            [
+                BenchmarkCase(
+                    "extract_announcements_from_html",
+                    size,
+                    lambda html=list_html: extract_announcements_from_html(html, base_url="https://example.test/"),
+                ),
+                BenchmarkCase(
+                    "extract_detail_fields_from_html",
+                    size,
+                    lambda html=detail_html: extract_detail_fields_from_html(html),
+                ),
+                BenchmarkCase(
+                    "estimate_pub_datetime",
+                    size,
+                    lambda dates=raw_dates: [estimate_pub_datetime(raw) for raw in dates],
+                ),
+                BenchmarkCase("sort_announcements_for_feed", size, lambda items=items: sort_announcements_for_feed(items)),
+                BenchmarkCase("save_cache", size, lambda items=items: save_cache(items), setup=_clear_working_dir),
+                BenchmarkCase(
+                    "load_cache",
+                    size,
+                    load_cache,
+                    setup=lambda items=items: _seed_cache(items),
+                ),
+                BenchmarkCase(
+                    "generate_rss_feed",
+                    size,
+                    lambda items=items: generate_rss_feed(items),
+                    setup=_clear_working_dir,
+                ),
+                BenchmarkCase(
+                    "render_digest",
+                    size,
+                    lambda items=items: render_digest(items, cache=FragmentCache()),
+                ),
+            ]
+        )
+    return cases
+
+
+def time_case(case: BenchmarkCase, repeat: int) -> dict[str, Any]:
+    samples: list[float] = []
+    for _ in range(max(repeat, 1)):
+        if case.setup is not None:
+            case.setup()
+        started = time.perf_counter()
+        case.run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "name": case.name,
+        "size": case.size,
+        "repeat": len(samples),
+        "best_ms": round(min(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+    }
+
+
+def run_suite(
+    cases: list[BenchmarkCase],
+    *,
+    repeat: int,
+    progress: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    with _scratch_dir():
+        for case in cases:
+            result = time_case(case, repeat)
+            results[case.key] = result
+            if progress is not None:
+                progress(result)
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+@dataclass
+class Regression:
+    key: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ms / self.baseline_ms if self.baseline_ms else float("inf")
+
+
+def compare_to_baseline(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "median_ms",
+) -> list[Regression]:
+    regressions: list[Regression] = []
+    baseline_results = baseline.get("results", {})
+    for key, result in current.get("results", {}).items():
+        previous = baseline_results.get(key)
+        if not previous or metric not in previous:
+            continue
+        current_ms, baseline_ms = result[metric], previous[metric]
+        if current_ms - baseline_ms > NOISE_FLOOR_MS and current_ms > baseline_ms * (1 + threshold):
+            regressions.append(Regression(key=key, baseline_ms=baseline_ms, current_ms=current_ms))
+    return regressions
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_results(results: dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .logging_utils import logger
+from .metrics import metrics
+from .session import load_storage_state
+from .settings import settings
+
+_STATE_FILE = "nurture_profile.json"
+# Chromium directories that only hold re-downloadable caches; cookies and local storage live elsewhere.
+_CACHE_DIRS = (
+    "Default/Cache",
+    "Default/Code Cache",
+    "Default/Service Worker/CacheStorage",
+    "Default/GPUCache",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "ShaderCache",
+)
+# Leave headroom under the cap for the non-cache parts of the profile.
+_HTTP_CACHE_SHARE = 0.8
+
+
+def _directory_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+@dataclass
+class BrowserProfile:
+    """A persistent Chromium user-data directory so static assets survive between runs."""
+
+    path: Path
+    max_bytes: int
+
+    @classmethod
+    def from_settings(cls) -> "BrowserProfile | None":
+        if not settings.browser_profile_dir:
+            return None
+        return cls(Path(settings.browser_profile_dir).expanduser().resolve(), settings.browser_profile_max_mb * 1024 * 1024)
+
+    @property
+    def _state_path(self) -> Path:
+        return self.path / _STATE_FILE
+
+    def _load_state(self) -> dict[str, Any]:
+        try:
+            raw = json.loads(self._state_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return raw if isinstance(raw, dict) else {}
+
+    def _save_state(self, state: dict[str, Any]) -> None:
+        tmp_path = self._state_path.with_name(_STATE_FILE + ".tmp")
+        tmp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self._state_path)
+
+    def prepare(self) -> None:
+        """Create the directory and drop cache directories if the profile has grown past its cap."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        size = _directory_size(self.path)
+        pruned = 0
+        if size > self.max_bytes:
+            for relative in _CACHE_DIRS:
+                target = self.path / relative
+                if target.is_dir():
+                    freed = _directory_size(target)
+                    shutil.rmtree(target, ignore_errors=True)
+                    pruned += freed
+            logger.info(
+                "Browser profile over its size cap; pruned caches",
+                extra={"event": "browser_profile_pruned", "path": str(self.path), "count": pruned},
+            )
+        metrics.annotate(
+            "browser_profile",
+            {"path": str(self.path), "size_bytes": size - pruned, "pruned_bytes": pruned, "max_bytes": self.max_bytes},
+        )
+
+    def launch_args(self) -> list[str]:
+        return [f"--disk-cache-size={int(self.max_bytes * _HTTP_CACHE_SHARE)}"]
+
+    def state_to_seed(self, storage_state: str | None) -> dict[str, Any] | None:
+        """Cookies and localStorage from ``auth.json`` when the profile does not hold this content yet."""
+        if storage_state is None:
+            return None
+        digest = _file_digest(Path(storage_state))
+        if digest is None or self._load_state().get("seeded_digest") == digest:
+            return None
+        state = load_storage_state(Path(storage_state)) or {}
+        return {
+            "cookies": [cookie for cookie in state.get("cookies") or [] if isinstance(cookie, dict)],
+            "origins": [
+                origin
+                for origin in state.get("origins") or []
+                if isinstance(origin, dict) and origin.get("origin") and origin.get("localStorage")
+            ],
+        }
+
+    def mark_seeded(self, storage_state: str, *, written_back: bool = False) -> None:
+        # Also called after the run writes the profile's own state back, so that copy is not re-seeded.
+        state = self._load_state()
+        state["seeded_digest"] = _file_digest(Path(storage_state))
+        state["seeded_at"] = time.time()
+        state.pop("seeded_from_mtime", None)
+        self._save_state(state)
+        if not written_back:
+            logger.info(
+                "Seeded browser profile with cookies and local storage from %s",
+                storage_state,
+                extra={"event": "browser_profile_seeded", "path": str(self.path)},
+            )
+
+    def record_list_navigation(self, navigation_ms: float) -> None:
+        """Compare this list-page load with the first (cold-cache) load into this profile."""
+        state = self._load_state()
+        cold_ms = state.get("cold_list_navigation_ms")
+        if cold_ms is None:
+            state["cold_list_navigation_ms"] = round(navigation_ms, 3)
+            self._save_state(state)
+        metrics.annotate(
+            "browser_profile",
+            {
+                "cold_start": cold_ms is None,
+                "cold_list_navigation_ms": cold_ms if cold_ms is not None else round(navigation_ms, 3),
+                "list_navigation_ms": round(navigation_ms, 3),
+                "list_navigation_saved_ms": round(cold_ms - navigation_ms, 3) if cold_ms is not None else 0.0,
+            },
+        )
+
+
+def _file_digest(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+_SET_LOCAL_STORAGE = "items => { for (const {name, value} of items) localStorage.setItem(name, value); }"
+
+
+def _blank_page(route: Any) -> None:
+    route.fulfill(status=200, content_type="text/html", body="")
+
+
+async def _blank_page_async(route: Any) -> None:
+    await route.fulfill(status=200, content_type="text/html", body="")
+
+
+def _seed_sync(context: Any, seed: dict[str, Any]) -> None:
+    if seed["cookies"]:
+        context.add_cookies(seed["cookies"])
+    if seed["origins"]:
+        # Each origin is opened against a stubbed blank page, so seeding makes no network requests.
+        page = context.new_page()
+        page.route("**/*", _blank_page)
+        for origin in seed["origins"]:
+            page.goto(origin["origin"])
+            page.evaluate(_SET_LOCAL_STORAGE, origin["localStorage"])
+        page.close()
+
+
+async def _seed_async(context: Any, seed: dict[str, Any]) -> None:
+    if seed["cookies"]:
+        await context.add_cookies(seed["cookies"])
+    if seed["origins"]:
+        page = await context.new_page()
+        await page.route("**/*", _blank_page_async)
+        for origin in seed["origins"]:
+            await page.goto(origin["origin"])
+            await page.evaluate(_SET_LOCAL_STORAGE, origin["localStorage"])
+        await page.close()
+
+
+def _count_response(kind: str, params: dict[str, Any]) -> None:
+    response = params.get("response") or {}
+    from_cache = bool(response.get("fromDiskCache") or response.get("fromPrefetchCache"))
+    metrics.record_http_response(kind, from_cache=from_cache)
+
+
+def _count_finished(kind: str, params: dict[str, Any]) -> None:
+    metrics.record_http_response(kind, network_bytes=int(params.get("encodedDataLength") or 0))
+
+
+def launch_context_sync(p: Any, *, headless: bool, slow_mo_ms: int, storage_state: str | None) -> tuple[Any, Any]:
+    """Open a browser context, persistent when a profile directory is configured.
+
+    Returns ``(context, browser)``; ``browser`` is None for a persistent context.
+    """
+    profile = BrowserProfile.from_settings()
+    if profile is None:
+        browser = p.chromium.launch(headless=headless, slow_mo=slow_mo_ms)
+        return browser.new_context(storage_state=storage_state), browser
+    profile.prepare()
+    context = p.chromium.launch_persistent_context(
+        str(profile.path), headless=headless, slow_mo=slow_mo_ms, args=profile.launch_args()
+    )
+    seed = profile.state_to_seed(storage_state)
+    if seed is not None:
+        _seed_sync(context, seed)
+        profile.mark_seeded(storage_state)
+    return context, None
+
+
+async def launch_context_async(
+    p: Any, *, headless: bool, slow_mo_ms: int, storage_state: str | None
+) -> tuple[Any, Any]:
+    profile = BrowserProfile.from_settings()
+    if profile is None:
+        browser = await p.chromium.launch(headless=headless, slow_mo=slow_mo_ms)
+        return await browser.new_context(storage_state=storage_state), browser
+    profile.prepare()
+    context = await p.chromium.launch_persistent_context(
+        str(profile.path), headless=headless, slow_mo=slow_mo_ms, args=profile.launch_args()
+    )
+    seed = profile.state_to_seed(storage_state)
+    if seed is not None:
+        await _seed_async(context, seed)
+        profile.mark_seeded(storage_state)
+    return context, None
+
+
+def watch_cache_hits_sync(context: Any, page: Any, kind: str) -> None:
+    """Count HTTP responses served from the browser's disk cache via the DevTools protocol."""
+    try:
+        session = context.new_cdp_session(page)
+        session.send("Network.enable")
+    except Exception:  # CDP is Chromium-only; the report simply has no cache numbers.
+        return
+    session.on("Network.responseReceived", lambda params: _count_response(kind, params))
+    session.on("Network.loadingFinished", lambda params: _count_finished(kind, params))
+
+
+async def watch_cache_hits_async(context: Any, page: Any, kind: str) -> None:
+    try:
+        session = await context.new_cdp_session(page)
+        await session.send("Network.enable")
+    except Exception:
+        return
+    session.on("Network.responseReceived", lambda params: _count_response(kind, params))
+    session.on("Network.loadingFinished", lambda params: _count_finished(kind, params))
+
+
+def record_list_navigation(navigation_ms: float) -> None:
+    profile = BrowserProfile.from_settings()
+    if profile is not None:
+        profile.record_list_navigation(navigation_ms)
+
+
+def record_storage_state_written(storage_state: str) -> None:
+    profile = BrowserProfile.from_settings()
+    if profile is not None:
+        profile.mark_seeded(storage_state, written_back=True)
@@ -0,0 +1,197 @@
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from .config import CHECKPOINT_FILE, CHECKPOINT_FLUSH_ITEMS, CHECKPOINT_FLUSH_SECONDS
+from .logging_utils import logger
+from .models import Announcement
+from .settings import settings
+from .storage import parse_cached_item
+from .utils import parse_iso_datetime
+
+CHECKPOINT_SCHEMA_VERSION = 1
+# Fields a detail page can change; stored per item so a resumed run skips finished tabs.
+_ENRICHED_FIELDS = ("title", "description", "author", "pub_date_raw", "pub_date")
+
+
+def new_run_id() -> str:
+    # Actions reruns keep the run id, so a retried attempt is recognisably the same run.
+    github_run = os.getenv("GITHUB_RUN_ID")
+    if github_run:
+        return f"gh-{github_run}-{os.getenv('GITHUB_RUN_ATTEMPT', '1')}"
+    return uuid.uuid4().hex
+
+
+class RunCheckpoint:
+    """Progress of one pipeline run, saved after every stage so a rerun can pick up where it stopped.
+
+    Holds the scraped items, detail-page fields fetched so far, the computed diff and which
+    notification channels have already been delivered to.
+    """
+
+    def __init__(self, path: Path = CHECKPOINT_FILE, run_id: str | None = None) -> None:
+        self.path = path
+        self.run_id = run_id or new_run_id()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.finished_at: str | None = None
+        self.completed: list[str] = []
+        self.items: list[Announcement] = []
+        self.enriched: dict[str, dict[str, str | None]] = {}
+        self.ordered_ids: list[str] = []
+        self.new_ids: list[str] = []
+        self.notified: dict[str, bool] = {}
+        self.resumed = False
+        self._lock = threading.Lock()
+        self._unsaved_enriched = 0
+        self._saved_at = time.monotonic()
+
+    @classmethod
+    def open(
+        cls,
+        path: Path = CHECKPOINT_FILE,
+        *,
+        window: timedelta | None = None,
+        now: datetime | None = None,
+    ) -> "RunCheckpoint":
+        """Resume the unfinished run in ``path`` if it started within ``window``, else start a new run."""
+        now = now or datetime.now(timezone.utc)
+        window = timedelta(minutes=settings.checkpoint_resume_window_minutes) if window is None else window
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cls(path)
+        except json.JSONDecodeError:
+            logger.warning(
+                "Checkpoint file is invalid JSON; starting a fresh run",
+                extra={"event": "checkpoint_invalid", "path": str(path)},
+            )
+            return cls(path)
+        if not isinstance(raw, dict) or raw.get("schema_version") != CHECKPOINT_SCHEMA_VERSION:
+            return cls(path)
+        if raw.get("finished_at"):
+            return cls(path)
+
+        started_at = parse_iso_datetime(raw.get("started_at"))
+        if started_at is None or now - started_at > window:
+            logger.info(
+                "Unfinished run %s is outside the resume window; starting a fresh run",
+                raw.get("run_id"),
+                extra={"event": "checkpoint_expired", "path": str(path)},
+            )
+            return cls(path)
+
+        checkpoint = cls(path, run_id=str(raw.get("run_id") or new_run_id()))
+        checkpoint.started_at = started_at.isoformat()
+        checkpoint.completed = [name for name in raw.get("completed", []) if isinstance(name, str)]
+        checkpoint.items = [item for item in map(parse_cached_item, raw.get("items", [])) if item is not None]
+        checkpoint.enriched = {
+            item_id: fields for item_id, fields in (raw.get("enriched") or {}).items() if isinstance(fields, dict)
+        }
+        diff = raw.get("diff") or {}
+        checkpoint.ordered_ids = list(diff.get("ordered_ids", []))
+        checkpoint.new_ids = list(diff.get("new_ids", []))
+        checkpoint.notified = {name: bool(ok) for name, ok in (raw.get("notified") or {}).items()}
+        checkpoint.resumed = True
+        logger.info(
+            "Resuming run %s after stages: %s",
+            checkpoint.run_id,
+            ", ".join(checkpoint.completed) or "none",
+            extra={"event": "checkpoint_resume", "path": str(path), "count": len(checkpoint.completed)},
+        )
+        return checkpoint
+
+    def is_done(self, stage: str) -> bool:
+        return stage in self.completed
+
+    def mark_done(self, stage: str) -> None:
+        with self._lock:
+            if stage not in self.completed:
+                self.completed.append(stage)
+        self.save()
+
+    def record_scrape(self, items: list[Announcement]) -> None:
+        with self._lock:
+            self.items = list(items)
+        self.mark_done("scrape")
+
+    def record_enriched(self, item: Announcement) -> None:
+        # Rewriting the whole file per item is quadratic; at most one batch is lost to a crash.
+        with self._lock:
+            self.enriched[item.id] = {name: getattr(item, name) for name in _ENRICHED_FIELDS}
+            self._unsaved_enriched += 1
+            due = (
+                self._unsaved_enriched >= CHECKPOINT_FLUSH_ITEMS
+                or time.monotonic() - self._saved_at >= CHECKPOINT_FLUSH_SECONDS
+            )
+        if due:
+            self.save()
+
+    def flush(self) -> None:
+        if self._unsaved_enriched:
+            self.save()
+
+    def apply_enriched(self, items: list[Announcement]) -> list[Announcement]:
+        """Copy detail-page fields saved by an earlier attempt onto ``items``; returns the ones not yet enriched."""
+        pending: list[Announcement] = []
+        for item in items:
+            fields = self.enriched.get(item.id)
+            if fields is None:
+                pending.append(item)
+                continue
+            for name, value in fields.items():
+                if name in _ENRICHED_FIELDS:
+                    setattr(item, name, value)
+        return pending
+
+    def record_diff(self, ordered_items: list[Announcement], new_items: list[Announcement]) -> None:
+        with self._lock:
+            self.items = list(ordered_items)
+            self.ordered_ids = [item.id for item in ordered_items]
+            self.new_ids = [item.id for item in new_items]
+        self.mark_done("diff")
+
+    def restore_diff(self) -> tuple[list[Announcement], list[Announcement]]:
+        by_id = {item.id: item for item in self.items}
+        ordered_items = [by_id[item_id] for item_id in self.ordered_ids if item_id in by_id]
+        new_items = [by_id[item_id] for item_id in self.new_ids if item_id in by_id]
+        return ordered_items, new_items
+
+    def record_notification(self, channel: str, ok: bool) -> None:
+        with self._lock:
+            self.notified[channel] = ok
+        self.save()
+
+    def delivered_channels(self) -> set[str]:
+        return {name for name, ok in self.notified.items() if ok}
+
+    def finish(self) -> None:
+        with self._lock:
+            self.finished_at = datetime.now(timezone.utc).isoformat()
+        self.save()
+
+    def save(self) -> None:
+        # Stages finish on different worker threads; serialize whole snapshots.
+        with self._lock:
+            payload: dict[str, Any] = {
+                "schema_version": CHECKPOINT_SCHEMA_VERSION,
+                "run_id": self.run_id,
+                "started_at": self.started_at,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "finished_at": self.finished_at,
+                "completed": list(self.completed),
+                "items": [asdict(item) for item in self.items],
+                "enriched": dict(sorted(self.enriched.items())),
+                "diff": {"ordered_ids": list(self.ordered_ids), "new_ids": list(self.new_ids)},
+                "notified": dict(sorted(self.notified.items())),
+            }
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._unsaved_enriched = 0
+            self._saved_at = time.monotonic()
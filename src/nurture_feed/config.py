@@ -6,14 +6,95 @@ TARGET_URL = "https://nurture.diveanalytics.com/announcements"
 AUTH_FILE = Path("auth.json")
 CACHE_FILE = Path("cache.json")
 FEED_FILE = Path("feed.xml")
+ATOM_FEED_FILE = Path("atom.xml")
+JSON_FEED_FILE = Path("feed.json")
+ARCHIVE_DIR = Path("archive")
+ARCHIVE_INDEX_FILE = ARCHIVE_DIR / "index.json"
 RECIPIENTS_FILE = Path("email_recipients.txt")
+SUBSCRIPTIONS_FILE = Path("email_subscriptions.json")
+WEBHOOKS_FILE = Path("webhooks.json")
+OUTBOX_FILE = CACHE_FILE.with_name("outbox.json")
+RUN_REPORT_FILE = Path("run_report.json")
+SETTINGS_FILE = Path("nurture_feed.toml")
+DIGEST_QUEUE_FILE = CACHE_FILE.with_name("digest_queue.json")
+CHECKPOINT_FILE = CACHE_FILE.with_name("run_checkpoint.json")
+RUN_LOCK_FILE = CACHE_FILE.with_name("run.lock")
+SIMHASH_INDEX_FILE = CACHE_FILE.with_name("simhash_index.json")
+SEARCH_INDEX_FILE = CACHE_FILE.with_name("search_index.json")
+
+FEED_SERVER_HOST = "127.0.0.1"
+FEED_SERVER_PORT = 8080
+FEED_SERVER_MAX_AGE_SECONDS = 300
+
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 587
+SMTP_TIMEOUT_SECONDS = 30
+EMAIL_ENVELOPE_SIZE = 50
+EMAIL_MAX_CONNECTIONS = 3
+EMAIL_SEND_RATE_PER_MINUTE = 30
+OUTBOX_DRAIN_BUDGET_SECONDS = 90
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_BACKOFF_BASE_SECONDS = 300
+OUTBOX_BACKOFF_MAX_SECONDS = 6 * 60 * 60
+OUTBOX_RETENTION_DAYS = 14
+EMAIL_FRAGMENT_CACHE_SIZE = 2048
+DIGEST_DEFAULT_POLICY = "immediate"
+DIGEST_DEFAULT_DAILY_TIME = "08:00"
+
+WEBHOOK_TIMEOUT_SECONDS = 10
+WEBHOOK_RETRIES = 3
+WEBHOOK_RETRY_DELAY_SECONDS = 2
+WEBHOOK_ENDPOINT_CONCURRENCY = 2
+WEBHOOK_MAX_IDLE_CONNECTIONS = 4
+WEBHOOK_ITEMS_PER_MESSAGE = 10
 
 MAX_FEED_ITEMS = 50
+ARCHIVE_PAGE_SIZE = 50
 MAX_CACHE_ITEMS = 500
 SCRAPE_RETRIES = 3
+SESSION_PROBE_TIMEOUT_SECONDS = 10
+SESSION_EXPIRY_WARNING_HOURS = 24
 SCRAPE_RETRY_DELAY_SECONDS = 5
+LIST_NAVIGATION_TIMEOUT_MS = 60000
+LIST_NETWORK_IDLE_TIMEOUT_MS = 60000
+DETAIL_NAVIGATION_TIMEOUT_MS = 45000
+DETAIL_NETWORK_IDLE_TIMEOUT_MS = 30000
+# Whole-run budget; the workflow job is killed at 20 minutes, minus a few for setup.
+RUN_DEADLINE_SECONDS = 720
+# Kept back from optional work (retries, enrichment) for feed, cache and notifications.
+ESSENTIAL_RESERVE_SECONDS = 120
+# Below this much spare time enrichment is skipped rather than started.
+MIN_ENRICH_SECONDS = 20
+# Per detail page estimate when this run has not measured a page load yet.
+DETAIL_PAGE_ESTIMATE_SECONDS = 15
+BROWSER_PROFILE_DIR = ""
+BROWSER_PROFILE_MAX_MB = 512
 DETAIL_ENRICH_LIMIT = 10
 DETAIL_ENRICH_CONCURRENCY = 4
+# Navigations per detail tab before it is closed and replaced with a fresh one.
+DETAIL_TAB_MAX_USES = 25
+# An unfinished run younger than this is resumed instead of restarted (covers the next hourly run).
+CHECKPOINT_RESUME_WINDOW_MINUTES = 90
+# Enriched items are written to the checkpoint in batches: after this many, or this many seconds.
+CHECKPOINT_FLUSH_ITEMS = 10
+CHECKPOINT_FLUSH_SECONDS = 5.0
+# How long a run waits for an overlapping one to finish before giving up (0: give up at once).
+RUN_LOCK_WAIT_SECONDS = 0
+# A lock older than this belongs to a run that died or hung; the job timeout is 20 minutes.
+RUN_LOCK_STALE_MINUTES = 30
+# Reposts differ from the original in at most this many of the 64 SimHash bits.
+REPOST_MAX_DISTANCE = 6
+# Fingerprints kept for repost detection; about ten years of announcements.
+SIMHASH_INDEX_MAX_ITEMS = 20000
+
+LOG_LEVEL = "INFO"
+# Fraction of DEBUG records kept per event (1.0 keeps all); overridable with LOG_DEBUG_SAMPLE_RATE.
+LOG_DEBUG_SAMPLE_RATE = 0.1
+
+# Cold-start budget for `import nurture_feed.pipeline`, checked by src/import_audit.py --check.
+STARTUP_IMPORT_BUDGET_MS = 250
+# Heavy dependencies that must only load inside the stage that uses them.
+LAZY_IMPORT_MODULES = ("playwright", "bs4", "dateparser", "smtplib")
 
 # Nurture is a Singapore-based site; use Singapore time for relative "x hours ago"
 # estimation so generated pubDate values are consistent across runs/environments.
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from .logging_utils import logger
+from .metrics import RunMetrics
+from .profiling import StageProfiler, profile_in_current_stage
+
+StageFunc = Callable[[dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass
+class Stage:
+    name: str
+    run: StageFunc
+    after: tuple[str, ...] = ()
+    # A failed optional stage is logged and counted; only its dependents are skipped.
+    essential: bool = True
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run blocking work in a worker thread, profiled with the current stage when profiling."""
+    return await asyncio.to_thread(profile_in_current_stage(func), *args, **kwargs)
+
+
+def in_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> StageFunc:
+    """Adapt a blocking function into a stage that runs in a worker thread."""
+
+    async def run(_: dict[str, Any]) -> Any:
+        return await run_blocking(func, *args, **kwargs)
+
+    return run
+
+
+class StageGraph:
+    """A declared set of stages, each started as soon as the stages it runs after have finished."""
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        *,
+        metrics: RunMetrics | None = None,
+        profiler: StageProfiler | None = None,
+    ) -> None:
+        self.metrics = metrics or RunMetrics()
+        self.profiler = profiler
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> list[str]:
+        order: list[str] = []
+        state: dict[str, str] = {}
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Stage graph has a cycle: {' -> '.join(path + (name,))}")
+            state[name] = "visiting"
+            for dependency in self.stages[name].after:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage {name!r} runs after unknown stage {dependency!r}")
+                visit(dependency, path + (name,))
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, ())
+        return order
+
+    async def _run_stage(self, stage: Stage, results: dict[str, Any], failed: set[str]) -> None:
+        missing = [name for name in stage.after if name in failed]
+        if missing:
+            failed.add(stage.name)
+            logger.warning(
+                "Stage %s skipped because %s failed",
+                stage.name,
+                ", ".join(missing),
+                extra={"event": "stage_skipped"},
+            )
+            return
+        started = time.perf_counter()
+        try:
+            with self.metrics.stage(stage.name):
+                if self.profiler is not None:
+                    with self.profiler.stage(stage.name):
+                        results[stage.name] = await stage.run(results)
+                else:
+                    results[stage.name] = await stage.run(results)
+        except Exception as exc:
+            if stage.essential:
+                raise
+            failed.add(stage.name)
+            self.metrics.increment("optional_stage_failures")
+            logger.error(
+                "Optional stage %s failed; continuing",
+                stage.name,
+                extra={"event": "stage_failed"},
+                exc_info=exc,
+            )
+            return
+        logger.info(
+            "Stage %s finished",
+            stage.name,
+            extra={"event": "stage_done", "duration_ms": round((time.perf_counter() - started) * 1000, 3)},
+        )
+
+    async def execute(self, *, serial: bool = False) -> dict[str, Any]:
+        results: dict[str, Any] = {}
+        failed: set[str] = set()
+        if serial:
+            # One stage at a time in dependency order, e.g. so profiles do not mix stages.
+            for name in self.order:
+                await self._run_stage(self.stages[name], results, failed)
+            return results
+
+        tasks: dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: Stage) -> None:
+            if stage.after:
+                await asyncio.gather(*(tasks[name] for name in stage.after))
+            await self._run_stage(stage, results, failed)
+
+        # Tasks only start running at the first await below, so every dependency exists by then.
+        for name in self.order:
+            tasks[name] = asyncio.create_task(run_stage(self.stages[name]), name=f"stage:{name}")
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return results
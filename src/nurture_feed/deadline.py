@@ -0,0 +1,102 @@
+import math
+import threading
+import time
+from typing import Any
+
+from .logging_utils import logger
+from .metrics import metrics
+
+# Shortest navigation timeout worth attempting; below this a page load is not going to finish.
+MIN_NAVIGATION_TIMEOUT_MS = 5000
+
+
+class RunDeadline:
+    """A run-wide time budget that optional work draws from, leaving a reserve for the essential outputs.
+
+    Unstarted (or started with a budget of 0) it never runs out, so library callers and the
+    standalone scripts behave exactly as before.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ends_at: float | None = None
+        self.total_seconds = 0.0
+        self.reserve_seconds = 0.0
+
+    def start(self, total_seconds: float, *, reserve_seconds: float = 0.0) -> None:
+        with self._lock:
+            self.total_seconds = total_seconds
+            self.reserve_seconds = min(reserve_seconds, total_seconds)
+            self._ends_at = time.monotonic() + total_seconds if total_seconds > 0 else None
+        metrics.annotate("deadline", {"budget_seconds": total_seconds, "reserve_seconds": self.reserve_seconds})
+
+    def stop(self) -> None:
+        remaining = self.remaining()
+        if math.isfinite(remaining):
+            metrics.annotate("deadline", {"remaining_seconds": round(remaining, 3)})
+        with self._lock:
+            self._ends_at = None
+
+    @property
+    def active(self) -> bool:
+        return self._ends_at is not None
+
+    def remaining(self) -> float:
+        """Seconds until the hard deadline."""
+        ends_at = self._ends_at
+        return math.inf if ends_at is None else max(ends_at - time.monotonic(), 0.0)
+
+    def available(self) -> float:
+        """Seconds optional work may still use without eating into the essential reserve."""
+        ends_at = self._ends_at
+        if ends_at is None:
+            return math.inf
+        return max(ends_at - self.reserve_seconds - time.monotonic(), 0.0)
+
+    def clamp_timeout_ms(self, timeout_ms: float, *, essential: bool = False) -> int:
+        """Shrink a navigation timeout so it cannot run past the budget it draws from."""
+        budget = self.remaining() if essential else self.available()
+        if not math.isfinite(budget):
+            return int(timeout_ms)
+        # Playwright treats 0 as "no timeout", so never hand it out.
+        return int(max(min(timeout_ms, budget * 1000), 1))
+
+    def clamp_seconds(self, seconds: float, *, essential: bool = False) -> float:
+        budget = self.remaining() if essential else self.available()
+        return min(seconds, budget)
+
+    def can_start(self, needed_seconds: float) -> bool:
+        return self.available() >= needed_seconds
+
+    def note(self, **values: Any) -> None:
+        metrics.annotate("deadline", values)
+
+
+def plan_enrichment(limit: int, concurrency: int, *, per_page_seconds: float, minimum_seconds: float) -> int:
+    """How many detail pages fit in the time left; 0 means skip enrichment."""
+    available = deadline.available()
+    if not math.isfinite(available):
+        return limit
+    if available < minimum_seconds:
+        logger.warning(
+            "Skipping detail enrichment: %.0f s left before the essential reserve",
+            available,
+            extra={"event": "enrich_skipped_deadline"},
+        )
+        deadline.note(enrichment="skipped", enrichment_limit=0)
+        return 0
+    waves = max(int(available // max(per_page_seconds, 0.001)), 1)
+    planned = min(limit, waves * max(concurrency, 1))
+    if planned < limit:
+        logger.warning(
+            "Shrinking detail enrichment from %d to %d pages to fit %.0f s",
+            limit,
+            planned,
+            available,
+            extra={"event": "enrich_shrunk_deadline", "count": planned},
+        )
+    deadline.note(enrichment="shrunk" if planned < limit else "full", enrichment_limit=planned)
+    return planned
+
+
+deadline = RunDeadline()
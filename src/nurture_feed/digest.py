@@ -0,0 +1,199 @@
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from pathlib import Path
+
+from .config import DIGEST_DEFAULT_DAILY_TIME, DIGEST_QUEUE_FILE, SITE_TIMEZONE
+from .logging_utils import logger
+from .models import Announcement
+from .outbox import recipient_key
+from .storage import parse_cached_item
+from .utils import parse_iso_datetime, sort_announcements_for_feed
+
+POLICY_IMMEDIATE = "immediate"
+
+
+@dataclass
+class DigestPolicy:
+    # Triggers are OR-ed together; with none set, queued items are flushed on every run.
+    every_minutes: int | None = None
+    daily_at: time | None = None
+    max_items: int | None = None
+
+    @property
+    def immediate(self) -> bool:
+        return self.every_minutes is None and self.daily_at is None and self.max_items is None
+
+    def is_due(
+        self,
+        *,
+        queued: int,
+        first_queued_at: datetime,
+        last_flush_at: datetime | None,
+        now: datetime,
+    ) -> bool:
+        if queued <= 0:
+            return False
+        if self.immediate:
+            return True
+        if self.max_items is not None and queued >= self.max_items:
+            return True
+        if self.every_minutes is not None:
+            since = last_flush_at or first_queued_at
+            if now - since >= timedelta(minutes=self.every_minutes):
+                return True
+        if self.daily_at is not None:
+            local_now = now.astimezone(SITE_TIMEZONE)
+            slot = datetime.combine(local_now.date(), self.daily_at, tzinfo=SITE_TIMEZONE)
+            if local_now >= slot and (last_flush_at is None or last_flush_at < slot):
+                return True
+        return False
+
+
+def _parse_daily_time(value: str) -> time:
+    hours, _, minutes = value.partition(":")
+    return time(int(hours), int(minutes or 0))
+
+
+def parse_policy(text: str | None) -> DigestPolicy:
+    """Parse a policy such as "immediate", "every:60", "daily@08:00", "count:10" or a comma-separated mix."""
+    policy = DigestPolicy()
+    if not text:
+        return policy
+    for part in text.lower().replace(" ", "").split(","):
+        try:
+            if not part or part == POLICY_IMMEDIATE:
+                continue
+            if part.startswith("every:"):
+                policy.every_minutes = max(int(part[len("every:") :]), 1)
+            elif part.startswith("count:"):
+                policy.max_items = max(int(part[len("count:") :]), 1)
+            elif part == "daily":
+                policy.daily_at = _parse_daily_time(DIGEST_DEFAULT_DAILY_TIME)
+            elif part.startswith("daily@"):
+                policy.daily_at = _parse_daily_time(part[len("daily@") :])
+            else:
+                raise ValueError(part)
+        except ValueError:
+            logger.warning(
+                "Unknown digest policy %r; ignoring that part",
+                part,
+                extra={"event": "digest_policy_invalid"},
+            )
+    return policy
+
+
+@dataclass
+class RecipientQueue:
+    items: list[str] = field(default_factory=list)
+    first_queued_at: str | None = None
+    last_flush_at: str | None = None
+
+
+class DigestQueue:
+    """Per-recipient queue of announcements waiting for their digest to be flushed."""
+
+    def __init__(self, path: Path = DIGEST_QUEUE_FILE) -> None:
+        self.path = path
+        # Keyed by recipient hash, like the outbox.
+        self.recipients: dict[str, RecipientQueue] = {}
+        self.items: dict[str, Announcement] = {}
+
+    def load(self) -> "DigestQueue":
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return self
+        except json.JSONDecodeError:
+            logger.warning(
+                "Digest queue file is invalid JSON; starting with an empty queue",
+                extra={"event": "digest_queue_invalid", "path": str(self.path)},
+            )
+            return self
+        if not isinstance(raw, dict):
+            return self
+
+        for entry in raw.get("items", []):
+            item = parse_cached_item(entry)
+            if item is not None:
+                self.items[item.id] = item
+        for key, entry in (raw.get("recipients") or {}).items():
+            if not isinstance(entry, dict):
+                continue
+            self.recipients[key] = RecipientQueue(
+                items=[item_id for item_id in entry.get("items", []) if item_id in self.items],
+                first_queued_at=entry.get("first_queued_at"),
+                last_flush_at=entry.get("last_flush_at"),
+            )
+        return self
+
+    def save(self) -> None:
+        referenced = {item_id for entry in self.recipients.values() for item_id in entry.items}
+        payload = {
+            "recipients": {key: asdict(entry) for key, entry in sorted(self.recipients.items())},
+            "items": [asdict(item) for item_id, item in sorted(self.items.items()) if item_id in referenced],
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def add(self, address: str, items: list[Announcement], *, now: datetime | None = None) -> int:
+        now = now or datetime.now(timezone.utc)
+        entry = self.recipients.setdefault(recipient_key(address), RecipientQueue())
+        added = 0
+        for item in items:
+            self.items[item.id] = item
+            if item.id not in entry.items:
+                entry.items.append(item.id)
+                added += 1
+        if entry.items and entry.first_queued_at is None:
+            entry.first_queued_at = now.isoformat()
+        return added
+
+    def collect_due(
+        self,
+        recipients: list[str],
+        policies: dict[str, DigestPolicy],
+        default_policy: DigestPolicy,
+        *,
+        now: datetime | None = None,
+    ) -> dict[str, list[Announcement]]:
+        """Digests that are due, by address. The queue keeps them until ``mark_flushed``."""
+        now = now or datetime.now(timezone.utc)
+        addresses_by_key = {recipient_key(address): address for address in recipients}
+        flushed: dict[str, list[Announcement]] = {}
+        for key in list(self.recipients):
+            entry = self.recipients[key]
+            address = addresses_by_key.get(key)
+            if address is None:
+                # Unsubscribed since the items were queued.
+                del self.recipients[key]
+                continue
+            policy = policies.get(address.strip().lower(), default_policy)
+            due = policy.is_due(
+                queued=len(entry.items),
+                first_queued_at=parse_iso_datetime(entry.first_queued_at) or now,
+                last_flush_at=parse_iso_datetime(entry.last_flush_at),
+                now=now,
+            )
+            if not due:
+                continue
+            flushed[address] = sort_announcements_for_feed([self.items[item_id] for item_id in entry.items])
+        return flushed
+
+    def mark_flushed(self, flushed: dict[str, list[Announcement]], *, now: datetime | None = None) -> None:
+        now = now or datetime.now(timezone.utc)
+        for address, items in flushed.items():
+            entry = self.recipients.get(recipient_key(address))
+            if entry is None:
+                continue
+            sent = {item.id for item in items}
+            entry.items = [item_id for item_id in entry.items if item_id not in sent]
+            entry.first_queued_at = now.isoformat() if entry.items else None
+            entry.last_flush_at = now.isoformat()
+        logger.info(
+            "Digest queue flushed for %d recipient(s)",
+            len(flushed),
+            extra={"event": "digest_flushed", "count": sum(len(items) for items in flushed.values())},
+        )
@@ -0,0 +1,170 @@
+import hashlib
+import html
+from collections import OrderedDict
+from string import Template
+
+from .config import EMAIL_FRAGMENT_CACHE_SIZE, TARGET_URL
+from .models import Announcement
+
+PAGE_HTML = (
+    "<!doctype html><html><body style=\"margin:0;padding:0;background:#f2f4f7;\">"
+    "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
+    "style=\"border-collapse:collapse;background:#f2f4f7;\">"
+    "<tr><td align=\"center\" style=\"padding:20px 12px;\">"
+    "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
+    "style=\"max-width:700px;border-collapse:collapse;\">"
+    "<tr><td style=\"padding:0 0 12px 0;\">"
+    "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
+    "style=\"border-collapse:separate;border-spacing:0;background:linear-gradient(135deg,#155eef,#0ea5e9);"
+    "border-radius:16px;\">"
+    "<tr><td style=\"padding:18px 20px;color:#ffffff;\">"
+    "<div style=\"font-size:12px;letter-spacing:.08em;text-transform:uppercase;opacity:.9;\">Nurture Feed</div>"
+    "<div style=\"margin-top:6px;font-size:22px;line-height:1.2;font-weight:700;\">"
+    "${count} new announcement(s)</div>"
+    "<div style=\"margin-top:6px;font-size:13px;line-height:1.4;opacity:.95;\">"
+    "This notification was generated by your GitHub Actions RSS monitor.</div>"
+    "</td></tr></table>"
+    "</td></tr>"
+    "<tr><td style=\"padding:0 0 10px 0;\">"
+    "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
+    "style=\"border-collapse:separate;border-spacing:0;background:#ffffff;border:1px solid #eaecf0;"
+    "border-radius:12px;\">"
+    "<tr><td style=\"padding:12px 16px;color:#475467;font-size:13px;line-height:1.5;\">"
+    "Announcements are listed below. Click any item to open the original Nurture page."
+    "</td></tr></table>"
+    "</td></tr>"
+    "${rows}"
+    "<tr><td style=\"padding-top:4px;\">"
+    "<div style=\"color:#667085;font-size:12px;line-height:1.5;padding:6px 2px;\">"
+    "Source: <a href=\"${source_url}\" style=\"color:#155eef;text-decoration:none;\">${source_url}</a>"
+    "</div></td></tr>"
+    "</table>"
+    "</td></tr></table>"
+    "</body></html>"
+)
+
+ITEM_HTML = (
+    "<tr><td style=\"padding:0 0 10px 0;\">"
+    "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
+    "style=\"border-collapse:separate;border-spacing:0;background:#ffffff;border:1px solid #eaecf0;"
+    "border-radius:12px;\">"
+    "<tr><td style=\"padding:14px 16px;\">"
+    "<div style=\"font-size:15px;line-height:1.35;font-weight:700;color:#101828;\">"
+    "<a href=\"${link}\" style=\"color:#101828;text-decoration:none;\">${title}</a></div>"
+    "${meta}"
+    "${description}"
+    "<div style=\"margin-top:10px;\"><a href=\"${link}\" "
+    "style=\"color:#155eef;font-size:13px;font-weight:600;text-decoration:none;\">Open announcement →</a></div>"
+    "</td></tr></table>"
+    "</td></tr>"
+)
+
+META_HTML = "<div style=\"margin:6px 0 0;color:#667085;font-size:12px;line-height:1.4;\">${meta}</div>"
+DESCRIPTION_HTML = "<div style=\"margin:8px 0 0;color:#344054;font-size:13px;line-height:1.5;\">${description}</div>"
+
+PAGE_PLAIN = "${count} new announcement(s) detected on Nurture:\n\n${rows}Source: ${source_url}"
+ITEM_PLAIN = "- ${title}\n  ${link}\n${date}\n"
+DATE_PLAIN = "  Date: ${date}\n"
+
+SUBJECT = "[Nurture] ${count} new announcement(s)"
+
+
+_PAGE_HTML = Template(PAGE_HTML)
+_ITEM_HTML = Template(ITEM_HTML)
+_META_HTML = Template(META_HTML)
+_DESCRIPTION_HTML = Template(DESCRIPTION_HTML)
+_PAGE_PLAIN = Template(PAGE_PLAIN)
+_ITEM_PLAIN = Template(ITEM_PLAIN)
+_DATE_PLAIN = Template(DATE_PLAIN)
+_SUBJECT = Template(SUBJECT)
+
+
+def truncate_email_text(value: str | None, max_len: int = 260) -> str:
+    if not value:
+        return ""
+    text = " ".join(value.split())
+    if len(text) <= max_len:
+        return text
+    return text[: max_len - 1].rstrip() + "…"
+
+
+def _fragment_key(item: Announcement) -> str:
+    digest = hashlib.sha256()
+    for part in (item.id, item.title, item.link, item.pub_date, item.pub_date_raw, item.author, item.description):
+        # A leading marker keeps None apart from an empty string.
+        digest.update(b"\0" if part is None else b"\1" + part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class FragmentCache:
+    def __init__(self, max_size: int = EMAIL_FRAGMENT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[str, str]] = OrderedDict()
+
+    def get(self, item: Announcement) -> tuple[str, str]:
+        key = _fragment_key(item)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached
+        self.misses += 1
+        fragment = (render_item_plain(item), render_item_html(item))
+        self._entries[key] = fragment
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return fragment
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+fragment_cache = FragmentCache()
+
+
+def render_item_plain(item: Announcement) -> str:
+    date = _DATE_PLAIN.substitute({"date": item.pub_date}) if item.pub_date else ""
+    return _ITEM_PLAIN.substitute({"title": item.title, "link": item.link, "date": date})
+
+
+def render_item_html(item: Announcement) -> str:
+    meta_parts = []
+    if item.pub_date_raw:
+        meta_parts.append(f"Posted: {html.escape(item.pub_date_raw)}")
+    elif item.pub_date:
+        meta_parts.append(f"Posted: {html.escape(item.pub_date)}")
+    if item.author:
+        meta_parts.append(f"By: {html.escape(item.author)}")
+    description = html.escape(truncate_email_text(item.description))
+
+    return _ITEM_HTML.substitute(
+        {
+            "link": html.escape(item.link, quote=True),
+            "title": html.escape(item.title),
+            "meta": _META_HTML.substitute({"meta": " | ".join(meta_parts)}) if meta_parts else "",
+            "description": _DESCRIPTION_HTML.substitute({"description": description}) if description else "",
+        }
+    )
+
+
+def render_digest(items: list[Announcement], *, cache: FragmentCache | None = None) -> tuple[str, str, str]:
+    cache = cache or fragment_cache
+    fragments = [cache.get(item) for item in items]
+    count = str(len(items))
+    subject = _SUBJECT.substitute({"count": count})
+    plain = _PAGE_PLAIN.substitute(
+        {"count": count, "rows": "".join(fragment[0] for fragment in fragments), "source_url": TARGET_URL}
+    )
+    page_html = _PAGE_HTML.substitute(
+        {
+            "count": count,
+            "rows": "".join(fragment[1] for fragment in fragments),
+            "source_url": html.escape(TARGET_URL, quote=True),
+        }
+    )
+    return subject, plain, page_html
@@ -1,21 +1,36 @@
-import html
 import os
-import smtplib
+import time
+from dataclasses import dataclass
 from email.message import EmailMessage
 
-from .config import TARGET_URL
+from .config import (
+    DIGEST_DEFAULT_POLICY,
+    EMAIL_ENVELOPE_SIZE,
+    EMAIL_MAX_CONNECTIONS,
+    EMAIL_SEND_RATE_PER_MINUTE,
+    OUTBOX_DRAIN_BUDGET_SECONDS,
+)
+from .digest import DigestQueue, parse_policy
+from .email_templates import render_digest
 from .logging_utils import logger
 from .models import Announcement
+from .outbox import STATUS_SENT, Outbox, recipient_key
+from .smtp_delivery import UNDISCLOSED_RECIPIENTS, RateLimiter, SmtpSettings, deliver_batch, deliver_message
+from .subscriptions import (
+    group_recipients_by_items,
+    load_subscription_text,
+    match_items_per_recipient,
+    parse_delivery_policies,
+    parse_subscriptions,
+)
 from .utils import load_recipients
 
 
-def _truncate_email_text(value: str | None, max_len: int = 260) -> str:
-    if not value:
-        return ""
-    text = " ".join(value.split())
-    if len(text) <= max_len:
-        return text
-    return text[: max_len - 1].rstrip() + "…"
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
 
 
 def send_email_notification(new_items: list[Announcement]) -> bool:
@@ -32,120 +47,186 @@ def send_email_notification(new_items: list[Announcement]) -> bool:
         logger.info("Email settings incomplete; skipping notification", extra={"event": "email_skipped"})
         return False
 
-    plain_lines = [f"{len(new_items)} new announcement(s) detected on Nurture:", ""]
-    for item in new_items:
-        plain_lines.append(f"- {item.title}")
-        plain_lines.append(f"  {item.link}")
-        if item.pub_date:
-            plain_lines.append(f"  Date: {item.pub_date}")
-        plain_lines.append("")
-    plain_lines.append(f"Source: {TARGET_URL}")
-
-    html_rows: list[str] = []
-    for item in new_items:
-        safe_title = html.escape(item.title)
-        safe_link = html.escape(item.link, quote=True)
-        safe_date = html.escape(item.pub_date) if item.pub_date else ""
-        safe_date_raw = html.escape(item.pub_date_raw) if item.pub_date_raw else ""
-        safe_author = html.escape(item.author) if item.author else ""
-        safe_desc = html.escape(item.description) if item.description else ""
-        safe_desc = html.escape(_truncate_email_text(item.description))
-
-        meta_parts = []
-        if safe_date_raw:
-            meta_parts.append(f"Posted: {safe_date_raw}")
-        elif safe_date:
-            meta_parts.append(f"Posted: {safe_date}")
-        if safe_author:
-            meta_parts.append(f"By: {safe_author}")
-        meta_html = " | ".join(meta_parts)
-
-        date_line = (
-            f"<div style=\"margin:6px 0 0;color:#667085;font-size:12px;line-height:1.4;\">{meta_html}</div>"
-            if meta_html
-            else ""
+    msg = compose_message(render_notification(new_items), sender)
+    try:
+        report = deliver_message(
+            msg,
+            recipients,
+            SmtpSettings.from_env(sender, password),
+            from_addr=sender,
+            envelope_size=_env_int("EMAIL_ENVELOPE_SIZE", EMAIL_ENVELOPE_SIZE),
+            max_connections=_env_int("EMAIL_MAX_CONNECTIONS", EMAIL_MAX_CONNECTIONS),
         )
-        desc_html = (
-            f"<div style=\"margin:8px 0 0;color:#344054;font-size:13px;line-height:1.5;\">{safe_desc}</div>"
-            if safe_desc
-            else ""
+    except Exception:
+        logger.error(
+            "Email notification failed; continuing without crashing",
+            extra={"event": "email_failed", "count": len(new_items)},
+            exc_info=True,
         )
-        html_rows.append(
-            (
-                "<tr><td style=\"padding:0 0 10px 0;\">"
-                "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
-                "style=\"border-collapse:separate;border-spacing:0;background:#ffffff;border:1px solid #eaecf0;"
-                "border-radius:12px;\">"
-                "<tr><td style=\"padding:14px 16px;\">"
-                f"<div style=\"font-size:15px;line-height:1.35;font-weight:700;color:#101828;\">"
-                f"<a href=\"{safe_link}\" style=\"color:#101828;text-decoration:none;\">{safe_title}</a></div>"
-                f"{date_line}"
-                f"{desc_html}"
-                f"<div style=\"margin-top:10px;\"><a href=\"{safe_link}\" "
-                "style=\"color:#155eef;font-size:13px;font-weight:600;text-decoration:none;\">Open announcement →</a></div>"
-                "</td></tr></table>"
-                "</td></tr>"
-            )
+        return False
+
+    if report.failed:
+        logger.error(
+            "Email notification failed for %d of %d recipient(s); continuing without crashing",
+            len(report.failed),
+            len(recipients),
+            extra={"event": "email_failed", "count": len(new_items)},
         )
+    if report.delivered:
+        logger.info("Notification email sent", extra={"event": "email_sent", "count": len(new_items)})
+    return report.ok
 
-    msg = EmailMessage()
-    msg["Subject"] = f"[Nurture] {len(new_items)} new announcement(s)"
-    msg["From"] = sender
-    msg["To"] = ", ".join(recipients)
-    msg.set_content("\n".join(plain_lines))
-    msg.add_alternative(
-        (
-            "<!doctype html><html><body style=\"margin:0;padding:0;background:#f2f4f7;\">"
-            "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
-            "style=\"border-collapse:collapse;background:#f2f4f7;\">"
-            "<tr><td align=\"center\" style=\"padding:20px 12px;\">"
-            "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
-            "style=\"max-width:700px;border-collapse:collapse;\">"
-            "<tr><td style=\"padding:0 0 12px 0;\">"
-            "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
-            "style=\"border-collapse:separate;border-spacing:0;background:linear-gradient(135deg,#155eef,#0ea5e9);"
-            "border-radius:16px;\">"
-            "<tr><td style=\"padding:18px 20px;color:#ffffff;\">"
-            "<div style=\"font-size:12px;letter-spacing:.08em;text-transform:uppercase;opacity:.9;\">Nurture Feed</div>"
-            f"<div style=\"margin-top:6px;font-size:22px;line-height:1.2;font-weight:700;\">"
-            f"{len(new_items)} new announcement(s)</div>"
-            "<div style=\"margin-top:6px;font-size:13px;line-height:1.4;opacity:.95;\">"
-            "This notification was generated by your GitHub Actions RSS monitor.</div>"
-            "</td></tr></table>"
-            "</td></tr>"
-            "<tr><td style=\"padding:0 0 10px 0;\">"
-            "<table role=\"presentation\" width=\"100%\" cellspacing=\"0\" cellpadding=\"0\" "
-            "style=\"border-collapse:separate;border-spacing:0;background:#ffffff;border:1px solid #eaecf0;"
-            "border-radius:12px;\">"
-            "<tr><td style=\"padding:12px 16px;color:#475467;font-size:13px;line-height:1.5;\">"
-            "Announcements are listed below. Click any item to open the original Nurture page."
-            "</td></tr></table>"
-            "</td></tr>"
-            f"{''.join(html_rows)}"
-            "<tr><td style=\"padding-top:4px;\">"
-            "<div style=\"color:#667085;font-size:12px;line-height:1.5;padding:6px 2px;\">"
-            f"Source: <a href=\"{TARGET_URL}\" style=\"color:#155eef;text-decoration:none;\">{TARGET_URL}</a>"
-            "</div></td></tr>"
-            "</table>"
-            "</td></tr></table>"
-            "</body></html>"
-        ),
-        subtype="html",
+
+def queue_email_notification(
+    new_items: list[Announcement],
+    *,
+    outbox: Outbox | None = None,
+    digest_queue: DigestQueue | None = None,
+) -> bool:
+    recipients = load_recipients(
+        os.getenv("EMAIL_RECIPIENTS"),
+        file_path=os.getenv("EMAIL_RECIPIENTS_FILE"),
     )
+    if not os.getenv("EMAIL_SENDER") or not os.getenv("EMAIL_PASSWORD") or not recipients:
+        if new_items:
+            logger.info("Email settings incomplete; skipping notification", extra={"event": "email_skipped"})
+        return False
 
-    try:
-        with smtplib.SMTP("smtp.gmail.com", 587, timeout=30) as smtp:
-            smtp.ehlo()
-            smtp.starttls()
-            smtp.ehlo()
-            smtp.login(sender, password)
-            smtp.send_message(msg)
-        logger.info("Notification email sent", extra={"event": "email_sent", "count": len(new_items)})
+    subscription_text = load_subscription_text(
+        os.getenv("EMAIL_SUBSCRIPTIONS"),
+        file_path=os.getenv("EMAIL_SUBSCRIPTIONS_FILE"),
+    )
+    digest_queue = digest_queue or DigestQueue().load()
+    matched = match_items_per_recipient(new_items, recipients, parse_subscriptions(subscription_text))
+    for address, items in matched.items():
+        digest_queue.add(address, items)
+
+    # Runs without new items still flush interval and daily digests that came due.
+    policies = {
+        address: parse_policy(policy) for address, policy in parse_delivery_policies(subscription_text).items()
+    }
+    flushed = digest_queue.collect_due(
+        recipients,
+        policies,
+        parse_policy(os.getenv("EMAIL_DIGEST_POLICY") or DIGEST_DEFAULT_POLICY),
+    )
+    groups = group_recipients_by_items(flushed)
+    if not groups:
+        digest_queue.save()
+        if new_items:
+            logger.info("New items are waiting in the digest queue", extra={"event": "email_deferred"})
+        return False
+
+    outbox = outbox or Outbox().load()
+    queued = 0
+    for items, members in groups:
+        rendered = render_notification(items)
+        if outbox.enqueue(rendered.subject, rendered.plain, rendered.html, members) is not None:
+            queued += 1
+    # Only once the outbox is on disk does it own the flushed items; until then the queue keeps them.
+    outbox.save()
+    digest_queue.mark_flushed(flushed)
+    digest_queue.save()
+    logger.info(
+        "Notification groups queued for %d recipient group(s)",
+        len(groups),
+        extra={"event": "email_grouped", "count": queued},
+    )
+    return queued > 0
+
+
+def drain_email_outbox(
+    *,
+    outbox: Outbox | None = None,
+    budget_seconds: float | None = None,
+) -> bool:
+    """Send what is due; False if any of it could not be sent. Deferred mail is not a failure."""
+    outbox = outbox or Outbox().load()
+    due = outbox.due()
+    if not due:
+        outbox.prune()
+        outbox.save()
         return True
+
+    sender = os.getenv("EMAIL_SENDER")
+    password = os.getenv("EMAIL_PASSWORD")
+    recipients = load_recipients(
+        os.getenv("EMAIL_RECIPIENTS"),
+        file_path=os.getenv("EMAIL_RECIPIENTS_FILE"),
+    )
+    if not sender or not password or not recipients:
+        logger.info(
+            "Email settings incomplete; leaving outbox queued",
+            extra={"event": "email_skipped", "count": len(due)},
+        )
+        return False
+
+    addresses_by_key = {recipient_key(address): address for address in recipients}
+    jobs = []
+    unknown_keys: list[list[str]] = []
+    for message in due:
+        addresses = [addresses_by_key[key] for key in message.pending if key in addresses_by_key]
+        # Recipients removed from the list since enqueueing are dropped, not retried.
+        unknown_keys.append([key for key in message.pending if key not in addresses_by_key])
+        jobs.append((compose_message(RenderedEmail(message.subject, message.plain, message.html), sender), addresses))
+
+    budget = OUTBOX_DRAIN_BUDGET_SECONDS if budget_seconds is None else budget_seconds
+    try:
+        reports = deliver_batch(
+            jobs,
+            SmtpSettings.from_env(sender, password),
+            from_addr=sender,
+            envelope_size=_env_int("EMAIL_ENVELOPE_SIZE", EMAIL_ENVELOPE_SIZE),
+            max_connections=_env_int("EMAIL_MAX_CONNECTIONS", EMAIL_MAX_CONNECTIONS),
+            rate_limiter=RateLimiter(_env_int("EMAIL_SEND_RATE_PER_MINUTE", EMAIL_SEND_RATE_PER_MINUTE)),
+            deadline=time.monotonic() + max(budget, 0),
+        )
     except Exception:
         logger.error(
-            "Email notification failed; continuing without crashing",
-            extra={"event": "email_failed", "count": len(new_items)},
+            "Outbox delivery failed; messages stay queued",
+            extra={"event": "email_failed", "count": len(due)},
             exc_info=True,
         )
         return False
+
+    sent = 0
+    failed = 0
+    for message, report, unknown in zip(due, reports, unknown_keys):
+        outbox.record_delivery(
+            message,
+            delivered=report.delivered,
+            failed=report.failed,
+            unknown=unknown,
+            uncertain=report.uncertain,
+        )
+        if message.status == STATUS_SENT:
+            sent += 1
+        if report.failed:
+            failed += 1
+    outbox.prune()
+    outbox.save()
+    logger.info("Outbox drained", extra={"event": "email_sent", "count": sent})
+    return not failed
+
+
+@dataclass
+class RenderedEmail:
+    subject: str
+    plain: str
+    html: str
+
+
+def render_notification(new_items: list[Announcement]) -> RenderedEmail:
+    subject, plain, page_html = render_digest(new_items)
+    return RenderedEmail(subject=subject, plain=plain, html=page_html)
+
+
+def compose_message(rendered: RenderedEmail, sender: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = rendered.subject
+    msg["From"] = sender
+    # Recipients only appear in per-chunk SMTP envelopes so addresses are never shared.
+    msg["To"] = UNDISCLOSED_RECIPIENTS
+    msg.set_content(rendered.plain)
+    msg.add_alternative(rendered.html, subtype="html")
+    return msg
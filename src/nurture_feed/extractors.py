@@ -1,8 +1,6 @@
 from typing import Any
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
-
 from .models import Announcement
 from .selectors import get_selector_config
 from .utils import estimate_pub_datetime, make_id, normalize_whitespace
@@ -89,6 +87,8 @@ def parse_announcement_from_node(
 
 
 def extract_announcements_from_html(html: str, base_url: str) -> list[Announcement]:
+    from bs4 import BeautifulSoup
+
     selector_cfg = get_selector_config()
     soup = BeautifulSoup(html, "html.parser")
 
@@ -121,6 +121,8 @@ def extract_announcements_from_html(html: str, base_url: str) -> list[Announceme
 
 
 def extract_detail_fields_from_html(html: str) -> dict[str, str | None]:
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "html.parser")
     title_el = soup.select_one(".card .card-body h5")
     body_el = soup.select_one(".card .card-body .tx-14.text-muted.my-3")
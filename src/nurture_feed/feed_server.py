@@ -0,0 +1,306 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path, PurePosixPath
+from urllib.parse import unquote, urlsplit
+
+from .config import (
+    ARCHIVE_DIR,
+    ATOM_FEED_FILE,
+    FEED_FILE,
+    FEED_SERVER_HOST,
+    FEED_SERVER_MAX_AGE_SECONDS,
+    FEED_SERVER_PORT,
+    JSON_FEED_FILE,
+)
+from .logging_utils import logger
+
+STATS_PATH = "/_stats"
+
+_CONTENT_TYPES = {
+    FEED_FILE.name: "application/rss+xml; charset=utf-8",
+    ATOM_FEED_FILE.name: "application/atom+xml; charset=utf-8",
+    JSON_FEED_FILE.name: "application/feed+json; charset=utf-8",
+}
+
+# Only generated artifacts are served; anything else under the root (auth.json, cache.json, .git)
+# is a 404 even though it is readable.
+_FEED_PATHS = {path.as_posix() for path in (FEED_FILE, ATOM_FEED_FILE, JSON_FEED_FILE)}
+_COMPRESSED_TYPES = {".gz": "application/gzip", ".br": "application/x-brotli"}
+
+
+@dataclass
+class Artifact:
+    mtime_ns: int
+    size: int
+    body: bytes
+    digest: str
+    etag: str
+    gzip_etag: str
+    last_modified: datetime
+    content_type: str
+    gzip_body: bytes | None = None
+
+
+@dataclass
+class ClientStats:
+    requests: int = 0
+    ok: int = 0
+    not_modified: int = 0
+    not_found: int = 0
+    gzip: int = 0
+    bytes_sent: int = 0
+    last_seen: str | None = None
+
+
+def _is_artifact(relative: str) -> bool:
+    path = PurePosixPath(relative)
+    if path.suffix in _COMPRESSED_TYPES:
+        path = path.with_suffix("")
+    if path.as_posix() in _FEED_PATHS:
+        return True
+    return path.parent.as_posix() == ARCHIVE_DIR.as_posix() and path.suffix == ".xml"
+
+
+def _content_type_for(path: Path) -> str:
+    if path.suffix in _COMPRESSED_TYPES:
+        return _COMPRESSED_TYPES[path.suffix]
+    if path.name in _CONTENT_TYPES:
+        return _CONTENT_TYPES[path.name]
+    if path.suffix == ".xml":
+        return "application/rss+xml; charset=utf-8"
+    guessed, _ = mimetypes.guess_type(path.name)
+    return guessed or "application/octet-stream"
+
+
+class ArtifactStore:
+    def __init__(self, root: Path) -> None:
+        self.root = root.resolve()
+        self._lock = threading.Lock()
+        self._artifacts: dict[Path, Artifact] = {}
+
+    def resolve(self, url_path: str) -> Path | None:
+        relative = unquote(url_path).lstrip("/") or FEED_FILE.name
+        if not _is_artifact(relative):
+            return None
+        candidate = (self.root / relative).resolve()
+        if candidate != self.root and self.root not in candidate.parents:
+            return None
+        if not candidate.is_file():
+            return None
+        return candidate
+
+    def get(self, path: Path) -> Artifact:
+        stat = path.stat()
+        with self._lock:
+            cached = self._artifacts.get(path)
+            if cached is not None and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+                return cached
+
+        body = path.read_bytes()
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # Last-Modified is when the content last changed, so it moves exactly when the ETag does;
+        # a rewrite with identical bytes keeps the old value.
+        last_modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc).replace(microsecond=0)
+        if cached is not None:
+            if cached.digest == digest:
+                last_modified = cached.last_modified
+            else:
+                last_modified = max(last_modified, cached.last_modified + timedelta(seconds=1))
+        artifact = Artifact(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            body=body,
+            digest=digest,
+            etag=f'"{digest}"',
+            gzip_etag=f'"{digest}-gzip"',
+            last_modified=last_modified,
+            content_type=_content_type_for(path),
+        )
+        with self._lock:
+            self._artifacts[path] = artifact
+        return artifact
+
+    def gzip_body(self, path: Path, artifact: Artifact) -> bytes:
+        if artifact.gzip_body is not None:
+            return artifact.gzip_body
+        precompressed = path.with_name(path.name + ".gz")
+        data: bytes | None = None
+        try:
+            if precompressed.stat().st_mtime_ns >= artifact.mtime_ns:
+                data = precompressed.read_bytes()
+        except OSError:
+            data = None
+        if data is None:
+            data = gzip.compress(artifact.body, compresslevel=6, mtime=0)
+        artifact.gzip_body = data
+        return data
+
+
+class ClientCounters:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: dict[str, ClientStats] = {}
+
+    def record(self, client: str, status: int, *, sent: int, gzipped: bool) -> None:
+        with self._lock:
+            stats = self._clients.setdefault(client, ClientStats())
+            stats.requests += 1
+            if status == HTTPStatus.OK:
+                stats.ok += 1
+            elif status == HTTPStatus.NOT_MODIFIED:
+                stats.not_modified += 1
+            elif status == HTTPStatus.NOT_FOUND:
+                stats.not_found += 1
+            if gzipped:
+                stats.gzip += 1
+            stats.bytes_sent += sent
+            stats.last_seen = datetime.now(timezone.utc).isoformat()
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {client: asdict(stats) for client, stats in sorted(self._clients.items())}
+
+
+def _accepts_gzip(header: str | None) -> bool:
+    if not header:
+        return False
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() not in {"gzip", "*"}:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        return quality > 0
+    return False
+
+
+def _etag_matches(header: str, etags: tuple[str, ...]) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison (RFC 9110, section 13.1.2).
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return any(etag in candidates for etag in etags)
+
+
+class FeedRequestHandler(BaseHTTPRequestHandler):
+    server_version = "NurtureFeed/1.0"
+    store: ArtifactStore
+    counters: ClientCounters
+
+    def do_GET(self) -> None:
+        self._serve(include_body=True)
+
+    def do_HEAD(self) -> None:
+        self._serve(include_body=False)
+
+    def _client_key(self) -> str:
+        agent = self.headers.get("User-Agent", "-")
+        return f"{self.client_address[0]} {agent}"
+
+    def _serve(self, *, include_body: bool) -> None:
+        url_path = urlsplit(self.path).path
+        if url_path == STATS_PATH:
+            body = json.dumps(self.counters.snapshot(), indent=2).encode("utf-8")
+            self._send(HTTPStatus.OK, {"Content-Type": "application/json", "Cache-Control": "no-store"}, body, include_body)
+            return
+
+        path = self.store.resolve(url_path)
+        if path is None:
+            self._send(HTTPStatus.NOT_FOUND, {"Content-Type": "text/plain; charset=utf-8"}, b"Not found\n", include_body)
+            return
+
+        artifact = self.store.get(path)
+        # A .gz or .br copy asked for by name is sent as it is.
+        use_gzip = path.suffix not in _COMPRESSED_TYPES and _accepts_gzip(
+            self.headers.get("Accept-Encoding")
+        )
+        headers = {
+            "ETag": artifact.gzip_etag if use_gzip else artifact.etag,
+            "Last-Modified": format_datetime(artifact.last_modified, usegmt=True),
+            "Cache-Control": f"public, max-age={FEED_SERVER_MAX_AGE_SECONDS}",
+            "Vary": "Accept-Encoding",
+        }
+
+        if self._not_modified(artifact):
+            self._send(HTTPStatus.NOT_MODIFIED, headers, b"", include_body)
+            return
+
+        body = self.store.gzip_body(path, artifact) if use_gzip else artifact.body
+        headers["Content-Type"] = artifact.content_type
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+        self._send(HTTPStatus.OK, headers, body, include_body, gzipped=use_gzip)
+
+    def _not_modified(self, artifact: Artifact) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return _etag_matches(if_none_match, (artifact.etag, artifact.gzip_etag))
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if not if_modified_since:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return artifact.last_modified <= since
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        headers: dict[str, str],
+        body: bytes,
+        include_body: bool,
+        *,
+        gzipped: bool = False,
+    ) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        sent = 0
+        if include_body and status != HTTPStatus.NOT_MODIFIED:
+            self.wfile.write(body)
+            sent = len(body)
+        self.counters.record(self._client_key(), status, sent=sent, gzipped=gzipped)
+
+    def log_message(self, format: str, *args: object) -> None:
+        logger.info(
+            "%s %s",
+            self.address_string(),
+            format % args,
+            extra={"event": "feed_request", "url": self.path},
+        )
+
+
+def create_feed_server(
+    root: Path = Path("."),
+    *,
+    host: str = FEED_SERVER_HOST,
+    port: int = FEED_SERVER_PORT,
+) -> ThreadingHTTPServer:
+    handler = type(
+        "BoundFeedRequestHandler",
+        (FeedRequestHandler,),
+        {"store": ArtifactStore(root), "counters": ClientCounters()},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
@@ -1,34 +1,124 @@
+import atexit
 import json
 import logging
+import math
+import os
+import queue
 import sys
+import threading
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from .config import LOG_DEBUG_SAMPLE_RATE, LOG_LEVEL
+
+# Attributes every LogRecord has; anything else on a record came in through `extra=`.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
 
 
 class JsonLogFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         payload = {
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "message": record.getMessage(),
             "logger": record.name,
         }
-        for key in ("event", "attempt", "url", "count", "path"):
-            value = getattr(record, key, None)
-            if value is not None:
-                payload[key] = value
+        for key, value in vars(record).items():
+            if key in _RECORD_ATTRIBUTES or key.startswith("_") or value is None:
+                continue
+            payload[key] = value
         if record.exc_info:
             payload["exception"] = self.formatException(record.exc_info)
-        return json.dumps(payload, ensure_ascii=True)
+        return json.dumps(payload, ensure_ascii=True, default=str)
+
+
+class DebugSampler(logging.Filter):
+    """Keeps about ``rate`` of DEBUG records per event; the first of each event always passes."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = min(max(rate, 0.0), 1.0)
+        self._seen: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        if self.rate <= 0.0:
+            return False
+        event = str(getattr(record, "event", None) or record.msg)
+        with self._lock:
+            count = self._seen.get(event, 0) + 1
+            self._seen[event] = count
+        return math.ceil(count * self.rate) != math.ceil((count - 1) * self.rate)
+
+
+class _DeferredFormatQueueHandler(QueueHandler):
+    # The stock prepare() formats the record on the calling thread; only freeze the message
+    # here and leave JSON serialization to the listener thread.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener: QueueListener | None = None
+
+
+def _env_sample_rate() -> float:
+    try:
+        return float(os.getenv("LOG_DEBUG_SAMPLE_RATE") or LOG_DEBUG_SAMPLE_RATE)
+    except ValueError:
+        return LOG_DEBUG_SAMPLE_RATE
+
+
+def _env_level() -> tuple[str, str | None]:
+    """The root level from ``LOG_LEVEL`` and, if it is not a level name, the rejected value."""
+    value = (os.getenv("LOG_LEVEL") or LOG_LEVEL).strip().upper()
+    if value in logging.getLevelNamesMapping():
+        return value, None
+    return LOG_LEVEL, value
 
 
 def configure_logging() -> None:
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(JsonLogFormatter())
+    """Write log records from a queue listener thread; honours ``LOG_LEVEL`` and ``LOG_DEBUG_SAMPLE_RATE``."""
+    global _listener
+    shutdown_logging()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonLogFormatter())
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = _DeferredFormatQueueHandler(log_queue)
+    queue_handler.addFilter(DebugSampler(_env_sample_rate()))
+
     root = logging.getLogger()
     root.handlers.clear()
-    root.addHandler(handler)
-    root.setLevel(logging.INFO)
+    root.addHandler(queue_handler)
+    level, invalid = _env_level()
+    root.setLevel(level)
 
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    if invalid is not None:
+        logger.warning(
+            "Unknown LOG_LEVEL %r; using %s",
+            invalid,
+            level,
+            extra={"event": "log_level_invalid"},
+        )
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread; safe to call more than once."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.flush()
+    _listener = None
 
-logger = logging.getLogger("rss_feed")
 
+atexit.register(shutdown_logging)
+
+logger = logging.getLogger("rss_feed")
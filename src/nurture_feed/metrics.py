@@ -0,0 +1,252 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from .logging_utils import logger
+
+# Bump only when a field is renamed or removed; new fields may be added within a version.
+REPORT_SCHEMA_VERSION = 2
+_METRIC_PREFIX = "nurture_feed"
+
+
+@dataclass
+class StageTiming:
+    name: str
+    status: str
+    started_offset_seconds: float
+    wall_seconds: float
+    # Process CPU time while the stage ran; stages running concurrently overlap.
+    cpu_seconds: float
+
+
+@dataclass
+class PageTiming:
+    kind: str
+    url: str
+    navigation_ms: float
+    parse_ms: float
+    bytes_fetched: int
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"count": 0, "total": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def percentile(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+    return {
+        "count": len(ordered),
+        "total": round(sum(ordered), 3),
+        "p50": percentile(0.5),
+        "p95": percentile(0.95),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class RunMetrics:
+    """Thread-safe collector for one pipeline run: stage timings, page latencies, counters and gauges."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = datetime.now(timezone.utc)
+            self._started = time.perf_counter()
+            self.stages: list[StageTiming] = []
+            self.pages: list[PageTiming] = []
+            self.counters: dict[str, int] = {}
+            self._in_flight: dict[str, int] = {}
+            self.high_water: dict[str, int] = {}
+            self.http: dict[str, dict[str, int]] = {}
+            self.annotations: dict[str, dict[str, Any]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        status = "error"
+        try:
+            yield
+            status = "ok"
+        finally:
+            timing = StageTiming(
+                name=name,
+                status=status,
+                started_offset_seconds=round(started - self._started, 6),
+                wall_seconds=round(time.perf_counter() - started, 6),
+                cpu_seconds=round(time.process_time() - cpu_started, 6),
+            )
+            with self._lock:
+                self.stages.append(timing)
+
+    def record_page(self, kind: str, url: str, *, navigation_ms: float, parse_ms: float, bytes_fetched: int) -> None:
+        with self._lock:
+            self.pages.append(
+                PageTiming(
+                    kind=kind,
+                    url=url,
+                    navigation_ms=round(navigation_ms, 3),
+                    parse_ms=round(parse_ms, 3),
+                    bytes_fetched=bytes_fetched,
+                )
+            )
+
+    def record_http_response(self, kind: str, *, from_cache: bool | None = None, network_bytes: int = 0) -> None:
+        """Count a browser response for ``kind`` pages; called once per response and once per finished load."""
+        with self._lock:
+            entry = self.http.setdefault(kind, {"responses": 0, "cache_hits": 0, "network_bytes": 0})
+            if from_cache is not None:
+                entry["responses"] += 1
+                entry["cache_hits"] += int(from_cache)
+            entry["network_bytes"] += network_bytes
+
+    def annotate(self, section: str, values: dict[str, Any]) -> None:
+        """Attach free-form details to the report under ``annotations[section]``."""
+        with self._lock:
+            self.annotations.setdefault(section, {}).update(values)
+
+    def median_navigation_ms(self, kind: str) -> float | None:
+        with self._lock:
+            values = [page.navigation_ms for page in self.pages if page.kind == kind]
+        return _summary(values)["p50"] if values else None
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def track_concurrency(self, name: str) -> Iterator[None]:
+        with self._lock:
+            current = self._in_flight.get(name, 0) + 1
+            self._in_flight[name] = current
+            self.high_water[name] = max(self.high_water.get(name, 0), current)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight[name] -= 1
+
+    def report(self, *, exit_code: int) -> dict:
+        with self._lock:
+            pages = list(self.pages)
+            page_kinds = sorted({page.kind for page in pages})
+            return {
+                "schema_version": REPORT_SCHEMA_VERSION,
+                "run_started_at": self.started_at.isoformat(),
+                "duration_seconds": round(time.perf_counter() - self._started, 6),
+                "exit_code": exit_code,
+                "stages": {timing.name: asdict(timing) for timing in self.stages},
+                "pages": {
+                    kind: {
+                        "navigation_ms": _summary([page.navigation_ms for page in pages if page.kind == kind]),
+                        "parse_ms": _summary([page.parse_ms for page in pages if page.kind == kind]),
+                        "bytes_fetched": sum(page.bytes_fetched for page in pages if page.kind == kind),
+                    }
+                    for kind in page_kinds
+                },
+                "page_timings": [asdict(page) for page in pages],
+                "counters": dict(sorted(self.counters.items())),
+                "concurrency_high_water": dict(sorted(self.high_water.items())),
+                "http_cache": {
+                    kind: {
+                        **entry,
+                        "hit_rate": round(entry["cache_hits"] / entry["responses"], 4) if entry["responses"] else 0.0,
+                    }
+                    for kind, entry in sorted(self.http.items())
+                },
+                "annotations": {section: dict(values) for section, values in sorted(self.annotations.items())},
+            }
+
+    def prometheus_text(self, report: dict) -> str:
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            full_name = f"{_METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{full_name}{labels} {value}")
+
+        def label(key: str, value: str) -> str:
+            escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            return f'{{{key}="{escaped}"}}'
+
+        metric("last_run_timestamp_seconds", "gauge", "Start time of the last run.", [("", self.started_at.timestamp())])
+        metric("run_duration_seconds", "gauge", "Wall time of the last run.", [("", report["duration_seconds"])])
+        metric("run_exit_code", "gauge", "Exit code of the last run.", [("", report["exit_code"])])
+        stages = report["stages"].values()
+        metric(
+            "stage_wall_seconds",
+            "gauge",
+            "Wall time per pipeline stage.",
+            [(label("stage", stage["name"]), stage["wall_seconds"]) for stage in stages],
+        )
+        metric(
+            "stage_cpu_seconds",
+            "gauge",
+            "Process CPU time while each pipeline stage ran.",
+            [(label("stage", stage["name"]), stage["cpu_seconds"]) for stage in stages],
+        )
+        for field in ("navigation_ms", "parse_ms"):
+            metric(
+                f"page_{field.replace('_ms', '')}_seconds",
+                "gauge",
+                f"Summed page {field.replace('_ms', '')} time per page kind.",
+                [(label("kind", kind), round(values[field]["total"] / 1000, 6)) for kind, values in report["pages"].items()],
+            )
+        metric(
+            "bytes_fetched",
+            "gauge",
+            "HTML bytes fetched per page kind.",
+            [(label("kind", kind), values["bytes_fetched"]) for kind, values in report["pages"].items()],
+        )
+        metric(
+            "run_counter",
+            "gauge",
+            "Per-run counters.",
+            [(label("name", name), value) for name, value in report["counters"].items()],
+        )
+        metric(
+            "http_cache_hit_ratio",
+            "gauge",
+            "Share of browser responses served from the disk cache per page kind.",
+            [(label("kind", kind), values["hit_rate"]) for kind, values in report["http_cache"].items()],
+        )
+        metric(
+            "concurrency_high_water",
+            "gauge",
+            "Highest number of concurrent operations seen during the run.",
+            [(label("name", name), value) for name, value in report["concurrency_high_water"].items()],
+        )
+        return "\n".join(lines) + "\n"
+
+    def write(self, *, exit_code: int, report_path: Path, textfile_path: Path | None = None) -> dict:
+        report = self.report(exit_code=exit_code)
+        _write_atomic(report_path, json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+        if textfile_path is not None:
+            _write_atomic(textfile_path, self.prometheus_text(report))
+        logger.info(
+            "Run report written",
+            extra={"event": "run_report", "path": str(report_path), "duration_ms": round(report["duration_seconds"] * 1000, 3)},
+        )
+        return report
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+metrics = RunMetrics()
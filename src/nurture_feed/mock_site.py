@@ -0,0 +1,122 @@
+import html
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from .logging_utils import logger
+
+LIST_PATH = "/announcements"
+_AUTHORS = ("Mrs Tan", "Mr Lim", "Ms Wong", "Mr Kumar", "Mdm Lee", "School Office")
+_SUBJECTS = ("Science", "Maths", "English", "Chinese", "Art", "PE")
+
+
+def synthetic_title(index: int) -> str:
+    return f"P{index % 6 + 1} {_SUBJECTS[index % len(_SUBJECTS)]} update #{index}: field trip & consent"
+
+
+def synthetic_description(index: int, paragraphs: int = 3) -> list[str]:
+    return [
+        f"Paragraph {paragraph + 1} for announcement {index}: please return the \"consent\" form "
+        f"and payment by Friday. Contact {_AUTHORS[index % len(_AUTHORS)]} for questions."
+        for paragraph in range(paragraphs)
+    ]
+
+
+def synthetic_list_html(count: int, *, base_path: str = LIST_PATH) -> str:
+    """A list page shaped like the real one, so the production selectors match it."""
+    rows = []
+    for index in range(count):
+        rows.append(
+            f'<div class="email-list-item announcement-body" data-id="{index}">'
+            f'<a class="email-list-detail" href="{base_path}/{index}">'
+            f'<span class="from">{html.escape(synthetic_title(index))}</span>'
+            f'<p class="msg">{html.escape(synthetic_description(index, 1)[0])}</p>'
+            f'<span class="text-muted">{index % 23 + 1} hours ago</span>'
+            "</a></div>"
+        )
+    return (
+        "<!doctype html><html><head><title>Announcements</title></head><body><main>"
+        f'<div class="email-list">{"".join(rows)}</div>'
+        "</main></body></html>"
+    )
+
+
+def synthetic_detail_html(index: int, *, paragraphs: int = 3) -> str:
+    body = "".join(f"<p>{html.escape(line)}</p>" for line in synthetic_description(index, paragraphs))
+    return (
+        "<!doctype html><html><body><div class=\"card\"><div class=\"card-body\">"
+        f"<h5>{html.escape(synthetic_title(index))}</h5>"
+        '<div class="d-flex"><div class="ml-2">'
+        f"<p>{html.escape(_AUTHORS[index % len(_AUTHORS)])}</p>"
+        f'<span class="tx-11 text-muted">{index % 23 + 1} hours ago</span>'
+        "</div></div>"
+        f'<div class="tx-14 text-muted my-3">{body}</div>'
+        "</div></div></body></html>"
+    )
+
+
+class MockSiteHandler(BaseHTTPRequestHandler):
+    # Set per server by create_mock_site_server.
+    item_count = 30
+    recorded_dir: Path | None = None
+
+    def _page(self) -> str | None:
+        path = self.path.split("?", 1)[0].rstrip("/") or LIST_PATH
+        if self.recorded_dir is not None:
+            # Recorded pages: <dir>/announcements.html for the list, <dir>/<id>.html for details.
+            name = "announcements" if path == LIST_PATH else path.rsplit("/", 1)[-1]
+            candidate = (self.recorded_dir / f"{name}.html").resolve()
+            if candidate.parent != self.recorded_dir.resolve() or not candidate.is_file():
+                return None
+            return candidate.read_text(encoding="utf-8")
+        if path == LIST_PATH:
+            return synthetic_list_html(self.item_count)
+        prefix, _, index = path.rpartition("/")
+        if prefix == LIST_PATH and index.isdigit():
+            return synthetic_detail_html(int(index))
+        return None
+
+    def do_GET(self) -> None:
+        page = self._page()
+        body = (page or "<!doctype html><title>Not found</title>").encode("utf-8")
+        self.send_response(200 if page is not None else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def create_mock_site_server(
+    *,
+    item_count: int = 30,
+    recorded_dir: Path | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> ThreadingHTTPServer:
+    handler = type(
+        "BoundMockSiteHandler",
+        (MockSiteHandler,),
+        {"item_count": item_count, "recorded_dir": recorded_dir},
+    )
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def start_mock_site_thread(
+    *,
+    item_count: int = 30,
+    recorded_dir: Path | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> tuple[ThreadingHTTPServer, str]:
+    server = create_mock_site_server(item_count=item_count, recorded_dir=recorded_dir, host=host, port=port)
+    thread = threading.Thread(target=server.serve_forever, name="mock-site", daemon=True)
+    thread.start()
+    url = f"http://{host}:{server.server_address[1]}{LIST_PATH}"
+    logger.info(
+        "Mock site listening",
+        extra={"event": "mock_site_started", "url": url, "path": str(recorded_dir) if recorded_dir else None},
+    )
+    return server, url
@@ -11,3 +11,7 @@ class Announcement:
     description: str | None = None
     pub_date_raw: str | None = None
     pub_date: str | None = None
+    # When this id was first scraped (UTC); relative dates stay anchored to that run's estimate.
+    first_seen: str | None = None
+    # Id of the announcement this one reposts (near-duplicate text); shown as an update, not notified.
+    repost_of: str | None = None
@@ -0,0 +1,388 @@
+import abc
+import asyncio
+import http.client
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlsplit
+
+from .config import (
+    OUTBOX_DRAIN_BUDGET_SECONDS,
+    TARGET_URL,
+    WEBHOOK_ENDPOINT_CONCURRENCY,
+    WEBHOOK_ITEMS_PER_MESSAGE,
+    WEBHOOK_MAX_IDLE_CONNECTIONS,
+    WEBHOOK_RETRIES,
+    WEBHOOK_RETRY_DELAY_SECONDS,
+    WEBHOOK_TIMEOUT_SECONDS,
+    WEBHOOKS_FILE,
+)
+from .deadline import deadline
+from .email_templates import truncate_email_text
+from .emailer import drain_email_outbox
+from .logging_utils import logger
+from .metrics import metrics
+from .models import Announcement
+from .utils import read_local_text
+
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+_MAX_RETRY_AFTER_SECONDS = 30.0
+
+PayloadFormatter = Callable[[list[Announcement]], list[dict]]
+
+
+def _chunks(items: list[Announcement], size: int) -> list[list[Announcement]]:
+    size = max(size, 1)
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def format_json_payload(items: list[Announcement]) -> list[dict]:
+    return [{"source": TARGET_URL, "count": len(items), "items": [asdict(item) for item in items]}]
+
+
+def _slack_escape(value: str) -> str:
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _slack_link(url: str, label: str) -> str:
+    # "|" would end the URL part of <url|label> early; inside the URL it is percent-encoded.
+    return f"<{_slack_escape(url).replace('|', '%7C')}|{_slack_escape(label)}>"
+
+
+def format_slack_payload(items: list[Announcement]) -> list[dict]:
+    payloads = []
+    for chunk in _chunks(items, WEBHOOK_ITEMS_PER_MESSAGE):
+        blocks = []
+        for item in chunk:
+            lines = [f"*{_slack_link(item.link, item.title)}*"]
+            meta = " · ".join(part for part in (item.author, item.pub_date_raw or item.pub_date) if part)
+            if meta:
+                lines.append(_slack_escape(meta))
+            description = truncate_email_text(item.description)
+            if description:
+                lines.append(_slack_escape(description))
+            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": "\n".join(lines)}})
+        payloads.append({"text": f"{len(chunk)} new announcement(s) on Nurture", "blocks": blocks})
+    return payloads
+
+
+def format_discord_payload(items: list[Announcement]) -> list[dict]:
+    payloads = []
+    # Discord accepts at most 10 embeds per message.
+    for chunk in _chunks(items, min(WEBHOOK_ITEMS_PER_MESSAGE, 10)):
+        embeds = []
+        for item in chunk:
+            embed: dict = {"title": item.title[:256], "url": item.link}
+            description = truncate_email_text(item.description)
+            if description:
+                embed["description"] = description
+            if item.author:
+                embed["author"] = {"name": item.author[:256]}
+            if item.pub_date:
+                embed["timestamp"] = item.pub_date
+            embeds.append(embed)
+        payloads.append({"content": f"{len(chunk)} new announcement(s) on Nurture", "embeds": embeds})
+    return payloads
+
+
+FORMATTERS: dict[str, PayloadFormatter] = {
+    "json": format_json_payload,
+    "slack": format_slack_payload,
+    "discord": format_discord_payload,
+}
+
+
+def register_formatter(name: str, formatter: PayloadFormatter) -> None:
+    FORMATTERS[name] = formatter
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+class HttpConnectionPool:
+    """Keep-alive HTTP(S) connections shared by all webhook requests, one idle list per origin."""
+
+    def __init__(self, *, max_idle_per_origin: int = WEBHOOK_MAX_IDLE_CONNECTIONS) -> None:
+        self.max_idle_per_origin = max_idle_per_origin
+        self.connections_opened = 0
+        self.requests = 0
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, origin: tuple[str, str, int], timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(origin)
+            if idle:
+                connection = idle.pop()
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                return connection, True
+            self.connections_opened += 1
+        scheme, host, port = origin
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(host, port, timeout=timeout), False
+
+    def _release(self, origin: tuple[str, str, int], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(origin, [])
+            if len(idle) < self.max_idle_per_origin:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float = WEBHOOK_TIMEOUT_SECONDS,
+    ) -> HttpResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Unsupported webhook URL: {url}")
+        origin = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+
+        while True:
+            connection, reused = self._acquire(origin, timeout)
+            try:
+                connection.request(method, target, body=body, headers=headers or {})
+                response = connection.getresponse()
+                payload = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                connection.close()
+                if reused:
+                    # The server closed an idle keep-alive connection; retry on a fresh one.
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            with self._lock:
+                self.requests += 1
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(origin, connection)
+            return HttpResponse(
+                status=response.status,
+                headers={name.lower(): value for name, value in response.getheaders()},
+                body=payload,
+            )
+
+    async def arequest(self, method: str, url: str, **kwargs) -> HttpResponse:
+        return await asyncio.to_thread(self.request, method, url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+@dataclass
+class WebhookEndpoint:
+    name: str
+    url: str
+    format: str = "json"
+    concurrency: int = WEBHOOK_ENDPOINT_CONCURRENCY
+    timeout: float = WEBHOOK_TIMEOUT_SECONDS
+    retries: int = WEBHOOK_RETRIES
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+def parse_webhook_endpoints(text: str | None) -> list[WebhookEndpoint]:
+    if not text or not text.strip():
+        return []
+    try:
+        raw = json.loads(text)
+    except json.JSONDecodeError:
+        logger.warning("Webhook configuration is not valid JSON; ignoring it", extra={"event": "webhooks_invalid"})
+        return []
+
+    endpoints: list[WebhookEndpoint] = []
+    for index, entry in enumerate(raw if isinstance(raw, list) else []):
+        if not isinstance(entry, dict) or not isinstance(entry.get("url"), str):
+            continue
+        formatter = entry.get("format", "json")
+        if formatter not in FORMATTERS:
+            logger.warning(
+                "Unknown webhook format %r; skipping endpoint",
+                formatter,
+                extra={"event": "webhooks_invalid"},
+            )
+            continue
+        try:
+            endpoints.append(
+                WebhookEndpoint(
+                    name=str(entry.get("name") or f"{formatter}-{index + 1}"),
+                    url=entry["url"],
+                    format=formatter,
+                    concurrency=max(int(entry.get("concurrency", WEBHOOK_ENDPOINT_CONCURRENCY)), 1),
+                    timeout=float(entry.get("timeout", WEBHOOK_TIMEOUT_SECONDS)),
+                    retries=max(int(entry.get("retries", WEBHOOK_RETRIES)), 0),
+                    headers={str(key): str(value) for key, value in (entry.get("headers") or {}).items()},
+                )
+            )
+        except (TypeError, ValueError):
+            logger.warning("Invalid webhook endpoint settings; skipping endpoint", extra={"event": "webhooks_invalid"})
+    return endpoints
+
+
+def load_webhook_endpoints(env_value: str | None, *, file_path: str | Path | None = None) -> list[WebhookEndpoint]:
+    if env_value and env_value.strip():
+        return parse_webhook_endpoints(env_value)
+    return parse_webhook_endpoints(read_local_text(Path(file_path) if file_path else WEBHOOKS_FILE))
+
+
+class Notifier(abc.ABC):
+    """A notification channel. Subclasses deliver the new items and report whether it worked."""
+
+    name = "notifier"
+
+    @abc.abstractmethod
+    async def notify(self, items: list[Announcement]) -> bool: ...
+
+
+class WebhookNotifier(Notifier):
+    def __init__(self, endpoint: WebhookEndpoint, client: HttpConnectionPool) -> None:
+        self.endpoint = endpoint
+        self.name = f"webhook:{endpoint.name}"
+        self.client = client
+        self._semaphore = asyncio.Semaphore(endpoint.concurrency)
+
+    async def _post(self, payload: dict) -> bool:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json", "User-Agent": "nurture-feed", **self.endpoint.headers}
+        error = ""
+        for attempt in range(self.endpoint.retries + 1):
+            delay = WEBHOOK_RETRY_DELAY_SECONDS * 2**attempt
+            async with self._semaphore:
+                try:
+                    with metrics.track_concurrency("webhook_requests"):
+                        response = await self.client.arequest(
+                            "POST", self.endpoint.url, body=body, headers=headers, timeout=self.endpoint.timeout
+                        )
+                except (OSError, http.client.HTTPException) as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                else:
+                    if 200 <= response.status < 300:
+                        return True
+                    error = f"HTTP {response.status}"
+                    if response.status not in RETRYABLE_STATUSES:
+                        break
+                    try:
+                        delay = min(float(response.headers.get("retry-after", delay)), _MAX_RETRY_AFTER_SECONDS)
+                    except ValueError:
+                        pass
+            if attempt < self.endpoint.retries and deadline.remaining() < delay + self.endpoint.timeout:
+                error += "; no time left in the run budget to retry"
+                break
+            if attempt < self.endpoint.retries:
+                logger.warning(
+                    "Webhook delivery failed (%s); retrying",
+                    error,
+                    extra={"event": "webhook_retry", "attempt": attempt + 1},
+                )
+                await asyncio.sleep(delay)
+        logger.error(
+            "Webhook delivery to %s failed: %s",
+            self.endpoint.name,
+            error,
+            extra={"event": "webhook_failed"},
+        )
+        return False
+
+    async def notify(self, items: list[Announcement]) -> bool:
+        if not items:
+            return True
+        payloads = FORMATTERS[self.endpoint.format](items)
+        results = await asyncio.gather(*(self._post(payload) for payload in payloads))
+        if all(results):
+            logger.info(
+                "Webhook %s notified",
+                self.endpoint.name,
+                extra={"event": "webhook_sent", "count": len(items)},
+            )
+        return all(results)
+
+
+class EmailOutboxNotifier(Notifier):
+    # Items were already queued before the cache moved on; this channel drains the outbox.
+    name = "email"
+
+    async def notify(self, items: list[Announcement]) -> bool:
+        # Unsent mail stays in the outbox, so a short budget only defers it to the next run.
+        budget = deadline.clamp_seconds(OUTBOX_DRAIN_BUDGET_SECONDS, essential=True)
+        return await asyncio.to_thread(drain_email_outbox, budget_seconds=budget)
+
+
+async def notify_all(
+    notifiers: list[Notifier],
+    items: list[Announcement],
+    *,
+    on_result: Callable[[str, bool], None] | None = None,
+) -> dict[str, bool]:
+    """Notify every channel concurrently; ``on_result`` is called as each one finishes."""
+
+    async def run(notifier: Notifier) -> bool:
+        try:
+            ok = bool(await notifier.notify(items))
+        except Exception as exc:
+            logger.error(
+                "Notifier %s crashed; continuing without crashing",
+                notifier.name,
+                extra={"event": "notifier_failed"},
+                exc_info=exc,
+            )
+            ok = False
+        if on_result is not None:
+            await asyncio.to_thread(on_result, notifier.name, ok)
+        return ok
+
+    results = await asyncio.gather(*(run(notifier) for notifier in notifiers))
+    return {notifier.name: ok for notifier, ok in zip(notifiers, results)}
+
+
+async def notify_channels(
+    items: list[Announcement],
+    *,
+    include_email: bool = True,
+    include_webhooks: bool = True,
+    skip: set[str] | None = None,
+    on_result: Callable[[str, bool], None] | None = None,
+) -> dict[str, bool]:
+    client = HttpConnectionPool()
+    notifiers: list[Notifier] = [EmailOutboxNotifier()] if include_email else []
+    if include_webhooks:
+        for endpoint in load_webhook_endpoints(
+            os.getenv("NOTIFY_WEBHOOKS"),
+            file_path=os.getenv("NOTIFY_WEBHOOKS_FILE"),
+        ):
+            notifiers.append(WebhookNotifier(endpoint, client))
+    if skip:
+        logger.info(
+            "Skipping channels already notified: %s",
+            ", ".join(sorted(skip)),
+            extra={"event": "notify_skipped", "count": len(skip)},
+        )
+        notifiers = [notifier for notifier in notifiers if notifier.name not in skip]
+    try:
+        return await notify_all(notifiers, items, on_result=on_result)
+    finally:
+        client.close()
+
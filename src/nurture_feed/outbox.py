@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from .config import (
+    OUTBOX_BACKOFF_BASE_SECONDS,
+    OUTBOX_BACKOFF_MAX_SECONDS,
+    OUTBOX_FILE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETENTION_DAYS,
+)
+from .logging_utils import logger
+from .utils import parse_iso_datetime
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_DEAD = "dead"
+# Some recipients may have received it; never resent automatically.
+STATUS_UNCERTAIN = "uncertain"
+
+
+def recipient_key(address: str) -> str:
+    # Addresses are kept out of the state files and resolved against the configured
+    # recipient list at delivery time.
+    return hashlib.sha256(address.strip().lower().encode("utf-8")).hexdigest()
+
+
+def message_hash(subject: str, plain: str, html: str, recipient_keys: list[str]) -> str:
+    # Recipients are part of the identity: the same digest for a different group is a new message.
+    digest = hashlib.sha256()
+    for part in (subject, plain, html, *sorted(recipient_keys)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@dataclass
+class OutboxMessage:
+    id: str
+    subject: str
+    plain: str
+    html: str
+    created_at: str
+    pending: list[str] = field(default_factory=list)
+    uncertain: list[str] = field(default_factory=list)
+    delivered: int = 0
+    attempts: int = 0
+    status: str = STATUS_PENDING
+    next_attempt_at: str | None = None
+    last_error: str | None = None
+    finished_at: str | None = None
+
+
+class Outbox:
+    def __init__(self, path: Path = OUTBOX_FILE) -> None:
+        self.path = path
+        self.messages: list[OutboxMessage] = []
+
+    def load(self) -> "Outbox":
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self.messages = []
+            return self
+        except json.JSONDecodeError:
+            logger.warning(
+                "Outbox file is invalid JSON; starting with an empty outbox",
+                extra={"event": "outbox_invalid", "path": str(self.path)},
+            )
+            self.messages = []
+            return self
+
+        known = {item.name for item in fields(OutboxMessage)}
+        entries = raw.get("messages", []) if isinstance(raw, dict) else []
+        self.messages = [
+            OutboxMessage(**{key: value for key, value in entry.items() if key in known})
+            for entry in entries
+            if isinstance(entry, dict) and entry.get("id") and isinstance(entry.get("pending"), list)
+        ]
+        return self
+
+    def save(self) -> None:
+        payload = {"messages": [asdict(message) for message in self.messages]}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def enqueue(
+        self,
+        subject: str,
+        plain: str,
+        html: str,
+        recipients: list[str],
+        *,
+        now: datetime | None = None,
+    ) -> OutboxMessage | None:
+        now = now or datetime.now(timezone.utc)
+        pending = sorted({recipient_key(address) for address in recipients})
+        content_id = message_hash(subject, plain, html, pending)
+        if any(message.id == content_id for message in self.messages):
+            logger.info(
+                "Identical notification already queued or sent; not enqueuing again",
+                extra={"event": "outbox_duplicate", "path": str(self.path)},
+            )
+            return None
+
+        message = OutboxMessage(
+            id=content_id,
+            subject=subject,
+            plain=plain,
+            html=html,
+            created_at=now.isoformat(),
+            pending=pending,
+        )
+        self.messages.append(message)
+        logger.info(
+            "Notification added to outbox",
+            extra={"event": "outbox_enqueued", "count": len(message.pending), "path": str(self.path)},
+        )
+        return message
+
+    def due(self, *, now: datetime | None = None) -> list[OutboxMessage]:
+        now = now or datetime.now(timezone.utc)
+        ready: list[OutboxMessage] = []
+        for message in self.messages:
+            if message.status != STATUS_PENDING:
+                continue
+            next_attempt = parse_iso_datetime(message.next_attempt_at)
+            if next_attempt is None or next_attempt <= now:
+                ready.append(message)
+        return ready
+
+    def record_delivery(
+        self,
+        message: OutboxMessage,
+        *,
+        delivered: list[str],
+        failed: dict[str, str],
+        unknown: list[str],
+        uncertain: list[str] | None = None,
+        now: datetime | None = None,
+    ) -> None:
+        now = now or datetime.now(timezone.utc)
+        uncertain_keys = {recipient_key(address) for address in uncertain or []}
+        done = {recipient_key(address) for address in delivered} | set(unknown) | uncertain_keys
+        message.delivered += len(delivered)
+        message.pending = [key for key in message.pending if key not in done]
+        message.uncertain = sorted(set(message.uncertain) | uncertain_keys)
+
+        if failed:
+            message.attempts += 1
+            message.last_error = next(iter(failed.values()))
+            if message.attempts >= OUTBOX_MAX_ATTEMPTS:
+                message.status = STATUS_DEAD
+                message.finished_at = now.isoformat()
+                logger.error(
+                    "Outbox message exceeded retry limit; giving up",
+                    extra={"event": "outbox_dead", "attempt": message.attempts, "count": len(message.pending)},
+                )
+                return
+            delay = min(OUTBOX_BACKOFF_BASE_SECONDS * 2 ** (message.attempts - 1), OUTBOX_BACKOFF_MAX_SECONDS)
+            message.next_attempt_at = (now + timedelta(seconds=delay)).isoformat()
+            logger.warning(
+                "Outbox delivery failed for some recipients; retry scheduled",
+                extra={"event": "outbox_retry", "attempt": message.attempts, "count": len(failed)},
+            )
+        elif not message.pending:
+            message.status = STATUS_UNCERTAIN if message.uncertain else STATUS_SENT
+            message.finished_at = now.isoformat()
+            if message.uncertain:
+                logger.warning(
+                    "Outbox message may not have reached every recipient; not resending",
+                    extra={"event": "outbox_uncertain", "count": len(message.uncertain)},
+                )
+
+    def prune(self, *, now: datetime | None = None) -> None:
+        # Finished entries are kept for a while so a re-run cannot enqueue the same content again.
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=OUTBOX_RETENTION_DAYS)
+        kept: list[OutboxMessage] = []
+        for message in self.messages:
+            finished = parse_iso_datetime(message.finished_at)
+            if message.status != STATUS_PENDING and finished is not None and finished < cutoff:
+                continue
+            kept.append(message)
+        self.messages = kept
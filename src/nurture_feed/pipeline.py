@@ -1,47 +1,290 @@
-from .config import DETAIL_ENRICH_LIMIT
-from .emailer import send_email_notification
+import asyncio
+import os
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from .checkpoint import RunCheckpoint
+from .config import RUN_REPORT_FILE
+from .dag import Stage, StageFunc, StageGraph, in_thread, run_blocking
+from .deadline import deadline, plan_enrichment
+from .emailer import queue_email_notification
 from .logging_utils import configure_logging, logger
+from .metrics import metrics
+from .models import Announcement
+from .notifiers import notify_channels
+from .profiling import StageProfiler, write_import_time_breakdown
 from .rss_writer import generate_rss_feed
-from .scraper import enrich_announcements_with_detail_pages, scrape_announcements_with_retry
-from .storage import detect_new_items, load_cache, save_cache
+from .scraper import scrape_announcements_with_retry, storage_state_path, stream_enriched_announcements, target_url
+from .search import update_search_index
+from .session import check_session
+from .settings import configure_settings, log_effective_settings, settings, settings_configured
+from .simhash import link_reposts
+from .storage import RunLock, anchor_dates, detect_new_items, drop_items_saved_elsewhere, load_cache, save_cache
 from .utils import sort_announcements_for_feed
 
 
-def run_pipeline(*, enable_email: bool = True) -> int:
-    configure_logging()
+class ScrapeFailed(Exception):
+    pass
+
+
+def _log_stage_resumed(name: str, checkpoint: RunCheckpoint) -> None:
+    logger.info(
+        "Stage %s already completed by run %s; skipping",
+        name,
+        checkpoint.run_id,
+        extra={"event": "stage_resumed"},
+    )
+
+
+def _checkpointed(name: str, run: StageFunc, checkpoint: RunCheckpoint) -> StageFunc:
+    """Skip a stage an earlier attempt of this run finished; otherwise run it and record it as done."""
+
+    async def stage(results: dict[str, Any]) -> Any:
+        if checkpoint.is_done(name):
+            _log_stage_resumed(name, checkpoint)
+            return None
+        value = await run(results)
+        await run_blocking(checkpoint.mark_done, name)
+        return value
 
+    return stage
+
+
+async def _preflight(_: dict[str, Any], *, checkpoint: RunCheckpoint) -> None:
+    # A dead session is caught with one HTTP request instead of a full browser launch.
+    if checkpoint.is_done("diff"):
+        return
     try:
-        current_items = scrape_announcements_with_retry()
-    except PermissionError as exc:
-        logger.error(str(exc), extra={"event": "session_expired"})
-        return 2
-    except Exception:
-        logger.error("Failed to scrape announcements", extra={"event": "scrape_fatal"}, exc_info=True)
-        return 1
+        storage_state = storage_state_path()
+    except FileNotFoundError:
+        return  # the scrape reports the missing file
+    if storage_state is not None:
+        await run_blocking(check_session, target_url(), storage_state_path=Path(storage_state))
+
+
+async def _scrape(_: dict[str, Any], *, checkpoint: RunCheckpoint) -> list[Announcement]:
+    if checkpoint.is_done("scrape"):
+        _log_stage_resumed("scrape", checkpoint)
+        return checkpoint.items
+    try:
+        items = await run_blocking(scrape_announcements_with_retry)
+    except PermissionError:
+        raise
+    except Exception as exc:
+        raise ScrapeFailed from exc
+    await run_blocking(checkpoint.record_scrape, items)
+    return items
+
+
+async def _diff(
+    results: dict[str, Any], *, checkpoint: RunCheckpoint
+) -> tuple[list[Announcement], list[Announcement]]:
+    if checkpoint.is_done("diff"):
+        _log_stage_resumed("diff", checkpoint)
+        ordered_items, new_items = checkpoint.restore_diff()
+        metrics.increment("new_items", len(new_items))
+        return ordered_items, new_items
 
+    current_items: list[Announcement] = results["scrape"]
     if not current_items:
         logger.warning("No announcements found; writing empty feed and cache", extra={"event": "no_items"})
 
+    # Relative dates of known items keep their first estimate so the order and pubDates hold still.
+    refined = anchor_dates(current_items, results["load_cache"])
+    if refined:
+        logger.info("Refined %d stored dates", refined, extra={"event": "dates_refined", "count": refined})
     ordered_items = sort_announcements_for_feed(current_items)
-    cached_items = load_cache()
-    new_items = detect_new_items(ordered_items, cached_items)
+    new_items = detect_new_items(ordered_items, results["load_cache"])
+    if not new_items:
+        metrics.increment("new_items", 0)
+        await run_blocking(checkpoint.record_diff, ordered_items, new_items)
+        return ordered_items, new_items
 
-    if new_items:
-        try:
-            enrich_announcements_with_detail_pages(new_items, limit=DETAIL_ENRICH_LIMIT)
-        except PermissionError as exc:
-            logger.error(str(exc), extra={"event": "session_expired"})
-            return 2
+    # Detail pages stream in as they finish; ids are fixed, so only a changed date can reorder the feed.
+    # Pages an interrupted attempt already parsed are taken from the checkpoint.
+    to_enrich = new_items[: settings.detail_enrich_limit]
+    pending = checkpoint.apply_enriched(to_enrich)
+    reorder = len(pending) < len(to_enrich)
+    # Only as many pages as fit before the essential reserve; the rest keep list-page data.
+    detail_ms = metrics.median_navigation_ms("detail")
+    pending = pending[
+        : plan_enrichment(
+            len(pending),
+            settings.detail_enrich_concurrency,
+            per_page_seconds=detail_ms / 1000 if detail_ms else settings.detail_page_estimate_seconds,
+            minimum_seconds=settings.min_enrich_seconds,
+        )
+    ]
+    list_dates = {item.id: item.pub_date for item in pending}
+    try:
+        async with asyncio.timeout(deadline.available() if deadline.active else None):
+            async for item in stream_enriched_announcements(pending, limit=len(pending)):
+                await run_blocking(checkpoint.record_enriched, item)
+                reorder = reorder or item.pub_date != list_dates[item.id]
+    except TimeoutError:
+        logger.warning(
+            "Run budget reached during detail enrichment; keeping list-page data for the rest",
+            extra={"event": "enrich_deadline"},
+        )
+        deadline.note(enrichment="cut_short")
+    finally:
+        # Whatever was parsed is kept even if a detail page ends the run.
+        await run_blocking(checkpoint.flush)
+    if reorder:
         ordered_items = sort_announcements_for_feed(ordered_items)
-        new_items = detect_new_items(ordered_items, cached_items)
-
-    logger.info("Change detection complete", extra={"event": "diff_complete", "count": len(new_items)})
-    generate_rss_feed(ordered_items)
-    save_cache(ordered_items)
-    if enable_email:
-        send_email_notification(new_items)
-    else:
-        logger.info("Email sending disabled for this run", extra={"event": "email_disabled"})
+        new_items = detect_new_items(ordered_items, results["load_cache"])
+    # Last check before anything is sent: a run that overlapped this one may have handled some already.
+    new_items = await run_blocking(drop_items_saved_elsewhere, new_items, results["load_cache"])
+    # Reposts of earlier announcements stay in the feed as updates but are not notified again.
+    new_items = await run_blocking(link_reposts, new_items, ordered_items)
+    metrics.increment("new_items", len(new_items))
+    await run_blocking(checkpoint.record_diff, ordered_items, new_items)
+    return ordered_items, new_items
+
+
+def build_pipeline_graph(
+    *,
+    enable_email: bool,
+    enable_webhooks: bool = True,
+    checkpoint: RunCheckpoint | None = None,
+    profiler: StageProfiler | None = None,
+) -> StageGraph:
+    checkpoint = checkpoint or RunCheckpoint()
+
+    async def feed(results: dict[str, Any]) -> None:
+        ordered_items, new_items = results["diff"]
+        logger.info("Change detection complete", extra={"event": "diff_complete", "count": len(new_items)})
+        await run_blocking(generate_rss_feed, ordered_items)
+
+    async def queue_email(results: dict[str, Any]) -> None:
+        if enable_email:
+            await run_blocking(queue_email_notification, results["diff"][1])
+
+    async def cache(results: dict[str, Any]) -> None:
+        # Merged with whatever an overlapping run saved since this run loaded the cache.
+        await run_blocking(save_cache, results["diff"][0], base=results["load_cache"])
+
+    async def search_index(results: dict[str, Any]) -> None:
+        # Known items come back from the list page without detail fields; only this run's new
+        # items may replace what is indexed. Reposts are new here even though they are not notified.
+        ordered_items = results["diff"][0]
+        fresh = {item.id for item in detect_new_items(ordered_items, results["load_cache"])}
+        await run_blocking(update_search_index, ordered_items, reindex=fresh)
+
+    async def notify(results: dict[str, Any]) -> None:
+        if enable_email or enable_webhooks:
+            # Channels an earlier attempt already delivered to are not notified twice.
+            await notify_channels(
+                results["diff"][1],
+                include_email=enable_email,
+                include_webhooks=enable_webhooks,
+                skip=checkpoint.delivered_channels(),
+                on_result=checkpoint.record_notification,
+            )
+        else:
+            logger.info("Notifications disabled for this run", extra={"event": "email_disabled"})
+
+    return StageGraph(
+        [
+            # The cache is read while the browser is still loading the list page.
+            Stage("preflight", partial(_preflight, checkpoint=checkpoint)),
+            Stage("scrape", partial(_scrape, checkpoint=checkpoint), after=("preflight",)),
+            Stage("load_cache", in_thread(load_cache)),
+            Stage("diff", partial(_diff, checkpoint=checkpoint), after=("scrape", "load_cache")),
+            Stage("feed", _checkpointed("feed", feed, checkpoint), after=("diff",)),
+            # Queue before the cache moves on so a failed send is retried on a later run.
+            Stage("queue_email", _checkpointed("queue_email", queue_email, checkpoint), after=("diff",)),
+            Stage("save_cache", _checkpointed("save_cache", cache, checkpoint), after=("queue_email",)),
+            # Mail is already queued and the feed is written; these two may fail without failing the run.
+            Stage("notify", _checkpointed("notify", notify, checkpoint), after=("queue_email",), essential=False),
+            Stage(
+                "search_index",
+                _checkpointed("search_index", search_index, checkpoint),
+                after=("diff",),
+                essential=False,
+            ),
+        ],
+        metrics=metrics,
+        profiler=profiler,
+    )
+
+
+def run_pipeline(
+    *,
+    enable_email: bool = True,
+    enable_webhooks: bool = True,
+    profile_dir: Path | None = None,
+) -> int:
+    configure_logging()
+    if not settings_configured():
+        configure_settings()
+    log_effective_settings()
+    lock = RunLock()
+    if not lock.acquire(wait_seconds=settings.run_lock_wait_seconds):
+        # The run holding the lock covers this poll; not an error for cron.
+        return 0
+    try:
+        return _run_pipeline_locked(
+            enable_email=enable_email, enable_webhooks=enable_webhooks, profile_dir=profile_dir
+        )
+    finally:
+        lock.release()
+
+
+def _run_pipeline_locked(*, enable_email: bool, enable_webhooks: bool, profile_dir: Path | None) -> int:
+    metrics.reset()
+    deadline.start(settings.run_deadline_seconds, reserve_seconds=settings.essential_reserve_seconds)
+
+    profiler = StageProfiler(profile_dir) if profile_dir is not None else None
+    exit_code = 1
+    try:
+        if profiler is not None:
+            profiler.start()
+        exit_code = _run_graph(enable_email=enable_email, enable_webhooks=enable_webhooks, profiler=profiler)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            write_import_time_breakdown(profiler.out_dir)
+            logger.info("Profile written", extra={"event": "profile_written", "path": str(profiler.out_dir)})
+        deadline.stop()
+        textfile = os.getenv("METRICS_TEXTFILE")
+        try:
+            metrics.write(
+                exit_code=exit_code,
+                report_path=Path(os.getenv("RUN_REPORT_FILE") or RUN_REPORT_FILE),
+                textfile_path=Path(textfile) if textfile else None,
+            )
+        except OSError:
+            logger.warning("Could not write run report", extra={"event": "run_report_failed"}, exc_info=True)
+    return exit_code
+
+
+def _open_checkpoint(*, profiling: bool) -> RunCheckpoint:
+    if profiling:
+        # A profile should measure every stage, not resume half of one.
+        return RunCheckpoint()
+    return RunCheckpoint.open()
+
+
+def _run_graph(*, enable_email: bool, enable_webhooks: bool, profiler: StageProfiler | None) -> int:
+    checkpoint = _open_checkpoint(profiling=profiler is not None)
+    graph = build_pipeline_graph(
+        enable_email=enable_email, enable_webhooks=enable_webhooks, checkpoint=checkpoint, profiler=profiler
+    )
+    try:
+        # Profiled runs are serial so each stage's profile only contains its own work.
+        asyncio.run(graph.execute(serial=profiler is not None))
+    except PermissionError as exc:
+        logger.error(str(exc), extra={"event": "session_expired"})
+        return 2
+    except ScrapeFailed as exc:
+        logger.error("Failed to scrape announcements", extra={"event": "scrape_fatal"}, exc_info=exc.__cause__)
+        return 1
+    except Exception:
+        logger.error("Essential pipeline stage failed", extra={"event": "pipeline_failed"}, exc_info=True)
+        return 1
+    checkpoint.finish()
     return 0
 
 
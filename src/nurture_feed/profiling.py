@@ -0,0 +1,189 @@
+import contextvars
+import json
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from .logging_utils import logger
+
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+TOP_ALLOCATORS = 25
+TOP_FUNCTIONS = 40
+_TRACEBACK_DEPTH = 25
+_IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+
+_current_stage: contextvars.ContextVar["_StageProfile | None"] = contextvars.ContextVar(
+    "profiling_stage", default=None
+)
+
+
+class _StageProfile:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.profiles: list["cProfile.Profile"] = []
+        self._lock = threading.Lock()
+
+    def add(self, profile: "cProfile.Profile") -> None:
+        with self._lock:
+            self.profiles.append(profile)
+
+
+def profile_in_current_stage(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Profile a blocking callable in its worker thread and merge the result into the current stage."""
+    stage = _current_stage.get()
+    if stage is None:
+        return func
+
+    import cProfile
+
+    @wraps(func)
+    def run(*args: Any, **kwargs: Any) -> Any:
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            stage.add(profile)
+
+    return run
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^0-9A-Za-z_.-]+", "_", name)
+
+
+class StageProfiler:
+    """Profiles pipeline stages with cProfile and tracemalloc and writes one artifact set per stage."""
+
+    def __init__(self, out_dir: Path) -> None:
+        self.out_dir = out_dir
+        self.summary: dict[str, dict[str, Any]] = {}
+
+    def start(self) -> None:
+        import tracemalloc
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(_TRACEBACK_DEPTH)
+
+    def stop(self) -> None:
+        import tracemalloc
+
+        (self.out_dir / "summary.json").write_text(json.dumps(self.summary, indent=2) + "\n", encoding="utf-8")
+        tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        import cProfile
+        import tracemalloc
+
+        stage = _StageProfile(name)
+        token = _current_stage.set(stage)
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            _current_stage.reset(token)
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            stage.add(profile)
+            self._write_stage(stage, before, after, peak)
+
+    def _write_stage(
+        self,
+        stage: _StageProfile,
+        before: "tracemalloc.Snapshot",
+        after: "tracemalloc.Snapshot",
+        peak: int,
+    ) -> None:
+        import io
+        import pstats
+        import tracemalloc
+
+        base = self.out_dir / _safe_name(stage.name)
+        stats = pstats.Stats(stage.profiles[0])
+        for profile in stage.profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(str(base.with_suffix(".pstats")))
+
+        text = io.StringIO()
+        pstats.Stats(str(base.with_suffix(".pstats")), stream=text).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        base.with_suffix(".txt").write_text(text.getvalue(), encoding="utf-8")
+
+        filters = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap>"))
+        differences = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+        top = [difference for difference in differences if difference.size_diff > 0][:TOP_ALLOCATORS]
+        lines = [
+            f"{difference.size_diff / 1024:10.1f} KiB  {difference.count_diff:+7d} blocks  {difference.traceback}"
+            for difference in top
+        ]
+        (self.out_dir / f"{_safe_name(stage.name)}.alloc.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        self.summary[stage.name] = {
+            "profiled_threads": len(stage.profiles),
+            "total_calls": stats.total_calls,
+            "profiled_seconds": round(stats.total_tt, 6),
+            "peak_traced_bytes": peak,
+            "net_allocated_bytes": sum(difference.size_diff for difference in differences),
+        }
+
+
+def measure_import_time(module: str) -> tuple[list[dict[str, Any]], bool]:
+    """Import ``module`` in a fresh interpreter with -X importtime; returns rows slowest first and success."""
+    import subprocess
+
+    src_dir = Path(__file__).resolve().parent.parent
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=src_dir,
+        check=False,
+    )
+    rows: list[dict[str, Any]] = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            rows.append(
+                {
+                    "module": match.group(4).strip(),
+                    "self_us": int(match.group(1)),
+                    "cumulative_us": int(match.group(2)),
+                    "depth": len(match.group(3)) // 2,
+                }
+            )
+    rows.sort(key=lambda row: row["cumulative_us"], reverse=True)
+    return rows, completed.returncode == 0
+
+
+def format_import_rows(rows: list[dict[str, Any]], limit: int = TOP_FUNCTIONS) -> str:
+    return "".join(
+        f"{row['cumulative_us'] / 1000:9.1f} ms  {row['self_us'] / 1000:9.1f} ms self  {row['module']}\n"
+        for row in rows[:limit]
+    )
+
+
+def write_import_time_breakdown(out_dir: Path, module: str = "nurture_feed.pipeline") -> list[dict[str, Any]]:
+    """Import ``module`` in a fresh interpreter with -X importtime and record the slowest imports."""
+    rows, ok = measure_import_time(module)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "imports.json").write_text(json.dumps(rows, indent=2) + "\n", encoding="utf-8")
+    (out_dir / "imports.txt").write_text(format_import_rows(rows), encoding="utf-8")
+    if not ok:
+        logger.warning(
+            "Import-time probe failed; breakdown covers imports before the failure",
+            extra={"event": "profile_imports_failed"},
+        )
+    return rows
@@ -1,37 +1,414 @@
-from datetime import datetime, timezone
+import gzip
+import json
+import os
+import re
+from dataclasses import asdict
+from datetime import datetime
 from email.utils import format_datetime
+from pathlib import Path
+from typing import TextIO
+from urllib.parse import quote
 
-from feedgen.feed import FeedGenerator
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
 
-from .config import FEED_FILE, MAX_FEED_ITEMS, TARGET_URL
+from .config import (
+    ARCHIVE_DIR,
+    ARCHIVE_INDEX_FILE,
+    ARCHIVE_PAGE_SIZE,
+    ATOM_FEED_FILE,
+    FEED_FILE,
+    JSON_FEED_FILE,
+    TARGET_URL,
+)
 from .logging_utils import logger
 from .models import Announcement
-from .utils import to_rfc2822
+from .settings import settings
+from .storage import parse_cached_item
+from .utils import format_rfc3339, parse_iso_datetime, sort_announcements_for_feed
+
+FEED_TITLE = "Nurture Announcements"
+FEED_DESCRIPTION = "Announcements feed generated from nurture.diveanalytics.com"
+FEED_LANGUAGE = "en"
+FEED_GENERATOR = "nurture-feed"
+
+# Atom requires a feed-level <updated>; used only when no item carries a parseable date.
+_FALLBACK_UPDATED = "1970-01-01T00:00:00Z"
+
+# Characters that are not allowed anywhere in an XML 1.0 document.
+_INVALID_XML_CHARS_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+_XML_TEXT_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_XML_ATTR_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "\n": "&#10;", "\t": "&#9;"})
+
+# Reposts stay in the feed, marked as updates of an earlier announcement.
+UPDATE_TITLE_PREFIX = "Updated: "
+UPDATE_CATEGORY = "update"
+
+# Feed history namespace used to mark archive documents (RFC 5005, section 4).
+_FH_NAMESPACE = "http://purl.org/syndication/history/1.0"
+
+
+def xml_text(value: str) -> str:
+    return _INVALID_XML_CHARS_RE.sub("", value).translate(_XML_TEXT_ESCAPES)
+
+
+def xml_attr(value: str) -> str:
+    return _INVALID_XML_CHARS_RE.sub("", value).translate(_XML_ATTR_ESCAPES)
+
+
+def _json_value(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _atom_entry_id(item: Announcement) -> str:
+    return f"urn:nurture-feed:{quote(item.id, safe='')}"
+
+
+def _display_title(item: Announcement) -> str:
+    return f"{UPDATE_TITLE_PREFIX}{item.title}" if item.repost_of else item.title
+
+
+def _rss_header(updated: datetime | None, links: list[tuple[str, str]], *, archive: bool = False) -> str:
+    namespaces = 'xmlns:atom="http://www.w3.org/2005/Atom" xmlns:dc="http://purl.org/dc/elements/1.1/"'
+    if archive:
+        namespaces += f' xmlns:fh="{_FH_NAMESPACE}"'
+    parts = [
+        "<?xml version='1.0' encoding='UTF-8'?>\n",
+        f'<rss {namespaces} version="2.0">\n',
+        "  <channel>\n",
+        f"    <title>{xml_text(FEED_TITLE)}</title>\n",
+        f"    <link>{xml_text(TARGET_URL)}</link>\n",
+        f"    <description>{xml_text(FEED_DESCRIPTION)}</description>\n",
+    ]
+    for rel, href in links:
+        parts.append(f'    <atom:link href="{xml_attr(href)}" rel="{rel}"/>\n')
+    if archive:
+        parts.append("    <fh:archive/>\n")
+    parts.extend(
+        [
+            "    <docs>http://www.rssboard.org/rss-specification</docs>\n",
+            f"    <generator>{FEED_GENERATOR}</generator>\n",
+            f"    <language>{FEED_LANGUAGE}</language>\n",
+        ]
+    )
+    if updated is not None:
+        parts.append(f"    <lastBuildDate>{format_datetime(updated)}</lastBuildDate>\n")
+    return "".join(parts)
+
+
+def _rss_item(item: Announcement, published: datetime | None) -> str:
+    parts = [
+        "    <item>\n",
+        f"      <title>{xml_text(_display_title(item))}</title>\n",
+        f"      <link>{xml_text(item.link)}</link>\n",
+    ]
+    if item.description:
+        parts.append(f"      <description>{xml_text(item.description)}</description>\n")
+    if item.author:
+        parts.append(f"      <dc:creator>{xml_text(item.author)}</dc:creator>\n")
+    if item.repost_of:
+        parts.append(f"      <category>{UPDATE_CATEGORY}</category>\n")
+    parts.append(f'      <guid isPermaLink="false">{xml_text(item.id)}</guid>\n')
+    if published is not None:
+        parts.append(f"      <pubDate>{format_datetime(published)}</pubDate>\n")
+    elif item.pub_date:
+        # Same pass-through as to_rfc2822 for dates it cannot parse.
+        parts.append(f"      <pubDate>{xml_text(item.pub_date)}</pubDate>\n")
+    parts.append("    </item>\n")
+    return "".join(parts)
+
+
+_RSS_FOOTER = "  </channel>\n</rss>\n"
+
+
+def _atom_header(updated: datetime | None) -> str:
+    return "".join(
+        [
+            "<?xml version='1.0' encoding='UTF-8'?>\n",
+            f'<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="{FEED_LANGUAGE}">\n',
+            f"  <id>{xml_text(TARGET_URL)}</id>\n",
+            f"  <title>{xml_text(FEED_TITLE)}</title>\n",
+            f"  <subtitle>{xml_text(FEED_DESCRIPTION)}</subtitle>\n",
+            f'  <link href="{xml_attr(TARGET_URL)}" rel="alternate"/>\n',
+            f"  <generator>{FEED_GENERATOR}</generator>\n",
+            f"  <updated>{format_rfc3339(updated) if updated is not None else _FALLBACK_UPDATED}</updated>\n",
+        ]
+    )
+
+
+def _atom_entry(item: Announcement, published: datetime | None, feed_updated: datetime | None) -> str:
+    updated = published or feed_updated
+    parts = [
+        "  <entry>\n",
+        f"    <id>{xml_text(_atom_entry_id(item))}</id>\n",
+        f'    <title type="text">{xml_text(_display_title(item))}</title>\n',
+        f"    <updated>{format_rfc3339(updated) if updated is not None else _FALLBACK_UPDATED}</updated>\n",
+        f'    <link href="{xml_attr(item.link)}" rel="alternate"/>\n',
+    ]
+    if published is not None:
+        parts.append(f"    <published>{format_rfc3339(published)}</published>\n")
+    if item.author:
+        parts.append(f"    <author>\n      <name>{xml_text(item.author)}</name>\n    </author>\n")
+    if item.repost_of:
+        parts.append(f'    <category term="{UPDATE_CATEGORY}"/>\n')
+    if item.description:
+        parts.append(f'    <summary type="text">{xml_text(item.description)}</summary>\n')
+    parts.append("  </entry>\n")
+    return "".join(parts)
+
+
+_ATOM_FOOTER = "</feed>\n"
+
+
+def _json_header() -> str:
+    return "".join(
+        [
+            "{\n",
+            '  "version": "https://jsonfeed.org/version/1.1",\n',
+            f'  "title": {_json_value(FEED_TITLE)},\n',
+            f'  "home_page_url": {_json_value(TARGET_URL)},\n',
+            f'  "description": {_json_value(FEED_DESCRIPTION)},\n',
+            f'  "language": {_json_value(FEED_LANGUAGE)},\n',
+            '  "items": [',
+        ]
+    )
+
+
+def _json_item(item: Announcement, published: datetime | None, *, first: bool) -> str:
+    fields = [
+        f'"id": {_json_value(item.id)}',
+        f'"url": {_json_value(item.link)}',
+        f'"title": {_json_value(_display_title(item))}',
+    ]
+    if item.description:
+        fields.append(f'"content_text": {_json_value(item.description)}')
+    if published is not None:
+        fields.append(f'"date_published": {_json_value(format_rfc3339(published))}')
+    if item.author:
+        fields.append(f'"authors": [{{"name": {_json_value(item.author)}}}]')
+    if item.repost_of:
+        fields.append(f'"tags": [{_json_value(UPDATE_CATEGORY)}]')
+    return ("" if first else ",") + "\n    {" + ", ".join(fields) + "}"
+
+
+def _json_footer(item_count: int) -> str:
+    return "\n  ]\n}\n" if item_count else "]\n}\n"
+
+
+def _published_dates(items: list[Announcement]) -> tuple[list[datetime | None], datetime | None]:
+    published = [parse_iso_datetime(item.pub_date) for item in items]
+    # Derive the channel date from the items instead of the wall clock so that
+    # identical input always produces byte-identical output.
+    newest = max((value for value in published if value is not None), default=None)
+    return published, newest
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(path.name + ".tmp")
+
+
+def _open_tmp(path: Path) -> TextIO:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return _tmp_path(path).open("w", encoding="utf-8", newline="\n")
+
+
+def _compressed_paths(path: Path) -> list[Path]:
+    paths = [path.with_name(path.name + ".gz")]
+    if brotli is not None:
+        paths.append(path.with_name(path.name + ".br"))
+    return paths
+
+
+def write_compressed_copies(path: Path, data: bytes) -> None:
+    # mtime=0 keeps the gzip header stable so unchanged feeds stay byte-identical.
+    path.with_name(path.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        path.with_name(path.name + ".br").write_bytes(brotli.compress(data, quality=11))
+
+
+def _commit_artifact(path: Path) -> bool:
+    tmp_path = _tmp_path(path)
+    data = tmp_path.read_bytes()
+    try:
+        unchanged = path.read_bytes() == data
+    except FileNotFoundError:
+        unchanged = False
+    if unchanged and all(candidate.exists() for candidate in _compressed_paths(path)):
+        tmp_path.unlink()
+        return False
+    os.replace(tmp_path, path)
+    write_compressed_copies(path, data)
+    return True
+
+
+def write_feeds(
+    items: list[Announcement],
+    *,
+    rss_path: Path,
+    atom_path: Path,
+    json_path: Path,
+    limit: int | None = None,
+    rss_links: list[tuple[str, str]] | None = None,
+) -> int:
+    selected = items[: max(settings.max_feed_items if limit is None else limit, 0)]
+    published, feed_updated = _published_dates(selected)
+
+    paths = (rss_path, atom_path, json_path)
+    try:
+        with _open_tmp(rss_path) as rss, _open_tmp(atom_path) as atom, _open_tmp(json_path) as json_feed:
+            rss.write(_rss_header(feed_updated, rss_links or []))
+            atom.write(_atom_header(feed_updated))
+            json_feed.write(_json_header())
+            for index, (item, item_published) in enumerate(zip(selected, published)):
+                rss.write(_rss_item(item, item_published))
+                atom.write(_atom_entry(item, item_published, feed_updated))
+                json_feed.write(_json_item(item, item_published, first=index == 0))
+            rss.write(_RSS_FOOTER)
+            atom.write(_ATOM_FOOTER)
+            json_feed.write(_json_footer(len(selected)))
+        for path in paths:
+            _commit_artifact(path)
+    finally:
+        for path in paths:
+            _tmp_path(path).unlink(missing_ok=True)
+    return len(selected)
+
+
+def write_archive_page(items: list[Announcement], path: Path, links: list[tuple[str, str]]) -> bool:
+    published, updated = _published_dates(items)
+    try:
+        with _open_tmp(path) as rss:
+            rss.write(_rss_header(updated, links, archive=True))
+            for item, item_published in zip(items, published):
+                rss.write(_rss_item(item, item_published))
+            rss.write(_RSS_FOOTER)
+        return _commit_artifact(path)
+    finally:
+        _tmp_path(path).unlink(missing_ok=True)
+
+
+def archive_page_path(number: int) -> Path:
+    return ARCHIVE_DIR / f"feed-{number:04d}.xml"
+
+
+def _feed_href(path: Path, *, from_archive: bool) -> str:
+    base_url = os.getenv("FEED_BASE_URL", "").strip()
+    if base_url:
+        return base_url.rstrip("/") + "/" + path.as_posix()
+    if not from_archive:
+        return path.as_posix()
+    if path.parent == ARCHIVE_DIR:
+        return path.name
+    return "../" * len(ARCHIVE_DIR.parts) + path.as_posix()
+
+
+def _archive_page_links(number: int) -> list[tuple[str, str]]:
+    links = [("current", _feed_href(FEED_FILE, from_archive=True))]
+    if number > 1:
+        links.append(("prev-archive", _feed_href(archive_page_path(number - 1), from_archive=True)))
+    return links
+
+
+def _load_archive_index() -> dict:
+    empty: dict = {"pages": [], "open_items": [], "current": []}
+    try:
+        raw = json.loads(ARCHIVE_INDEX_FILE.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return empty
+    except json.JSONDecodeError:
+        logger.warning(
+            "Archive index is invalid JSON; starting a new archive series",
+            extra={"event": "archive_index_invalid", "path": str(ARCHIVE_INDEX_FILE)},
+        )
+        return empty
+    if not isinstance(raw, dict):
+        return empty
+    return {
+        "pages": [page for page in raw.get("pages", []) if isinstance(page, dict)],
+        "open_items": raw.get("open_items", []),
+        "current": raw.get("current", []),
+    }
+
+
+def update_archive(items: list[Announcement], current_window: list[Announcement]) -> int | None:
+    index = _load_archive_index()
+    sealed_pages: list[dict] = index["pages"]
+    open_items = [item for item in map(parse_cached_item, index["open_items"]) if item is not None]
+    previous_window = [item for item in map(parse_cached_item, index["current"]) if item is not None]
+
+    archived_ids = {ann_id for page in sealed_pages for ann_id in page.get("ids", [])}
+    archived_ids.update(item.id for item in open_items)
+    window_ids = {item.id for item in current_window}
+
+    # Items leave the current feed either by being pushed out of the window or
+    # by overflowing it on this run; both kinds move into the archive once.
+    evicted: list[Announcement] = []
+    seen: set[str] = set()
+    for item in previous_window + items[len(current_window) :]:
+        if item.id in window_ids or item.id in archived_ids or item.id in seen:
+            continue
+        seen.add(item.id)
+        evicted.append(item)
+
+    # Pages fill oldest-first so that a sealed page never has to change again.
+    open_changed = False
+    for item in reversed(sort_announcements_for_feed(evicted)):
+        open_items.append(item)
+        open_changed = True
+        if len(open_items) < ARCHIVE_PAGE_SIZE:
+            continue
+        number = len(sealed_pages) + 1
+        write_archive_page(list(reversed(open_items)), archive_page_path(number), _archive_page_links(number))
+        sealed_pages.append({"number": number, "ids": [entry.id for entry in open_items]})
+        logger.info(
+            "Archive page sealed",
+            extra={"event": "archive_sealed", "count": len(open_items), "path": str(archive_page_path(number))},
+        )
+        open_items = []
+
+    newest_page: int | None = len(sealed_pages) or None
+    if open_items:
+        newest_page = len(sealed_pages) + 1
+        page_path = archive_page_path(newest_page)
+        if open_changed or not page_path.exists():
+            write_archive_page(list(reversed(open_items)), page_path, _archive_page_links(newest_page))
+
+    ARCHIVE_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    ARCHIVE_INDEX_FILE.write_text(
+        json.dumps(
+            {
+                "page_size": ARCHIVE_PAGE_SIZE,
+                "pages": sealed_pages,
+                "open_items": [asdict(item) for item in open_items],
+                "current": [asdict(item) for item in current_window],
+            },
+            indent=2,
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    return newest_page
 
 
 def generate_rss_feed(items: list[Announcement]) -> None:
-    fg = FeedGenerator()
-    fg.title("Nurture Announcements")
-    fg.link(href=TARGET_URL, rel="alternate")
-    fg.description("Announcements feed generated from nurture.diveanalytics.com")
-    fg.language("en")
-    fg.lastBuildDate(format_datetime(datetime.now(timezone.utc)))
-
-    for item in items[:MAX_FEED_ITEMS]:
-        fe = fg.add_entry(order="append")
-        fe.guid(item.id, permalink=False)
-        fe.title(item.title)
-        fe.link(href=item.link, rel="alternate")
-        if item.author:
-            fe.author({"name": item.author})
-        if item.description:
-            fe.description(item.description)
-        pub_date = to_rfc2822(item.pub_date)
-        if pub_date:
-            fe.pubDate(pub_date)
-
-    FEED_FILE.write_bytes(fg.rss_str(pretty=True))
-    logger.info(
-        "RSS feed written",
-        extra={"event": "feed_written", "count": min(len(items), MAX_FEED_ITEMS), "path": str(FEED_FILE)},
+    current_window = items[: settings.max_feed_items]
+    newest_page = update_archive(items, current_window)
+    rss_links = []
+    if newest_page is not None:
+        rss_links.append(("prev-archive", _feed_href(archive_page_path(newest_page), from_archive=False)))
+
+    count = write_feeds(
+        current_window,
+        rss_path=FEED_FILE,
+        atom_path=ATOM_FEED_FILE,
+        json_path=JSON_FEED_FILE,
+        rss_links=rss_links,
     )
+    for path in (FEED_FILE, ATOM_FEED_FILE, JSON_FEED_FILE):
+        logger.info(
+            "RSS feed written",
+            extra={"event": "feed_written", "count": count, "path": str(path)},
+        )
@@ -1,36 +1,48 @@
 import asyncio
+import os
 import time
+from pathlib import Path
+from typing import Any, AsyncIterator
 from urllib.parse import urlparse
 
-from playwright.async_api import Error as AsyncPlaywrightError
-from playwright.async_api import TimeoutError as AsyncPlaywrightTimeoutError
-from playwright.async_api import async_playwright
-from playwright.sync_api import Error as PlaywrightError
-from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
-from playwright.sync_api import sync_playwright
-
-from .config import (
-    AUTH_FILE,
-    DETAIL_ENRICH_CONCURRENCY,
-    DETAIL_ENRICH_LIMIT,
-    SCRAPE_RETRIES,
-    SCRAPE_RETRY_DELAY_SECONDS,
-    TARGET_URL,
+from .browser_profile import (
+    launch_context_async,
+    launch_context_sync,
+    record_list_navigation,
+    record_storage_state_written,
+    watch_cache_hits_async,
+    watch_cache_hits_sync,
 )
+from .config import AUTH_FILE, TARGET_URL
+from .deadline import MIN_NAVIGATION_TIMEOUT_MS, deadline
 from .extractors import extract_announcements_from_html, extract_detail_fields_from_html
 from .logging_utils import logger
+from .metrics import metrics
 from .models import Announcement
+from .session import looks_like_login_or_expired, save_storage_state_if_changed
+from .settings import settings
+from .tab_pool import TabPool
 
 
-def looks_like_login_or_expired(url: str) -> bool:
-    lowered = url.lower()
-    host = urlparse(url).netloc.lower()
-    return (
-        "accounts.google.com" in host
-        or "/login" in lowered
-        or "signin" in lowered
-        or "oauth" in lowered
-    )
+def target_url() -> str:
+    # NURTURE_TARGET_URL points the scraper at a mock or recorded copy of the site.
+    return os.getenv("NURTURE_TARGET_URL") or TARGET_URL
+
+
+def storage_state_path() -> str | None:
+    if AUTH_FILE.exists():
+        return str(AUTH_FILE)
+    if urlparse(target_url()).hostname in {"127.0.0.1", "localhost"}:
+        # Local stand-ins do not need a login.
+        return None
+    raise FileNotFoundError(f"Missing {AUTH_FILE}. Restore it from the AUTH_JSON GitHub secret before running.")
+
+
+def _close_sync(context: Any, browser: Any) -> None:
+    # Persistent contexts have no separate browser object to close.
+    context.close()
+    if browser is not None:
+        browser.close()
 
 
 def scrape_announcements_once(
@@ -39,19 +51,29 @@ def scrape_announcements_once(
     slow_mo_ms: int = 0,
     debug_hold_seconds: int = 0,
 ) -> list[Announcement]:
-    if not AUTH_FILE.exists():
-        raise FileNotFoundError(
-            f"Missing {AUTH_FILE}. Restore it from the AUTH_JSON GitHub secret before running."
-        )
+    from playwright.sync_api import Error as PlaywrightError
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    from playwright.sync_api import sync_playwright
+
+    storage_state = storage_state_path()
+    url = target_url()
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless, slow_mo=slow_mo_ms)
-        context = browser.new_context(storage_state=str(AUTH_FILE))
+        context, browser = launch_context_sync(p, headless=headless, slow_mo_ms=slow_mo_ms, storage_state=storage_state)
         page = context.new_page()
+        watch_cache_hits_sync(context, page, "list")
+        navigation_started = time.perf_counter()
         try:
-            logger.info("Navigating to announcements page", extra={"event": "navigate", "url": TARGET_URL})
-            page.goto(TARGET_URL, wait_until="domcontentloaded", timeout=60000)
-            page.wait_for_load_state("networkidle", timeout=60000)
+            logger.info("Navigating to announcements page", extra={"event": "navigate", "url": url})
+            # Timeouts shrink as the run budget runs down.
+            page.goto(
+                url,
+                wait_until="domcontentloaded",
+                timeout=deadline.clamp_timeout_ms(settings.list_navigation_timeout_ms),
+            )
+            page.wait_for_load_state(
+                "networkidle", timeout=deadline.clamp_timeout_ms(settings.list_network_idle_timeout_ms)
+            )
         except PlaywrightTimeoutError:
             logger.warning(
                 "Timed out waiting for network idle; continuing with current DOM",
@@ -62,7 +84,7 @@ def scrape_announcements_once(
 
         current_url = page.url
         if looks_like_login_or_expired(current_url):
-            browser.close()
+            _close_sync(context, browser)
             raise PermissionError(
                 f"Authenticated session appears expired; redirected to login page: {current_url}"
             )
@@ -75,9 +97,25 @@ def scrape_announcements_once(
             time.sleep(debug_hold_seconds)
 
         html = page.content()
-        browser.close()
+        navigation_ms = (time.perf_counter() - navigation_started) * 1000
+        # The site rotates cookies on visits; keep them so the saved session lasts longer.
+        refreshed_state = context.storage_state() if storage_state is not None else None
+        _close_sync(context, browser)
+
+    if refreshed_state is not None and save_storage_state_if_changed(refreshed_state, Path(storage_state)):
+        record_storage_state_written(storage_state)
 
+    record_list_navigation(navigation_ms)
+    parse_started = time.perf_counter()
     announcements = extract_announcements_from_html(html, base_url=current_url)
+    metrics.record_page(
+        "list",
+        current_url,
+        navigation_ms=navigation_ms,
+        parse_ms=(time.perf_counter() - parse_started) * 1000,
+        bytes_fetched=len(html.encode("utf-8")),
+    )
+    metrics.increment("items_scraped", len(announcements))
     if not announcements:
         logger.warning(
             "No announcements were extracted. Selectors may need adjustment.",
@@ -96,8 +134,18 @@ def scrape_announcements_with_retry(
     slow_mo_ms: int = 0,
     debug_hold_seconds: int = 0,
 ) -> list[Announcement]:
+    # Playwright is only imported once a scrape actually starts.
+    from playwright.sync_api import Error as PlaywrightError
+
     last_error: Exception | None = None
-    for attempt in range(1, SCRAPE_RETRIES + 1):
+    retries = settings.scrape_retries
+    for attempt in range(1, retries + 1):
+        if attempt > 1 and not deadline.can_start(MIN_NAVIGATION_TIMEOUT_MS / 1000):
+            logger.warning(
+                "No time left in the run budget for another scrape attempt",
+                extra={"event": "scrape_deadline", "attempt": attempt},
+            )
+            break
         try:
             logger.info("Scrape attempt started", extra={"event": "scrape_attempt", "attempt": attempt})
             return scrape_announcements_once(
@@ -114,26 +162,52 @@ def scrape_announcements_with_retry(
                 extra={"event": "scrape_failed", "attempt": attempt},
                 exc_info=True,
             )
-            if attempt < SCRAPE_RETRIES:
-                time.sleep(SCRAPE_RETRY_DELAY_SECONDS)
+            if attempt < retries:
+                time.sleep(deadline.clamp_seconds(settings.scrape_retry_delay_seconds))
     assert last_error is not None
     raise RuntimeError(f"All scrape attempts failed: {last_error}") from last_error
 
 
 def enrich_announcements_with_detail_pages(
     items: list[Announcement],
-    limit: int = DETAIL_ENRICH_LIMIT,
+    limit: int | None = None,
     *,
     headless: bool = True,
     slow_mo_ms: int = 0,
-    concurrency: int = DETAIL_ENRICH_CONCURRENCY,
+    concurrency: int | None = None,
 ) -> None:
+    async def consume() -> None:
+        async for _ in stream_enriched_announcements(
+            items,
+            limit,
+            headless=headless,
+            slow_mo_ms=slow_mo_ms,
+            concurrency=concurrency,
+        ):
+            pass
+
+    asyncio.run(consume())
+
+
+async def stream_enriched_announcements(
+    items: list[Announcement],
+    limit: int | None = None,
+    *,
+    headless: bool = True,
+    slow_mo_ms: int = 0,
+    concurrency: int | None = None,
+) -> AsyncIterator[Announcement]:
+    """Enrich items from their detail pages, yielding each one as soon as its page is parsed."""
     if not items:
         return
+    limit = settings.detail_enrich_limit if limit is None else limit
+    concurrency = settings.detail_enrich_concurrency if concurrency is None else concurrency
     to_enrich = items[: max(limit, 0)]
     if not to_enrich:
         return
-    if not AUTH_FILE.exists():
+    try:
+        storage_state = storage_state_path()
+    except FileNotFoundError:
         logger.warning(
             "Auth file missing; skipping detail enrichment",
             extra={"event": "detail_enrich_skipped", "path": str(AUTH_FILE)},
@@ -144,21 +218,24 @@ def enrich_announcements_with_detail_pages(
         "Starting detail enrichment (concurrent tabs)",
         extra={"event": "detail_enrich_start", "count": len(to_enrich)},
     )
+    enriched = 0
     try:
-        asyncio.run(
-            _enrich_announcements_with_detail_pages_async(
-                to_enrich,
-                headless=headless,
-                slow_mo_ms=slow_mo_ms,
-                concurrency=max(1, concurrency),
-            )
-        )
+        async for item in _stream_detail_pages(
+            to_enrich,
+            storage_state=storage_state,
+            headless=headless,
+            slow_mo_ms=slow_mo_ms,
+            concurrency=max(1, concurrency),
+        ):
+            enriched += 1
+            metrics.increment("items_enriched")
+            yield item
     except PermissionError:
         raise
     except Exception:
         logger.warning(
             "Detail enrichment failed; continuing with list-page data",
-            extra={"event": "detail_enrich_failed"},
+            extra={"event": "detail_enrich_failed", "count": enriched},
             exc_info=True,
         )
         return
@@ -169,30 +246,55 @@ def enrich_announcements_with_detail_pages(
     )
 
 
-async def _enrich_announcements_with_detail_pages_async(
+async def _stream_detail_pages(
     items: list[Announcement],
     *,
+    storage_state: str | None,
     headless: bool,
     slow_mo_ms: int,
     concurrency: int,
-) -> None:
+) -> AsyncIterator[Announcement]:
+    from playwright.async_api import Error as AsyncPlaywrightError
+    from playwright.async_api import TimeoutError as AsyncPlaywrightTimeoutError
+    from playwright.async_api import async_playwright
+
     semaphore = asyncio.Semaphore(max(1, concurrency))
 
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=headless, slow_mo=slow_mo_ms)
-        context = await browser.new_context(storage_state=str(AUTH_FILE))
+        context, browser = await launch_context_async(
+            p, headless=headless, slow_mo_ms=slow_mo_ms, storage_state=storage_state
+        )
+        pool = TabPool(
+            context,
+            concurrency,
+            max_uses=settings.detail_tab_max_uses,
+            on_open=lambda page: watch_cache_hits_async(context, page, "detail"),
+        )
 
         async def enrich_one(index: int, item: Announcement) -> Exception | None:
             async with semaphore:
-                page = await context.new_page()
-                try:
-                    logger.info(
+                return await load_detail(index, item)
+
+        async def load_detail(index: int, item: Announcement) -> Exception | None:
+            # Timed from tab acquisition so opening a fresh tab counts against the page.
+            navigation_started = time.perf_counter()
+            page = await pool.acquire()
+            replace: str | None = None
+            try:
+                with metrics.track_concurrency("detail_tabs"):
+                    logger.debug(
                         "Opening announcement detail page",
                         extra={"event": "detail_open", "attempt": index, "url": item.link},
                     )
                     try:
-                        await page.goto(item.link, wait_until="domcontentloaded", timeout=45000)
-                        await page.wait_for_load_state("networkidle", timeout=30000)
+                        await page.goto(
+                            item.link,
+                            wait_until="domcontentloaded",
+                            timeout=deadline.clamp_timeout_ms(settings.detail_navigation_timeout_ms),
+                        )
+                        await page.wait_for_load_state(
+                            "networkidle", timeout=deadline.clamp_timeout_ms(settings.detail_network_idle_timeout_ms)
+                        )
                     except AsyncPlaywrightTimeoutError:
                         logger.warning(
                             "Detail page network idle timeout; parsing current DOM",
@@ -204,14 +306,26 @@ async def _enrich_announcements_with_detail_pages_async(
                             extra={"event": "detail_failed", "url": item.link},
                             exc_info=True,
                         )
+                        replace = "navigation failed"
                         return exc
 
                     if looks_like_login_or_expired(page.url):
+                        replace = "login redirect"
                         return PermissionError(
                             f"Authenticated session appears expired while opening detail page: {page.url}"
                         )
 
-                    detail = extract_detail_fields_from_html(await page.content())
+                    html = await page.content()
+                    navigation_ms = (time.perf_counter() - navigation_started) * 1000
+                    parse_started = time.perf_counter()
+                    detail = extract_detail_fields_from_html(html)
+                    metrics.record_page(
+                        "detail",
+                        item.link,
+                        navigation_ms=navigation_ms,
+                        parse_ms=(time.perf_counter() - parse_started) * 1000,
+                        bytes_fetched=len(html.encode("utf-8")),
+                    )
                     if detail.get("title"):
                         item.title = detail["title"] or item.title
                     if detail.get("author"):
@@ -223,17 +337,39 @@ async def _enrich_announcements_with_detail_pages_async(
                     if detail.get("pub_date"):
                         item.pub_date = detail["pub_date"]
                     return None
-                finally:
-                    await page.close()
-
-        results = await asyncio.gather(
-            *(enrich_one(index, item) for index, item in enumerate(items, start=1)),
-            return_exceptions=False,
-        )
+            except AsyncPlaywrightError as exc:
+                # Lost the tab mid-page (crash, target closed): drop it and keep the list-page data.
+                logger.warning(
+                    "Detail tab failed; replacing it",
+                    extra={"event": "detail_failed", "url": item.link},
+                    exc_info=True,
+                )
+                replace = "tab error"
+                return exc
+            finally:
+                await pool.release(page, replace=replace)
 
-        await context.close()
-        await browser.close()
-
-    for result in results:
-        if isinstance(result, PermissionError):
-            raise result
+        tasks = [asyncio.ensure_future(enrich_one(index, item)) for index, item in enumerate(items, start=1)]
+        item_by_task = dict(zip(tasks, items))
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if isinstance(result, PermissionError):
+                        raise result
+                    if result is None:
+                        yield item_by_task[task]
+            if storage_state is not None:
+                refreshed_state = await context.storage_state()
+                if await asyncio.to_thread(save_storage_state_if_changed, refreshed_state, Path(storage_state)):
+                    await asyncio.to_thread(record_storage_state_written, storage_state)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await pool.close()
+            await context.close()
+            if browser is not None:
+                await browser.close()
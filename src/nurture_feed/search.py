@@ -0,0 +1,316 @@
+import bisect
+import hashlib
+import json
+import math
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .config import SEARCH_INDEX_FILE
+from .logging_utils import logger
+from .models import Announcement
+
+INDEX_SCHEMA_VERSION = 1
+_TOKEN_RE = re.compile(r"\w+")
+# author:tan, author:"Mrs Tan", "exact phrase", or a bare term.
+_QUERY_RE = re.compile(r'author:"(?P<quoted_author>[^"]*)"|author:(?P<author>\S+)|"(?P<phrase>[^"]*)"|(?P<term>\S+)')
+# BM25 parameters, plus extra weight for terms found in the title.
+_K1 = 1.2
+_B = 0.75
+_TITLE_WEIGHT = 2.0
+# Rewrite postings without replaced documents once this share of the index is dead.
+_COMPACT_DEAD_SHARE = 0.25
+
+# Stored per document so results can be shown without the cache.
+_DOC_ID, _DOC_TITLE, _DOC_LINK, _DOC_AUTHOR, _DOC_PUB_DATE, _DOC_TITLE_LEN, _DOC_LENGTH, _DOC_DIGEST = range(8)
+
+
+def tokenize(text: str | None) -> list[str]:
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _digest(item: Announcement) -> str:
+    digest = hashlib.sha1()
+    for part in (item.title, item.link, item.author, item.description, item.pub_date):
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class _Postings:
+    """One term's postings, decoded on demand; positions are only parsed for phrase checks."""
+
+    def __init__(self, encoded: list[str]) -> None:
+        docs, tfs, title_tfs, positions = encoded
+        self.docs = [int(value) for value in docs.split(",")]
+        self._tfs = tfs
+        self._title_tfs = title_tfs
+        self._positions = positions
+        self._row = {doc: row for row, doc in enumerate(self.docs)}
+
+    def tf(self, doc: int) -> tuple[int, int]:
+        if not isinstance(self._tfs, list):
+            self._tfs = [int(value) for value in self._tfs.split(",")]
+            self._title_tfs = [int(value) for value in self._title_tfs.split(",")]
+        row = self._row[doc]
+        return self._tfs[row], self._title_tfs[row]
+
+    def positions(self, doc: int) -> list[int]:
+        if not isinstance(self._positions, list):
+            self._positions = self._positions.split(";")
+        return [int(value) for value in self._positions[self._row[doc]].split(",")]
+
+
+def _encode_postings(entries: list[tuple[int, list[int], int]]) -> list[str]:
+    # Parallel comma lists: documents, term frequency, frequency within the title, positions.
+    return [
+        ",".join(str(doc) for doc, _, _ in entries),
+        ",".join(str(len(positions)) for _, positions, _ in entries),
+        ",".join(str(title_tf) for _, _, title_tf in entries),
+        ";".join(",".join(map(str, positions)) for _, positions, _ in entries),
+    ]
+
+
+def _join_postings(existing: list[str] | None, added: list[str]) -> list[str]:
+    if not existing:
+        return added
+    return [f"{left}{';' if index == 3 else ','}{right}" for index, (left, right) in enumerate(zip(existing, added))]
+
+
+@dataclass
+class SearchHit:
+    id: str
+    title: str
+    link: str
+    author: str | None
+    pub_date: str | None
+    score: float
+
+
+@dataclass
+class ParsedQuery:
+    terms: list[str]
+    phrases: list[list[str]]
+    author: list[str]
+
+
+def parse_query(query: str, *, author: str | None = None) -> ParsedQuery:
+    terms: list[str] = []
+    phrases: list[list[str]] = []
+    author_tokens = tokenize(author)
+    for match in _QUERY_RE.finditer(query):
+        if match.group("quoted_author") is not None or match.group("author") is not None:
+            author_tokens += tokenize(match.group("quoted_author") or match.group("author"))
+        elif match.group("phrase") is not None:
+            words = tokenize(match.group("phrase"))
+            if len(words) > 1:
+                phrases.append(words)
+            else:
+                terms += words
+        else:
+            terms += tokenize(match.group("term"))
+    for words in phrases:
+        terms += words
+    return ParsedQuery(list(dict.fromkeys(terms)), phrases, author_tokens)
+
+
+class SearchIndex:
+    """Inverted index over titles, descriptions and authors; only queried terms' postings are decoded.
+
+    A changed announcement gets a new document number; the old one stays dead until compaction.
+    """
+
+    def __init__(self, path: Path = SEARCH_INDEX_FILE) -> None:
+        self.path = path
+        self.docs: list[list[Any] | None] = []
+        self.terms: dict[str, list[str]] = {}
+        self._doc_by_id: dict[str, int] = {}
+        self.changed = False
+
+    @classmethod
+    def load(cls, path: Path = SEARCH_INDEX_FILE) -> "SearchIndex":
+        index = cls(path)
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return index
+        except json.JSONDecodeError:
+            logger.warning(
+                "Search index is invalid JSON; starting a new one",
+                extra={"event": "search_index_invalid", "path": str(path)},
+            )
+            return index
+        if not isinstance(raw, dict) or raw.get("schema_version") != INDEX_SCHEMA_VERSION:
+            return index
+        index.docs = raw.get("docs") or []
+        index.terms = raw.get("terms") or {}
+        index._doc_by_id = {doc[_DOC_ID]: number for number, doc in enumerate(index.docs) if doc is not None}
+        return index
+
+    def __len__(self) -> int:
+        return len(self._doc_by_id)
+
+    def _add(self, item: Announcement, digest: str, pending: dict[str, list[tuple[int, list[int], int]]]) -> None:
+        number = len(self.docs)
+        positions: dict[str, list[int]] = {}
+        position = 0
+        title_len = 0
+        for field_index, text in enumerate((item.title, item.description, item.author)):
+            for token in tokenize(text):
+                positions.setdefault(token, []).append(position)
+                position += 1
+            if field_index == 0:
+                title_len = position
+            # A skipped position keeps phrases from matching across fields.
+            position += 1
+        for token, token_positions in positions.items():
+            title_tf = bisect.bisect_left(token_positions, title_len)
+            pending.setdefault(token, []).append((number, token_positions, title_tf))
+        length = sum(len(token_positions) for token_positions in positions.values())
+        self.docs.append([item.id, item.title, item.link, item.author, item.pub_date, title_len, length, digest])
+        self._doc_by_id[item.id] = number
+
+    def update(self, items: list[Announcement], *, reindex: set[str] | None = None) -> int:
+        """Index new announcements and re-index changed ones; returns how many were (re)indexed.
+
+        With ``reindex``, indexed items outside it are left alone, e.g. list-page copies of enriched ones.
+        """
+        updated = 0
+        # Appended per term once at the end; growing the strings per document would be quadratic.
+        pending: dict[str, list[tuple[int, list[int], int]]] = {}
+        for item in items:
+            digest = _digest(item)
+            number = self._doc_by_id.get(item.id)
+            if number is not None:
+                if self.docs[number][_DOC_DIGEST] == digest or (reindex is not None and item.id not in reindex):
+                    continue
+                self.docs[number] = None
+            self._add(item, digest, pending)
+            updated += 1
+        for token, entries in pending.items():
+            self.terms[token] = _join_postings(self.terms.get(token), _encode_postings(entries))
+        if updated:
+            self.changed = True
+            if len(self.docs) and 1 - len(self) / len(self.docs) > _COMPACT_DEAD_SHARE:
+                self.compact()
+        return updated
+
+    def compact(self) -> None:
+        """Renumber live documents and drop postings of replaced ones."""
+        renumber: dict[int, int] = {}
+        docs: list[list[Any] | None] = []
+        for number, doc in enumerate(self.docs):
+            if doc is not None:
+                renumber[number] = len(docs)
+                docs.append(doc)
+        terms: dict[str, list[str]] = {}
+        for token, encoded in self.terms.items():
+            postings = _Postings(encoded)
+            live = [
+                (renumber[doc], postings.positions(doc), postings.tf(doc)[1])
+                for doc in postings.docs
+                if doc in renumber
+            ]
+            if live:
+                terms[token] = _encode_postings(live)
+        self.docs, self.terms = docs, terms
+        self._doc_by_id = {doc[_DOC_ID]: number for number, doc in enumerate(docs) if doc is not None}
+        self.changed = True
+
+    def _postings(self, token: str) -> _Postings | None:
+        encoded = self.terms.get(token)
+        return _Postings(encoded) if encoded else None
+
+    def search(self, query: str, *, author: str | None = None, limit: int = 10) -> list[SearchHit]:
+        """Documents containing every query term and phrase, best BM25 score first."""
+        parsed = parse_query(query, author=author)
+        if not parsed.terms and not parsed.author:
+            return []
+        postings: dict[str, _Postings] = {}
+        for token in parsed.terms:
+            found = self._postings(token)
+            if found is None:
+                return []
+            postings[token] = found
+        if parsed.terms:
+            # Rarest term first keeps the intersection small.
+            ordered = sorted(postings.values(), key=lambda entries: len(entries.docs))
+            candidates = {doc for doc in ordered[0].docs if self.docs[doc] is not None}
+            for entries in ordered[1:]:
+                candidates.intersection_update(entries.docs)
+        else:
+            candidates = set(self._doc_by_id.values())
+        if parsed.author:
+            wanted = set(parsed.author)
+            candidates = {doc for doc in candidates if wanted <= set(tokenize(self.docs[doc][_DOC_AUTHOR]))}
+        for phrase in parsed.phrases:
+            candidates = {
+                doc for doc in candidates if _has_phrase([postings[word].positions(doc) for word in phrase])
+            }
+        if not candidates:
+            return []
+
+        total = len(self)
+        # Only live documents count, matching ``total``; dead postings would push the IDF below zero.
+        frequency = {
+            token: sum(1 for doc in entries.docs if self.docs[doc] is not None) for token, entries in postings.items()
+        }
+        idf = {
+            token: math.log(1 + (total - count + 0.5) / (count + 0.5)) for token, count in frequency.items()
+        }
+        average_length = sum(doc[_DOC_LENGTH] for doc in self.docs if doc is not None) / max(total, 1)
+        scored: list[tuple[float, str, int]] = []
+        for doc in candidates:
+            record = self.docs[doc]
+            length_norm = _K1 * (1 - _B + _B * record[_DOC_LENGTH] / max(average_length, 1))
+            score = 0.0
+            for token in parsed.terms:
+                count, in_title = postings[token].tf(doc)
+                tf = count + (_TITLE_WEIGHT - 1) * in_title
+                score += idf[token] * tf * (_K1 + 1) / (tf + length_norm)
+            scored.append((score, record[_DOC_PUB_DATE] or "", doc))
+        # Ties (and author-only queries) go newest first.
+        scored.sort(key=lambda row: (row[0], row[1]), reverse=True)
+        return [
+            SearchHit(
+                id=self.docs[doc][_DOC_ID],
+                title=self.docs[doc][_DOC_TITLE],
+                link=self.docs[doc][_DOC_LINK],
+                author=self.docs[doc][_DOC_AUTHOR],
+                pub_date=self.docs[doc][_DOC_PUB_DATE],
+                score=round(score, 4),
+            )
+            for score, _, doc in scored[: max(limit, 0)]
+        ]
+
+    def save(self) -> None:
+        payload = {"schema_version": INDEX_SCHEMA_VERSION, "docs": self.docs, "terms": self.terms}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.changed = False
+
+
+def _has_phrase(positions_per_word: list[list[int]]) -> bool:
+    following = [set(positions) for positions in positions_per_word[1:]]
+    return any(
+        all(start + offset + 1 in positions for offset, positions in enumerate(following))
+        for start in positions_per_word[0]
+    )
+
+
+def update_search_index(
+    items: list[Announcement], path: Path = SEARCH_INDEX_FILE, *, reindex: set[str] | None = None
+) -> int:
+    """Add new and changed announcements to the on-disk index; untouched runs do not rewrite it."""
+    index = SearchIndex.load(path)
+    updated = index.update(items, reindex=reindex)
+    if index.changed:
+        index.save()
+    logger.info(
+        "Search index updated",
+        extra={"event": "search_index_updated", "count": updated, "path": str(path)},
+    )
+    return updated
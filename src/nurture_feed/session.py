@@ -0,0 +1,184 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+from .config import AUTH_FILE, SESSION_EXPIRY_WARNING_HOURS
+from .deadline import deadline
+from .logging_utils import logger
+from .settings import settings
+
+SESSION_ALIVE = "alive"
+SESSION_DEAD = "dead"
+# Network trouble or a state urllib cannot replay (e.g. localStorage tokens): let the browser decide.
+SESSION_UNKNOWN = "unknown"
+
+
+def looks_like_login_or_expired(url: str) -> bool:
+    lowered = url.lower()
+    host = urlparse(url).netloc.lower()
+    return (
+        "accounts.google.com" in host
+        or "/login" in lowered
+        or "signin" in lowered
+        or "oauth" in lowered
+    )
+
+
+@dataclass
+class SessionProbe:
+    status: str
+    reason: str
+    final_url: str | None = None
+    http_status: int | None = None
+    expires_in_hours: float | None = None
+
+    @property
+    def dead(self) -> bool:
+        return self.status == SESSION_DEAD
+
+
+def load_storage_state(path: Path = AUTH_FILE) -> dict[str, Any] | None:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return raw if isinstance(raw, dict) else None
+
+
+def _cookie_matches(cookie: dict[str, Any], url: str) -> bool:
+    parts = urlparse(url)
+    host = (parts.hostname or "").lower()
+    domain = str(cookie.get("domain") or "").lower()
+    if domain.startswith("."):
+        if host != domain[1:] and not host.endswith(domain):
+            return False
+    elif host != domain:
+        return False
+    if cookie.get("secure") and parts.scheme != "https":
+        return False
+    return (parts.path or "/").startswith(str(cookie.get("path") or "/"))
+
+
+def cookies_for_url(
+    state: dict[str, Any], url: str, *, now: float | None = None
+) -> tuple[list[dict[str, Any]], int]:
+    """Return the unexpired cookies the browser would send to ``url`` and how many matching ones expired."""
+    now = time.time() if now is None else now
+    live: list[dict[str, Any]] = []
+    expired = 0
+    for cookie in state.get("cookies") or []:
+        if not isinstance(cookie, dict) or not _cookie_matches(cookie, url):
+            continue
+        expires = cookie.get("expires", -1)
+        # Playwright stores session cookies with expires == -1.
+        if isinstance(expires, (int, float)) and 0 <= expires <= now:
+            expired += 1
+        else:
+            live.append(cookie)
+    return live, expired
+
+
+def probe_session(
+    url: str,
+    *,
+    storage_state_path: Path = AUTH_FILE,
+    timeout: float | None = None,
+    now: float | None = None,
+) -> SessionProbe:
+    """Check the saved session without a browser: cookie expiry first, then one authenticated GET."""
+    import urllib.error
+    import urllib.request
+
+    if timeout is None:
+        timeout = max(deadline.clamp_seconds(settings.session_probe_timeout_seconds), 0.1)
+    state = load_storage_state(storage_state_path)
+    if state is None:
+        return SessionProbe(SESSION_UNKNOWN, f"no readable storage state at {storage_state_path}")
+
+    now = time.time() if now is None else now
+    live, expired = cookies_for_url(state, url, now=now)
+    if not live:
+        if expired:
+            return SessionProbe(SESSION_DEAD, f"all {expired} cookies for {urlparse(url).hostname} have expired")
+        return SessionProbe(SESSION_UNKNOWN, "storage state has no cookies for the target host")
+
+    expiries = [cookie["expires"] for cookie in live if isinstance(cookie.get("expires"), (int, float)) and cookie["expires"] > 0]
+    expires_in_hours = round((min(expiries) - now) / 3600, 2) if expiries else None
+
+    request = urllib.request.Request(
+        url,
+        headers={
+            "Cookie": "; ".join(f"{cookie['name']}={cookie['value']}" for cookie in live if "name" in cookie),
+            "User-Agent": "nurture-feed-session-probe",
+            "Accept": "text/html",
+        },
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            # Redirects are followed; where we end up is what matters, not the body.
+            final_url = response.geturl()
+            http_status = response.status
+    except urllib.error.HTTPError as exc:
+        final_url, http_status = exc.geturl() or url, exc.code
+    except (urllib.error.URLError, OSError) as exc:
+        return SessionProbe(SESSION_UNKNOWN, f"probe request failed: {exc}", expires_in_hours=expires_in_hours)
+
+    # Only a login redirect is conclusive. A bare 401/403 can also be a WAF, a rate limit or a
+    # token urllib cannot replay, and falls through to UNKNOWN so the browser decides.
+    if looks_like_login_or_expired(final_url):
+        return SessionProbe(SESSION_DEAD, "redirected to a login page", final_url, http_status, expires_in_hours)
+    if 200 <= http_status < 300:
+        return SessionProbe(SESSION_ALIVE, "authenticated page loaded", final_url, http_status, expires_in_hours)
+    return SessionProbe(SESSION_UNKNOWN, f"HTTP {http_status}", final_url, http_status, expires_in_hours)
+
+
+def check_session(url: str, *, storage_state_path: Path = AUTH_FILE) -> SessionProbe:
+    """Run the probe, log the outcome and raise PermissionError when the session is dead."""
+    started = time.perf_counter()
+    probe = probe_session(url, storage_state_path=storage_state_path)
+    logger.info(
+        "Session probe: %s (%s)",
+        probe.status,
+        probe.reason,
+        extra={
+            "event": "session_probe",
+            "url": probe.final_url or url,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        },
+    )
+    if probe.expires_in_hours is not None and probe.expires_in_hours < SESSION_EXPIRY_WARNING_HOURS:
+        logger.warning(
+            "Session cookies expire in %.1f hours; refresh %s soon",
+            probe.expires_in_hours,
+            storage_state_path,
+            extra={"event": "session_expiring", "path": str(storage_state_path)},
+        )
+    if probe.dead:
+        raise PermissionError(f"Authenticated session is no longer valid: {probe.reason}")
+    return probe
+
+
+def _canonical(state: dict[str, Any]) -> str:
+    return json.dumps(state, sort_keys=True, separators=(",", ":"))
+
+
+def save_storage_state_if_changed(state: dict[str, Any], path: Path = AUTH_FILE) -> bool:
+    """Atomically replace ``path`` with ``state`` when it differs from what is saved; returns whether it wrote."""
+    previous = load_storage_state(path)
+    if previous is not None and _canonical(previous) == _canonical(state):
+        return False
+    tmp_path = path.with_name(path.name + ".tmp")
+    # The state holds session cookies; keep the file private to the owner.
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2)
+    os.replace(tmp_path, path)
+    logger.info(
+        "Refreshed session state saved",
+        extra={"event": "storage_state_saved", "path": str(path), "count": len(state.get("cookies") or [])},
+    )
+    return True
@@ -0,0 +1,230 @@
+import os
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Mapping
+
+from .config import (
+    BROWSER_PROFILE_DIR,
+    BROWSER_PROFILE_MAX_MB,
+    CHECKPOINT_RESUME_WINDOW_MINUTES,
+    DETAIL_ENRICH_CONCURRENCY,
+    DETAIL_ENRICH_LIMIT,
+    DETAIL_NAVIGATION_TIMEOUT_MS,
+    DETAIL_NETWORK_IDLE_TIMEOUT_MS,
+    DETAIL_PAGE_ESTIMATE_SECONDS,
+    DETAIL_TAB_MAX_USES,
+    ESSENTIAL_RESERVE_SECONDS,
+    LIST_NAVIGATION_TIMEOUT_MS,
+    LIST_NETWORK_IDLE_TIMEOUT_MS,
+    MAX_CACHE_ITEMS,
+    MAX_FEED_ITEMS,
+    MIN_ENRICH_SECONDS,
+    REPOST_MAX_DISTANCE,
+    RUN_DEADLINE_SECONDS,
+    RUN_LOCK_STALE_MINUTES,
+    RUN_LOCK_WAIT_SECONDS,
+    SCRAPE_RETRIES,
+    SCRAPE_RETRY_DELAY_SECONDS,
+    SESSION_PROBE_TIMEOUT_SECONDS,
+    SETTINGS_FILE,
+)
+from .logging_utils import logger
+
+ENV_PREFIX = "NURTURE_"
+
+
+@dataclass
+class Settings:
+    """Scraper and pipeline tunables; the defaults are the constants in config.py."""
+
+    scrape_retries: int = SCRAPE_RETRIES
+    scrape_retry_delay_seconds: float = SCRAPE_RETRY_DELAY_SECONDS
+    list_navigation_timeout_ms: int = LIST_NAVIGATION_TIMEOUT_MS
+    list_network_idle_timeout_ms: int = LIST_NETWORK_IDLE_TIMEOUT_MS
+    detail_navigation_timeout_ms: int = DETAIL_NAVIGATION_TIMEOUT_MS
+    detail_network_idle_timeout_ms: int = DETAIL_NETWORK_IDLE_TIMEOUT_MS
+    detail_enrich_limit: int = DETAIL_ENRICH_LIMIT
+    detail_enrich_concurrency: int = DETAIL_ENRICH_CONCURRENCY
+    # 1 opens a fresh tab for every detail page.
+    detail_tab_max_uses: int = DETAIL_TAB_MAX_USES
+    max_feed_items: int = MAX_FEED_ITEMS
+    max_cache_items: int = MAX_CACHE_ITEMS
+    session_probe_timeout_seconds: float = SESSION_PROBE_TIMEOUT_SECONDS
+    checkpoint_resume_window_minutes: float = CHECKPOINT_RESUME_WINDOW_MINUTES
+    run_lock_wait_seconds: float = RUN_LOCK_WAIT_SECONDS
+    run_lock_stale_minutes: float = RUN_LOCK_STALE_MINUTES
+    repost_max_distance: int = REPOST_MAX_DISTANCE
+    # 0 disables the run deadline.
+    run_deadline_seconds: float = RUN_DEADLINE_SECONDS
+    essential_reserve_seconds: float = ESSENTIAL_RESERVE_SECONDS
+    min_enrich_seconds: float = MIN_ENRICH_SECONDS
+    detail_page_estimate_seconds: float = DETAIL_PAGE_ESTIMATE_SECONDS
+    # Empty keeps a throwaway browser context per run.
+    browser_profile_dir: str = BROWSER_PROFILE_DIR
+    browser_profile_max_mb: int = BROWSER_PROFILE_MAX_MB
+
+
+_FIELD_TYPES = {field.name: field.type for field in fields(Settings)}
+# Values that must be at least 1; everything else only has to be non-negative.
+_POSITIVE = {
+    "scrape_retries",
+    "detail_enrich_concurrency",
+    "detail_tab_max_uses",
+    "max_feed_items",
+    "max_cache_items",
+    "browser_profile_max_mb",
+    "run_lock_stale_minutes",
+}
+
+PROFILES: dict[str, dict[str, Any]] = {
+    # Short timeouts and few retries: fail fast and keep CI minutes down.
+    "ci-fast": {
+        "scrape_retries": 2,
+        "scrape_retry_delay_seconds": 2,
+        "list_navigation_timeout_ms": 30000,
+        "list_network_idle_timeout_ms": 20000,
+        "detail_navigation_timeout_ms": 20000,
+        "detail_network_idle_timeout_ms": 10000,
+        "detail_enrich_limit": 5,
+        "detail_enrich_concurrency": 6,
+        "session_probe_timeout_seconds": 5,
+        "run_deadline_seconds": 480,
+    },
+    # Patient and exhaustive: enrich every new item and keep a long history.
+    "backfill": {
+        "scrape_retries": 5,
+        "scrape_retry_delay_seconds": 15,
+        "list_navigation_timeout_ms": 120000,
+        "list_network_idle_timeout_ms": 90000,
+        "detail_navigation_timeout_ms": 90000,
+        "detail_network_idle_timeout_ms": 60000,
+        "detail_enrich_limit": 500,
+        "max_cache_items": 2000,
+        "checkpoint_resume_window_minutes": 360,
+        "run_deadline_seconds": 3000,
+    },
+    # One tab at a time with generous timeouts for small or shared runners.
+    "low-resource": {
+        "list_navigation_timeout_ms": 90000,
+        "list_network_idle_timeout_ms": 90000,
+        "detail_navigation_timeout_ms": 60000,
+        "detail_network_idle_timeout_ms": 45000,
+        "detail_enrich_limit": 5,
+        "detail_enrich_concurrency": 1,
+    },
+}
+
+
+def _coerce(name: str, value: Any) -> int | float | str:
+    if name not in _FIELD_TYPES:
+        raise ValueError(f"Unknown setting {name!r}; expected one of: {', '.join(_FIELD_TYPES)}")
+    if _FIELD_TYPES[name] is str:
+        return str(value).strip()
+    kind = int if _FIELD_TYPES[name] is int else float
+    if isinstance(value, bool):
+        raise ValueError(f"Setting {name} must be a number, got {value!r}")
+    try:
+        number = kind(value.strip() if isinstance(value, str) else value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Setting {name} must be {'an integer' if kind is int else 'a number'}, got {value!r}") from None
+    if number < (1 if name in _POSITIVE else 0):
+        raise ValueError(f"Setting {name} is out of range: {number}")
+    return number
+
+
+def _read_toml(path: Path) -> dict[str, Any]:
+    import tomllib
+
+    with path.open("rb") as handle:
+        return tomllib.load(handle)
+
+
+def resolve_settings(
+    *,
+    profile: str | None = None,
+    config_path: Path | None = None,
+    overrides: Mapping[str, Any] | None = None,
+    env: Mapping[str, str] | None = None,
+) -> tuple[Settings, dict[str, str], str | None]:
+    """Layer defaults, a named profile, the TOML file, NURTURE_* variables and CLI overrides, in that order.
+
+    Returns the settings, where each value came from, and the profile in use.
+    """
+    env = os.environ if env is None else env
+    explicit_file = config_path or (Path(env["NURTURE_CONFIG"]) if env.get("NURTURE_CONFIG") else None)
+    path = explicit_file or SETTINGS_FILE
+    document: dict[str, Any] = {}
+    if path.exists():
+        document = _read_toml(path)
+    elif explicit_file is not None:
+        raise ValueError(f"Settings file not found: {path}")
+
+    profiles = dict(PROFILES)
+    for name, values in (document.get("profiles") or {}).items():
+        profiles[name] = {**profiles.get(name, {}), **values}
+    profile = profile or env.get(f"{ENV_PREFIX}PERF_PROFILE") or document.get("profile")
+    if profile and profile not in profiles:
+        raise ValueError(f"Unknown performance profile {profile!r}; expected one of: {', '.join(sorted(profiles))}")
+
+    values = asdict(Settings())
+    sources = dict.fromkeys(values, "default")
+    layers: list[tuple[str, Mapping[str, Any]]] = [
+        (f"profile:{profile}", profiles[profile] if profile else {}),
+        (f"file:{path}", document.get("settings") or {}),
+        ("env", {name: env[f"{ENV_PREFIX}{name.upper()}"] for name in values if f"{ENV_PREFIX}{name.upper()}" in env}),
+        ("cli", overrides or {}),
+    ]
+    for source, layer in layers:
+        for name, value in layer.items():
+            values[name] = _coerce(name, value)
+            sources[name] = source
+    return Settings(**values), sources, profile
+
+
+settings = Settings()
+_sources: dict[str, str] = dict.fromkeys(_FIELD_TYPES, "default")
+_profile: str | None = None
+_configured = False
+
+
+def configure_settings(
+    *,
+    profile: str | None = None,
+    config_path: Path | None = None,
+    overrides: Mapping[str, Any] | None = None,
+) -> Settings:
+    """Resolve the layered settings and apply them to the shared ``settings`` object in place."""
+    global _profile, _sources, _configured
+    resolved, sources, active_profile = resolve_settings(profile=profile, config_path=config_path, overrides=overrides)
+    for name in _FIELD_TYPES:
+        setattr(settings, name, getattr(resolved, name))
+    _sources, _profile, _configured = sources, active_profile, True
+    return settings
+
+
+def settings_configured() -> bool:
+    return _configured
+
+
+def parse_overrides(pairs: list[str]) -> dict[str, str]:
+    """Parse ``NAME=VALUE`` pairs from the command line."""
+    overrides: dict[str, str] = {}
+    for pair in pairs:
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Expected NAME=VALUE, got {pair!r}")
+        overrides[name.strip().replace("-", "_")] = value
+    return overrides
+
+
+def log_effective_settings() -> None:
+    logger.info(
+        "Effective settings (profile: %s)",
+        _profile or "none",
+        extra={
+            "event": "settings",
+            "profile": _profile,
+            "settings": asdict(settings),
+            "overridden": {name: source for name, source in _sources.items() if source != "default"},
+        },
+    )
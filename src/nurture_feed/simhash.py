@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from .config import SIMHASH_INDEX_FILE, SIMHASH_INDEX_MAX_ITEMS
+from .logging_utils import logger
+from .metrics import metrics
+from .models import Announcement
+from .settings import settings
+
+FINGERPRINT_BITS = 64
+INDEX_SCHEMA_VERSION = 1
+_TOKEN_RE = re.compile(r"\w+")
+# Class levels, amounts and dates are what tell templated notices apart ("P3" vs "P4"), so
+# tokens with digits pull harder than the surrounding wording.
+_NUMBER_WEIGHT = 5
+# Shorter texts ("Reminder", "Holiday") collide too easily to call anything a repost.
+_MIN_TOKENS = 8
+
+
+def _tokens(item: Announcement) -> list[str]:
+    return _TOKEN_RE.findall(f"{item.title}\n{item.description or ''}".lower())
+
+
+def simhash(tokens: list[str]) -> int:
+    """64-bit SimHash of weighted word tokens; similar texts differ in few bits."""
+    weights = [0] * FINGERPRINT_BITS
+    for token in tokens:
+        weight = _NUMBER_WEIGHT if any(char.isdigit() for char in token) else 1
+        value = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += weight if value >> bit & 1 else -weight
+    return sum(1 << bit for bit, total in enumerate(weights) if total > 0)
+
+
+def fingerprint(item: Announcement) -> int | None:
+    tokens = _tokens(item)
+    return simhash(tokens) if len(tokens) >= _MIN_TOKENS else None
+
+
+def hamming_distance(left: int, right: int) -> int:
+    return (left ^ right).bit_count()
+
+
+def _band_masks(max_distance: int) -> list[tuple[int, int]]:
+    # Pigeonhole: split into max_distance + 1 bands and any fingerprint within max_distance
+    # bits matches at least one band exactly, so only those buckets need comparing.
+    bands = min(max_distance + 1, FINGERPRINT_BITS)
+    edges = [round(index * FINGERPRINT_BITS / bands) for index in range(bands + 1)]
+    return [(start, (1 << (end - start)) - 1) for start, end in zip(edges, edges[1:])]
+
+
+class SimHashIndex:
+    """Fingerprints of every announcement seen, bucketed by band; buckets are rebuilt on load."""
+
+    def __init__(self, path: Path = SIMHASH_INDEX_FILE, *, max_distance: int | None = None) -> None:
+        self.path = path
+        self.max_distance = settings.repost_max_distance if max_distance is None else max_distance
+        self.fingerprints: dict[str, int] = {}
+        self.reposts: dict[str, str] = {}
+        self._bands = _band_masks(self.max_distance)
+        self._buckets: list[dict[int, list[str]]] = [{} for _ in self._bands]
+
+    @classmethod
+    def load(cls, path: Path = SIMHASH_INDEX_FILE, *, max_distance: int | None = None) -> "SimHashIndex":
+        index = cls(path, max_distance=max_distance)
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return index
+        except json.JSONDecodeError:
+            logger.warning(
+                "SimHash index is invalid JSON; rebuilding it",
+                extra={"event": "simhash_index_invalid", "path": str(path)},
+            )
+            return index
+        if not isinstance(raw, dict) or raw.get("schema_version") != INDEX_SCHEMA_VERSION:
+            return index
+        for item_id, value in (raw.get("fingerprints") or {}).items():
+            try:
+                index._insert(item_id, int(value, 16))
+            except (TypeError, ValueError):
+                continue
+        index.reposts = {key: value for key, value in (raw.get("reposts") or {}).items() if isinstance(value, str)}
+        return index
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.fingerprints
+
+    def _insert(self, item_id: str, value: int) -> None:
+        self.fingerprints[item_id] = value
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            buckets.setdefault(value >> shift & mask, []).append(item_id)
+
+    def add(self, item_id: str, value: int) -> None:
+        if item_id not in self.fingerprints:
+            self._insert(item_id, value)
+
+    def nearest(self, value: int, *, exclude: str | None = None) -> tuple[str, int] | None:
+        """The closest indexed id within ``max_distance`` bits, if any."""
+        best: tuple[str, int] | None = None
+        seen: set[str] = set()
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            for candidate in buckets.get(value >> shift & mask, ()):
+                if candidate == exclude or candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = hamming_distance(value, self.fingerprints[candidate])
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (candidate, distance)
+        return best
+
+    def original_of(self, item_id: str) -> str:
+        # Follow repost chains to the first posting; bounded in case of a hand-edited cycle.
+        for _ in range(len(self.reposts) + 1):
+            parent = self.reposts.get(item_id)
+            if parent is None:
+                return item_id
+            item_id = parent
+        return item_id
+
+    def save(self) -> None:
+        # Oldest entries go first once the index outgrows its cap; insertion order is age.
+        overflow = len(self.fingerprints) - SIMHASH_INDEX_MAX_ITEMS
+        fingerprints = list(self.fingerprints.items())[max(overflow, 0) :]
+        kept = {item_id for item_id, _ in fingerprints}
+        payload = {
+            "schema_version": INDEX_SCHEMA_VERSION,
+            "bits": FINGERPRINT_BITS,
+            "fingerprints": {item_id: f"{value:016x}" for item_id, value in fingerprints},
+            "reposts": {key: value for key, value in self.reposts.items() if key in kept},
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def link_reposts(new_items: list[Announcement], known: list[Announcement]) -> list[Announcement]:
+    """Set ``repost_of`` on near-duplicates of indexed items and return the rest, which are notified.
+
+    ``known`` is indexed too, so the first run seeds the index from the current list page.
+    """
+    index = SimHashIndex.load()
+    new_ids = {item.id for item in new_items}
+    for item in known:
+        if item.id not in index and item.id not in new_ids:
+            value = fingerprint(item)
+            if value is not None:
+                index.add(item.id, value)
+
+    fresh: list[Announcement] = []
+    reposts = 0
+    # Oldest first, so of two related items posted since the last run the later one is the repost.
+    for item in reversed(new_items):
+        if item.id in index:
+            # Judged by an earlier attempt of this run; do not let it match its own reposts.
+            item.repost_of = index.reposts.get(item.id)
+            if item.repost_of is None:
+                fresh.append(item)
+            else:
+                reposts += 1
+            continue
+        value = fingerprint(item)
+        match = index.nearest(value, exclude=item.id) if value is not None else None
+        if value is not None:
+            index.add(item.id, value)
+        if match is None:
+            fresh.append(item)
+            continue
+        original = index.original_of(match[0])
+        item.repost_of = original
+        index.reposts[item.id] = original
+        reposts += 1
+        logger.info(
+            "Announcement looks like a repost; treating it as an update",
+            extra={"event": "repost_detected", "url": item.link, "repost_of": original, "distance": match[1]},
+        )
+    metrics.increment("reposts_detected", reposts)
+    index.save()
+    fresh.reverse()
+    return fresh
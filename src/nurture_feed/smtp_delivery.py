@@ -0,0 +1,263 @@
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import TYPE_CHECKING
+
+from .config import (
+    EMAIL_ENVELOPE_SIZE,
+    EMAIL_MAX_CONNECTIONS,
+    SMTP_HOST,
+    SMTP_PORT,
+    SMTP_TIMEOUT_SECONDS,
+)
+from .logging_utils import logger
+from .metrics import metrics
+
+if TYPE_CHECKING:
+    import smtplib
+
+UNDISCLOSED_RECIPIENTS = "undisclosed-recipients:;"
+
+
+class DeliveryUncertain(Exception):
+    """The connection failed after DATA was sent; the server may already have accepted the message."""
+
+
+@dataclass
+class SmtpSettings:
+    host: str = SMTP_HOST
+    port: int = SMTP_PORT
+    username: str | None = None
+    password: str | None = None
+    starttls: bool = True
+    timeout: float = SMTP_TIMEOUT_SECONDS
+
+    @classmethod
+    def from_env(cls, username: str | None, password: str | None) -> "SmtpSettings":
+        return cls(
+            host=os.getenv("EMAIL_SMTP_HOST") or SMTP_HOST,
+            port=int(os.getenv("EMAIL_SMTP_PORT") or SMTP_PORT),
+            username=username,
+            password=password,
+            starttls=(os.getenv("EMAIL_SMTP_STARTTLS") or "1").strip().lower() not in {"0", "false", "no"},
+        )
+
+
+@dataclass
+class DeliveryReport:
+    delivered: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    deferred: list[str] = field(default_factory=list)
+    uncertain: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        # Uncertain envelopes are not failures: resending them risks a duplicate.
+        return bool(self.delivered or self.uncertain) and not self.failed and not self.deferred
+
+
+class RateLimiter:
+    def __init__(self, per_minute: float) -> None:
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self, deadline: float | None = None) -> bool:
+        with self._lock:
+            slot = max(self._next_slot, time.monotonic())
+            if deadline is not None and slot >= deadline:
+                return False
+            self._next_slot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+
+class SmtpSession:
+    def __init__(self, settings: SmtpSettings) -> None:
+        self.settings = settings
+        self._smtp: "smtplib.SMTP | None" = None
+
+    def __enter__(self) -> "SmtpSession":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _connect(self) -> "smtplib.SMTP":
+        import smtplib
+
+        smtp = smtplib.SMTP(self.settings.host, self.settings.port, timeout=self.settings.timeout)
+        try:
+            smtp.ehlo()
+            if self.settings.starttls:
+                smtp.starttls()
+                smtp.ehlo()
+            if self.settings.username and self.settings.password and smtp.has_extn("auth"):
+                smtp.login(self.settings.username, self.settings.password)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def _send_once(self, msg: EmailMessage, from_addr: str, to_addrs: list[str]) -> dict[str, str]:
+        import smtplib
+
+        if self._smtp is None:
+            self._smtp = self._connect()
+        smtp = self._smtp
+        # The envelope is sent step by step (what sendmail does internally) so a failure before
+        # DATA, which is safe to retry, can be told apart from one after it.
+        code, reply = smtp.mail(from_addr)
+        if code != 250:
+            smtp.rset()
+            raise smtplib.SMTPSenderRefused(code, reply, from_addr)
+        refused: dict[str, tuple[int, bytes]] = {}
+        for address in to_addrs:
+            code, reply = smtp.rcpt(address)
+            if code not in (250, 251):
+                refused[address] = (code, reply)
+        if len(refused) < len(to_addrs):
+            payload = msg.as_bytes(policy=msg.policy.clone(linesep="\r\n"))
+            try:
+                code, reply = smtp.data(payload)
+            except (smtplib.SMTPServerDisconnected, OSError) as exc:
+                smtp.close()
+                self._smtp = None
+                raise DeliveryUncertain(f"{type(exc).__name__}: {exc}") from exc
+            if code != 250:
+                smtp.rset()
+                raise smtplib.SMTPDataError(code, reply)
+        else:
+            smtp.rset()
+        return {address: f"{code} {reply.decode('utf-8', 'replace')}" for address, (code, reply) in refused.items()}
+
+    def send(self, msg: EmailMessage, from_addr: str, to_addrs: list[str]) -> dict[str, str]:
+        import smtplib
+
+        try:
+            return self._send_once(msg, from_addr, to_addrs)
+        except smtplib.SMTPServerDisconnected:
+            # Servers drop idle or long-lived sessions; the message was not sent yet, so
+            # reconnect once per envelope.
+            self._smtp = None
+            return self._send_once(msg, from_addr, to_addrs)
+
+    def close(self) -> None:
+        if self._smtp is None:
+            return
+        import smtplib
+
+        try:
+            self._smtp.quit()
+        except smtplib.SMTPException:
+            self._smtp.close()
+        except OSError:
+            pass
+        self._smtp = None
+
+
+def chunk_recipients(recipients: list[str], size: int) -> list[list[str]]:
+    size = max(size, 1)
+    return [recipients[start : start + size] for start in range(0, len(recipients), size)]
+
+
+def deliver_batch(
+    jobs: list[tuple[EmailMessage, list[str]]],
+    settings: SmtpSettings,
+    *,
+    from_addr: str,
+    envelope_size: int = EMAIL_ENVELOPE_SIZE,
+    max_connections: int = EMAIL_MAX_CONNECTIONS,
+    rate_limiter: RateLimiter | None = None,
+    deadline: float | None = None,
+) -> list[DeliveryReport]:
+    reports = [DeliveryReport() for _ in jobs]
+    work: queue.Queue[tuple[int, list[str]]] = queue.Queue()
+    for job_index, (_, recipients) in enumerate(jobs):
+        for chunk in chunk_recipients(recipients, envelope_size):
+            work.put((job_index, chunk))
+    if work.empty():
+        return reports
+
+    lock = threading.Lock()
+
+    def worker() -> None:
+        with SmtpSession(settings) as session, metrics.track_concurrency("smtp_sessions"):
+            while True:
+                try:
+                    job_index, chunk = work.get_nowait()
+                except queue.Empty:
+                    return
+                msg = jobs[job_index][0]
+                if (deadline is not None and time.monotonic() >= deadline) or (
+                    rate_limiter is not None and not rate_limiter.acquire(deadline)
+                ):
+                    # Out of time budget: leave the envelope for a later delivery pass.
+                    with lock:
+                        reports[job_index].deferred.extend(chunk)
+                    continue
+                try:
+                    refused = session.send(msg, from_addr, chunk)
+                except DeliveryUncertain as exc:
+                    logger.warning(
+                        "SMTP connection lost after DATA; not resending to %d recipient(s)",
+                        len(chunk),
+                        extra={"event": "smtp_uncertain", "count": len(chunk), "error": str(exc)},
+                    )
+                    with lock:
+                        reports[job_index].uncertain.extend(chunk)
+                    session.close()
+                    continue
+                except Exception as exc:
+                    refused = {address: f"{type(exc).__name__}: {exc}" for address in chunk}
+                    session.close()
+                with lock:
+                    report = reports[job_index]
+                    for address in chunk:
+                        if address in refused:
+                            report.failed[address] = refused[address]
+                        else:
+                            report.delivered.append(address)
+                metrics.increment("smtp_envelopes")
+
+    # Small lists use a single connection; larger ones fan out up to the limit.
+    connections = max(1, min(max_connections, work.qsize()))
+    threads = [threading.Thread(target=worker, name=f"smtp-{index}") for index in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for report in reports:
+        logger.info(
+            "SMTP delivery finished: %d delivered, %d failed, %d deferred, %d uncertain",
+            len(report.delivered),
+            len(report.failed),
+            len(report.deferred),
+            len(report.uncertain),
+            extra={"event": "smtp_delivery", "count": len(report.delivered)},
+        )
+    return reports
+
+
+def deliver_message(
+    msg: EmailMessage,
+    recipients: list[str],
+    settings: SmtpSettings,
+    *,
+    from_addr: str,
+    envelope_size: int = EMAIL_ENVELOPE_SIZE,
+    max_connections: int = EMAIL_MAX_CONNECTIONS,
+) -> DeliveryReport:
+    return deliver_batch(
+        [(msg, recipients)],
+        settings,
+        from_addr=from_addr,
+        envelope_size=envelope_size,
+        max_connections=max_connections,
+    )[0]
@@ -1,11 +1,33 @@
 import json
+import os
+import socket
+import sys
+import time
+import uuid
 from dataclasses import asdict
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
 
-from .config import CACHE_FILE, MAX_CACHE_ITEMS
+from .config import CACHE_FILE, RUN_LOCK_FILE
 from .logging_utils import logger
 from .models import Announcement
-from .utils import make_id, normalize_whitespace
+from .settings import settings
+from .utils import (
+    DATE_PRECISION_UNKNOWN,
+    make_id,
+    normalize_whitespace,
+    parse_iso_datetime,
+    pub_date_precision,
+    sort_announcements_for_feed,
+)
+
+
+def _read_cache_document() -> object:
+    try:
+        return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
 
 
 def load_cache() -> list[Announcement]:
@@ -16,9 +38,8 @@ def load_cache() -> list[Announcement]:
         )
         return []
 
-    try:
-        raw = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
+    raw = _read_cache_document()
+    if raw is None:
         logger.warning(
             "Cache file is invalid JSON; treating as empty cache",
             extra={"event": "cache_invalid", "path": str(CACHE_FILE)},
@@ -28,40 +49,278 @@ def load_cache() -> list[Announcement]:
     items = raw["items"] if isinstance(raw, dict) and isinstance(raw.get("items"), list) else raw if isinstance(raw, list) else []
     parsed: list[Announcement] = []
     for item in items:
-        if not isinstance(item, dict):
-            continue
-        title = normalize_whitespace(item.get("title"))
-        link = normalize_whitespace(item.get("link"))
-        ann_id = normalize_whitespace(item.get("id"))
-        if not title or not link:
-            continue
-        parsed.append(
-            Announcement(
-                id=ann_id or make_id(title, link),
-                title=title,
-                link=link,
-                source_id=normalize_whitespace(item.get("source_id") or item.get("sourceId")),
-                author=normalize_whitespace(item.get("author")),
-                description=normalize_whitespace(item.get("description")),
-                pub_date_raw=normalize_whitespace(item.get("pub_date_raw") or item.get("pubDateRaw")),
-                pub_date=normalize_whitespace(item.get("pub_date") or item.get("pubDate")),
-            )
-        )
+        announcement = parse_cached_item(item)
+        if announcement is not None:
+            parsed.append(announcement)
     return parsed
 
 
-def save_cache(items: list[Announcement]) -> None:
+def parse_cached_item(item: object) -> Announcement | None:
+    if not isinstance(item, dict):
+        return None
+    title = normalize_whitespace(item.get("title"))
+    link = normalize_whitespace(item.get("link"))
+    ann_id = normalize_whitespace(item.get("id"))
+    if not title or not link:
+        return None
+    return Announcement(
+        id=ann_id or make_id(title, link),
+        title=title,
+        link=link,
+        source_id=normalize_whitespace(item.get("source_id") or item.get("sourceId")),
+        author=normalize_whitespace(item.get("author")),
+        description=normalize_whitespace(item.get("description")),
+        pub_date_raw=normalize_whitespace(item.get("pub_date_raw") or item.get("pubDateRaw")),
+        pub_date=normalize_whitespace(item.get("pub_date") or item.get("pubDate")),
+        first_seen=normalize_whitespace(item.get("first_seen")),
+        repost_of=normalize_whitespace(item.get("repost_of")),
+    )
+
+
+def _document_items(raw: object) -> list[Announcement]:
+    entries = raw.get("items") if isinstance(raw, dict) else raw
+    if not isinstance(entries, list):
+        return []
+    return [item for item in map(parse_cached_item, entries) if item is not None]
+
+
+def merge_cache(
+    items: list[Announcement], on_disk: list[Announcement], base: list[Announcement]
+) -> list[Announcement]:
+    """Keep items an overlapping run saved since ``base`` was loaded; shared items keep the earlier first_seen."""
+    base_ids = {item.id for item in base}
+    disk_by_id = {item.id: item for item in on_disk}
+    merged = list(items)
+    for item in merged:
+        other = disk_by_id.get(item.id)
+        if other is not None and other.first_seen and (not item.first_seen or other.first_seen < item.first_seen):
+            item.first_seen = other.first_seen
+    known = {item.id for item in merged}
+    added = [item for item in on_disk if item.id not in known and item.id not in base_ids]
+    if added:
+        logger.info(
+            "Merged %d items saved by an overlapping run",
+            len(added),
+            extra={"event": "cache_merged", "count": len(added), "path": str(CACHE_FILE)},
+        )
+        merged = sort_announcements_for_feed(merged + added)
+    return merged
+
+
+def drop_items_saved_elsewhere(new_items: list[Announcement], base: list[Announcement]) -> list[Announcement]:
+    """Remove new items that an overlapping run has already saved, and so already notified about."""
+    base_ids = {item.id for item in base}
+    saved_elsewhere = {item.id for item in _document_items(_read_cache_document())} - base_ids
+    if not saved_elsewhere:
+        return new_items
+    kept = [item for item in new_items if item.id not in saved_elsewhere]
+    if len(kept) < len(new_items):
+        logger.warning(
+            "%d new items were already handled by an overlapping run",
+            len(new_items) - len(kept),
+            extra={"event": "new_items_claimed_elsewhere", "count": len(new_items) - len(kept)},
+        )
+    return kept
+
+
+def save_cache(items: list[Announcement], *, base: list[Announcement] | None = None) -> bool:
+    """Write the cache unless unchanged, merging in what other runs saved since ``base``; returns whether it wrote."""
+    previous = _read_cache_document()
+    if base is not None:
+        items = merge_cache(items, _document_items(previous), base)
+    cached_items = [asdict(item) for item in items[: settings.max_cache_items]]
+    if isinstance(previous, dict) and previous.get("items") == cached_items:
+        # Keeping the old updated_at_utc leaves the file byte-identical, so there is nothing to commit.
+        logger.info(
+            "Cache unchanged; not rewriting",
+            extra={"event": "cache_unchanged", "count": len(cached_items), "path": str(CACHE_FILE)},
+        )
+        return False
     payload = {
         "updated_at_utc": datetime.now(timezone.utc).isoformat(),
-        "items": [asdict(item) for item in items[:MAX_CACHE_ITEMS]],
+        "items": cached_items,
     }
-    CACHE_FILE.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp_path = CACHE_FILE.with_name(CACHE_FILE.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, CACHE_FILE)
     logger.info(
         "Cache file updated",
         extra={"event": "cache_saved", "count": len(payload["items"]), "path": str(CACHE_FILE)},
     )
+    return True
+
+
+def _date_rank(item: Announcement) -> tuple[int, bool]:
+    if parse_iso_datetime(item.pub_date) is None:
+        return DATE_PRECISION_UNKNOWN, True
+    return pub_date_precision(item.pub_date_raw)
+
+
+def anchor_dates(
+    current: list[Announcement], cached: list[Announcement], *, seen_at: datetime | None = None
+) -> int:
+    """Keep stored dates, first_seen and repost_of on known items; dates only unless this scrape is more precise.
+
+    New items get ``seen_at``. Returns how many known items took a more precise date.
+    """
+    seen_at_text = (seen_at or datetime.now(timezone.utc)).isoformat(timespec="seconds")
+    previous = {item.id: item for item in cached}
+    refined = 0
+    for item in current:
+        before = previous.get(item.id)
+        if before is None:
+            item.first_seen = item.first_seen or seen_at_text
+            continue
+        item.first_seen = before.first_seen or item.first_seen or seen_at_text
+        # Repost links are only decided when an item is new; the list page cannot tell.
+        item.repost_of = item.repost_of or before.repost_of
+        if _date_rank(item) < _date_rank(before):
+            refined += 1
+        else:
+            item.pub_date_raw, item.pub_date = before.pub_date_raw, before.pub_date
+    return refined
 
 
 def detect_new_items(current: list[Announcement], cached: list[Announcement]) -> list[Announcement]:
     cached_ids = {item.id for item in cached}
     return [item for item in current if item.id not in cached_ids]
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:  # e.g. EPERM: the process exists but belongs to someone else
+        return True
+    return True
+
+
+class RunLock:
+    """Advisory lock against overlapping runs; stale after ``stale_after`` or once its local owner exits."""
+
+    def __init__(self, path: Path = RUN_LOCK_FILE, *, stale_after: timedelta | None = None) -> None:
+        self.path = path
+        self.stale_after = timedelta(minutes=settings.run_lock_stale_minutes) if stale_after is None else stale_after
+        self.token = uuid.uuid4().hex
+        self.held = False
+
+    def _owner(self) -> dict[str, Any]:
+        return {
+            "token": self.token,
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "command": " ".join(sys.argv),
+            "github_run_id": os.getenv("GITHUB_RUN_ID"),
+            "acquired_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def read_owner(self) -> dict[str, Any] | None:
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return raw if isinstance(raw, dict) else {}
+
+    def _stale_reason(self, owner: dict[str, Any]) -> str | None:
+        acquired_at = parse_iso_datetime(owner.get("acquired_at"))
+        if acquired_at is None:
+            # Empty while the O_EXCL fallback fills it in: held until the file itself is stale.
+            try:
+                modified = datetime.fromtimestamp(self.path.stat().st_mtime, timezone.utc)
+            except FileNotFoundError:
+                return None
+            if datetime.now(timezone.utc) - modified > self.stale_after:
+                return f"unreadable lock file older than {self.stale_after}"
+            return None
+        if datetime.now(timezone.utc) - acquired_at > self.stale_after:
+            return f"older than {self.stale_after}"
+        pid = owner.get("pid")
+        # Signal 0 only probes on POSIX; on Windows it would deliver CTRL_C_EVENT.
+        if os.name == "posix" and owner.get("host") == socket.gethostname() and isinstance(pid, int):
+            if not _process_alive(pid):
+                return f"owner process {pid} has exited"
+        return None
+
+    def _try_create(self) -> bool:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{self.token}.tmp")
+        tmp_path.write_text(json.dumps(self._owner(), indent=2), encoding="utf-8")
+        try:
+            # link() fails if the lock exists, so the owner record appears atomically with the lock.
+            os.link(tmp_path, self.path)
+            return True
+        except FileExistsError:
+            return False
+        except OSError:
+            # No hard links on this filesystem: exclusive create, then fill in the owner.
+            try:
+                fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+            except FileExistsError:
+                return False
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(tmp_path.read_text(encoding="utf-8"))
+            return True
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _break_stale(self, owner: dict[str, Any], reason: str) -> None:
+        stale_path = self.path.with_name(self.path.name + ".stale")
+        try:
+            os.replace(self.path, stale_path)
+        except FileNotFoundError:
+            return
+        # Another run may have broken the same lock and taken it between our read and the rename.
+        moved = RunLock(stale_path).read_owner() or {}
+        if moved.get("token") != owner.get("token"):
+            try:
+                os.link(stale_path, self.path)
+            except FileExistsError:
+                pass
+            return
+        logger.warning(
+            "Took over a stale run lock (%s)",
+            reason,
+            extra={"event": "run_lock_stale", "path": str(self.path), "owner": owner},
+        )
+
+    def acquire(self, *, wait_seconds: float = 0.0, poll_seconds: float = 1.0) -> bool:
+        """Take the lock, waiting up to ``wait_seconds`` for a live owner to release it."""
+        give_up_at = time.monotonic() + wait_seconds
+        while True:
+            if self._try_create():
+                self.held = True
+                logger.info("Run lock acquired", extra={"event": "run_lock_acquired", "path": str(self.path)})
+                return True
+            owner = self.read_owner()
+            if owner is None:
+                continue  # released between our attempt and the read
+            reason = self._stale_reason(owner)
+            if reason is not None:
+                self._break_stale(owner, reason)
+                continue
+            if time.monotonic() >= give_up_at:
+                logger.warning(
+                    "Another run holds the lock (pid %s on %s since %s)",
+                    owner.get("pid"),
+                    owner.get("host"),
+                    owner.get("acquired_at"),
+                    extra={"event": "run_locked", "path": str(self.path), "owner": owner},
+                )
+                return False
+            time.sleep(min(poll_seconds, max(give_up_at - time.monotonic(), 0.0)))
+
+    def release(self) -> None:
+        if not self.held:
+            return
+        self.held = False
+        owner = self.read_owner() or {}
+        if owner.get("token") != self.token:
+            logger.warning(
+                "Run lock was taken over by another run; leaving it in place",
+                extra={"event": "run_lock_lost", "path": str(self.path), "owner": owner},
+            )
+            return
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,173 @@
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .config import SUBSCRIPTIONS_FILE
+from .logging_utils import logger
+from .models import Announcement
+from .utils import read_local_text
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+# Rule fields and the part of an announcement each one is matched against.
+_RULE_FIELDS = {"author": "author", "keywords": "text", "classes": "text"}
+
+
+def tokenize(value: str | None) -> list[str]:
+    if not value:
+        return []
+    return _TOKEN_RE.findall(value.lower())
+
+
+@dataclass
+class SubscriptionRule:
+    recipient: str
+    # Each entry is one field of the rule: the item part it applies to and its
+    # alternative terms (token sequences). A rule matches when every field has a hit.
+    fields: list[tuple[str, list[tuple[str, ...]]]] = field(default_factory=list)
+
+
+def _as_list(value: object) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [entry for entry in value if isinstance(entry, str)]
+    return []
+
+
+def parse_rule(recipient: str, raw: object) -> SubscriptionRule | None:
+    if not isinstance(raw, dict):
+        return None
+    rule = SubscriptionRule(recipient=recipient.strip().lower())
+    for name, target in _RULE_FIELDS.items():
+        terms = [tuple(tokenize(term)) for term in _as_list(raw.get(name))]
+        terms = [term for term in terms if term]
+        if terms:
+            rule.fields.append((target, terms))
+    return rule if rule.fields else None
+
+
+def _parse_json_object(text: str | None) -> dict:
+    if not text or not text.strip():
+        return {}
+    try:
+        raw = json.loads(text)
+    except json.JSONDecodeError:
+        logger.warning(
+            "Subscriptions are not valid JSON; sending every item to everyone",
+            extra={"event": "subscriptions_invalid"},
+        )
+        return {}
+    return raw if isinstance(raw, dict) else {}
+
+
+def parse_subscriptions(text: str | None) -> dict[str, list[SubscriptionRule]]:
+    subscriptions: dict[str, list[SubscriptionRule]] = {}
+    for recipient, entry in _parse_json_object(text).items():
+        if not isinstance(recipient, str):
+            continue
+        # Either a rule, a list of rules, or {"rules": [...], "policy": "..."}.
+        if isinstance(entry, dict) and ("rules" in entry or "policy" in entry):
+            entry = entry.get("rules", [])
+        entries = entry if isinstance(entry, list) else [entry]
+        parsed = [rule for rule in (parse_rule(recipient, raw) for raw in entries) if rule is not None]
+        if parsed:
+            subscriptions[recipient.strip().lower()] = parsed
+    return subscriptions
+
+
+def parse_delivery_policies(text: str | None) -> dict[str, str]:
+    policies: dict[str, str] = {}
+    for recipient, entry in _parse_json_object(text).items():
+        if isinstance(recipient, str) and isinstance(entry, dict) and isinstance(entry.get("policy"), str):
+            policies[recipient.strip().lower()] = entry["policy"]
+    return policies
+
+
+def load_subscription_text(env_value: str | None, *, file_path: str | Path | None = None) -> str | None:
+    if env_value and env_value.strip():
+        return env_value
+    return read_local_text(Path(file_path) if file_path else SUBSCRIPTIONS_FILE)
+
+
+def load_subscriptions(env_value: str | None, *, file_path: str | Path | None = None) -> dict[str, list[SubscriptionRule]]:
+    return parse_subscriptions(load_subscription_text(env_value, file_path=file_path))
+
+
+class SubscriptionIndex:
+    def __init__(self, subscriptions: dict[str, list[SubscriptionRule]]) -> None:
+        self.rules: list[SubscriptionRule] = [rule for rules in subscriptions.values() for rule in rules]
+        self.required_masks: list[int] = [(1 << len(rule.fields)) - 1 for rule in self.rules]
+        # term -> [(rule index, field bit)], split by the item text it is matched against.
+        self.author_terms: dict[tuple[str, ...], list[tuple[int, int]]] = {}
+        self.text_terms: dict[tuple[str, ...], list[tuple[int, int]]] = {}
+        self.max_term_length = 1
+        for rule_index, rule in enumerate(self.rules):
+            for field_index, (target, terms) in enumerate(rule.fields):
+                postings = self.author_terms if target == "author" else self.text_terms
+                for term in terms:
+                    postings.setdefault(term, []).append((rule_index, 1 << field_index))
+                    self.max_term_length = max(self.max_term_length, len(term))
+
+    def _scan(
+        self,
+        tokens: list[str],
+        postings: dict[tuple[str, ...], list[tuple[int, int]]],
+        hits: dict[int, int],
+    ) -> None:
+        if not postings:
+            return
+        for start in range(len(tokens)):
+            for length in range(1, min(self.max_term_length, len(tokens) - start) + 1):
+                for rule_index, bit in postings.get(tuple(tokens[start : start + length]), ()):
+                    hits[rule_index] = hits.get(rule_index, 0) | bit
+
+    def match(self, item: Announcement) -> set[str]:
+        hits: dict[int, int] = {}
+        self._scan(tokenize(item.author), self.author_terms, hits)
+        self._scan(tokenize(f"{item.title} {item.description or ''}"), self.text_terms, hits)
+        return {
+            self.rules[rule_index].recipient
+            for rule_index, mask in hits.items()
+            if mask == self.required_masks[rule_index]
+        }
+
+
+def match_items_per_recipient(
+    items: list[Announcement],
+    recipients: list[str],
+    subscriptions: dict[str, list[SubscriptionRule]],
+) -> dict[str, list[Announcement]]:
+    if not items or not recipients:
+        return {}
+    if not subscriptions:
+        return {recipient: list(items) for recipient in recipients}
+
+    index = SubscriptionIndex(subscriptions)
+    positions_by_recipient: dict[str, list[int]] = {}
+    for position, item in enumerate(items):
+        for recipient in index.match(item):
+            positions_by_recipient.setdefault(recipient, []).append(position)
+
+    matched: dict[str, list[Announcement]] = {}
+    for recipient in recipients:
+        key = recipient.strip().lower()
+        if key not in subscriptions:
+            # Recipients without rules keep receiving every announcement.
+            matched[recipient] = list(items)
+        elif positions_by_recipient.get(key):
+            matched[recipient] = [items[position] for position in positions_by_recipient[key]]
+    return matched
+
+
+def group_recipients_by_items(
+    items_by_recipient: dict[str, list[Announcement]],
+) -> list[tuple[list[Announcement], list[str]]]:
+    groups: dict[tuple[str, ...], tuple[list[Announcement], list[str]]] = {}
+    for recipient, items in items_by_recipient.items():
+        if not items:
+            continue
+        key = tuple(item.id for item in items)
+        groups.setdefault(key, (items, []))[1].append(recipient)
+    return list(groups.values())
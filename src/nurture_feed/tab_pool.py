@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from .logging_utils import logger
+from .metrics import metrics
+
+# A tab that cannot evaluate a trivial expression this quickly is hung or gone.
+HEALTH_CHECK_TIMEOUT_SECONDS = 2.0
+
+
+class TabPool:
+    """Long-lived detail tabs, at most ``size`` idle, health-checked before reuse.
+
+    A tab is replaced after a crash, failed navigation or login redirect, and after ``max_uses`` pages.
+    """
+
+    def __init__(
+        self,
+        context: Any,
+        size: int,
+        *,
+        max_uses: int,
+        on_open: Callable[[Any], Awaitable[None]] | None = None,
+    ) -> None:
+        self._context = context
+        self._size = max(1, size)
+        self._idle: list[Any] = []
+        self._uses: dict[Any, int] = {}
+        self._crashed: set[Any] = set()
+        self._max_uses = max(1, max_uses)
+        self._on_open = on_open
+
+    async def _open(self) -> Any:
+        page = await self._context.new_page()
+        page.on("crash", lambda crashed: self._crashed.add(crashed))
+        self._uses[page] = 0
+        metrics.increment("detail_tabs_opened")
+        if self._on_open is not None:
+            await self._on_open(page)
+        return page
+
+    async def _healthy(self, page: Any) -> bool:
+        if page in self._crashed or page.is_closed():
+            return False
+        try:
+            await asyncio.wait_for(page.evaluate("1"), HEALTH_CHECK_TIMEOUT_SECONDS)
+        except Exception:
+            return False
+        return True
+
+    async def _discard(self, page: Any, reason: str) -> None:
+        self._uses.pop(page, None)
+        self._crashed.discard(page)
+        logger.debug(
+            "Replacing detail tab (%s)",
+            reason,
+            extra={"event": "detail_tab_replaced", "reason": reason},
+        )
+        try:
+            await page.close()
+        except Exception:  # Crashed tabs may refuse to close; the context close reaps them.
+            pass
+
+    async def acquire(self) -> Any:
+        """Return a healthy tab, reusing an idle one when possible."""
+        while self._idle:
+            page = self._idle.pop()
+            if await self._healthy(page):
+                self._uses[page] += 1
+                return page
+            metrics.increment("detail_tabs_replaced")
+            await self._discard(page, "failed health check")
+        page = await self._open()
+        self._uses[page] = 1
+        return page
+
+    async def release(self, page: Any, *, replace: str | None = None) -> None:
+        """Return ``page`` to the pool; ``replace`` names why it must not be reused."""
+        if replace is None and page in self._crashed:
+            replace = "crashed"
+        if replace is not None:
+            metrics.increment("detail_tabs_replaced")
+            await self._discard(page, replace)
+        elif self._uses.get(page, 0) >= self._max_uses:
+            await self._discard(page, "reached max uses")
+        elif len(self._idle) >= self._size:
+            await self._discard(page, "pool full")
+        else:
+            self._idle.append(page)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for page in idle:
+            try:
+                await page.close()
+            except Exception:
+                pass
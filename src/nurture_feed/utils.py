@@ -1,18 +1,24 @@
 import hashlib
 import re
+from functools import cache
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from email.utils import format_datetime
 
-try:
-    import dateparser
-except ImportError:  # pragma: no cover - fallback path when dependency not installed yet
-    dateparser = None
-
 from .config import RECIPIENTS_FILE, SITE_TIMEZONE
 from .models import Announcement
 
 
+@cache
+def _dateparser():
+    # dateparser loads large locale tables on import; only pay for it when a date needs it.
+    try:
+        import dateparser
+    except ImportError:  # pragma: no cover - fallback path when dependency not installed yet
+        return None
+    return dateparser
+
+
 def normalize_whitespace(value: str | None) -> str | None:
     if value is None:
         return None
@@ -30,6 +36,37 @@ _RELATIVE_TIME_RE = re.compile(
 )
 
 
+# Finest to coarsest; used to decide whether a newly scraped date improves on a stored one.
+_DATE_PRECISION = {"exact": 0, "minute": 1, "hour": 2, "day": 3, "week": 4, "month": 5, "year": 6}
+DATE_PRECISION_UNKNOWN = 9
+_RELATIVE_UNIT_RE = re.compile(r"\b(?P<unit>min(?:ute)?|h(?:ou)?r|day|w(?:ee)?k|mo(?:nth)?|y(?:ea)?r)s?\b")
+_TIME_OF_DAY_RE = re.compile(r"\d{1,2}:\d{2}")
+
+
+def _relative_unit(unit: str) -> str:
+    if unit.startswith("mi"):
+        return "minute"
+    if unit.startswith("mo"):
+        return "month"
+    return {"h": "hour", "d": "day", "w": "week", "y": "year"}[unit[0]]
+
+
+def pub_date_precision(raw_date: str | None) -> tuple[int, bool]:
+    """Rank a scraped date as ``(precision, relative)``; smaller is better, absolute beats relative."""
+    text = normalize_whitespace(raw_date)
+    if not text:
+        return DATE_PRECISION_UNKNOWN, True
+    lowered = text.lower()
+    if lowered in {"just now", "moments ago"}:
+        return _DATE_PRECISION["minute"], True
+    if lowered in {"today", "yesterday"}:
+        return _DATE_PRECISION["day"], True
+    if "ago" in lowered.split():
+        match = _RELATIVE_UNIT_RE.search(lowered)
+        return (_DATE_PRECISION[_relative_unit(match.group("unit"))] if match else DATE_PRECISION_UNKNOWN), True
+    return (_DATE_PRECISION["exact"] if _TIME_OF_DAY_RE.search(text) else _DATE_PRECISION["day"]), False
+
+
 def estimate_pub_datetime(raw_date: str | None, *, now: datetime | None = None) -> str | None:
     if not raw_date:
         return None
@@ -42,6 +79,8 @@ def estimate_pub_datetime(raw_date: str | None, *, now: datetime | None = None)
         now = datetime.now(SITE_TIMEZONE)
     elif now.tzinfo is None:
         now = now.replace(tzinfo=SITE_TIMEZONE)
+    # Relative dates are only ever minute-precise; sub-second digits are noise.
+    now = now.replace(microsecond=0)
 
     lowered = text.lower()
     if lowered in {"just now", "moments ago"}:
@@ -65,6 +104,7 @@ def estimate_pub_datetime(raw_date: str | None, *, now: datetime | None = None)
             continue
 
     # Prefer a library parser for broader relative-date handling.
+    dateparser = _dateparser()
     if dateparser is not None:
         try:
             parsed = dateparser.parse(
@@ -110,7 +150,7 @@ def estimate_pub_datetime(raw_date: str | None, *, now: datetime | None = None)
     return estimated.isoformat()
 
 
-def to_rfc2822(raw_date: str | None) -> str | None:
+def parse_iso_datetime(raw_date: str | None) -> datetime | None:
     if not raw_date:
         return None
 
@@ -121,12 +161,28 @@ def to_rfc2822(raw_date: str | None) -> str | None:
     for value in candidates:
         try:
             dt = datetime.fromisoformat(value)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return format_datetime(dt)
         except ValueError:
             continue
-    return raw_date
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+    return None
+
+
+def to_rfc2822(raw_date: str | None) -> str | None:
+    if not raw_date:
+        return None
+    dt = parse_iso_datetime(raw_date)
+    if dt is None:
+        return raw_date
+    return format_datetime(dt)
+
+
+def format_rfc3339(dt: datetime) -> str:
+    text = dt.isoformat()
+    if text.endswith("+00:00"):
+        text = text[:-6] + "Z"
+    return text
 
 
 def parse_recipients(value: str | None) -> list[str]:
@@ -153,25 +209,26 @@ def load_recipients(env_value: str | None, *, file_path: str | Path | None = Non
     if recipients:
         return recipients
 
-    path = Path(file_path) if file_path else RECIPIENTS_FILE
+    text = read_local_text(Path(file_path) if file_path else RECIPIENTS_FILE)
+    if text is None:
+        return []
+
+    return parse_recipients(text)
+
+
+def read_local_text(path: Path) -> str | None:
     candidate_paths = [path]
     if not path.is_absolute():
         candidate_paths.append(Path(__file__).resolve().parents[2] / path)
 
-    text: str | None = None
     for candidate in candidate_paths:
         try:
-            text = candidate.read_text(encoding="utf-8")
-            break
+            return candidate.read_text(encoding="utf-8")
         except FileNotFoundError:
             continue
         except OSError:
             continue
-
-    if text is None:
-        return []
-
-    return parse_recipients(text)
+    return None
 
 
 def sort_announcements_for_feed(items: list[Announcement]) -> list[Announcement]:
@@ -0,0 +1,91 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from nurture_feed.benchmarking import (
+    DEFAULT_SIZES,
+    DEFAULT_THRESHOLD,
+    build_suite,
+    compare_to_baseline,
+    load_results,
+    run_suite,
+    save_results,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark extraction, dates, storage, feed writing and email rendering on synthetic data."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Fixture sizes to benchmark (default: 10 100 1000).",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case; median is compared (default: 5).")
+    parser.add_argument("--only", help="Run only cases whose name contains this text.")
+    parser.add_argument(
+        "--output",
+        default="benchmark_results.json",
+        help="Where to write the results (default: benchmark_results.json).",
+    )
+    parser.add_argument("--baseline", help="Baseline results JSON to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown versus the baseline as a fraction (default: {DEFAULT_THRESHOLD}).",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Also write the results to --baseline, replacing it.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    # The code under test logs every write; keep the table readable.
+    logging.getLogger().setLevel(logging.WARNING)
+
+    cases = build_suite(tuple(args.sizes))
+    if args.only:
+        cases = [case for case in cases if args.only in case.name]
+
+    def progress(result: dict) -> None:
+        print(f"{result['name']:<34} {result['size']:>7}  median {result['median_ms']:>10.3f} ms  best {result['best_ms']:>10.3f} ms")
+
+    results = run_suite(cases, repeat=args.repeat, progress=progress)
+    save_results(results, Path(args.output))
+    print(f"Results written to {args.output}")
+
+    if not args.baseline:
+        return 0
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        save_results(results, baseline_path)
+        print(f"Baseline updated at {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"Baseline {baseline_path} not found; run with --save-baseline to create it", file=sys.stderr)
+        return 1
+
+    regressions = compare_to_baseline(results, load_results(baseline_path), threshold=args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.key}: {regression.baseline_ms:.3f} ms -> {regression.current_ms:.3f} ms "
+            f"({regression.ratio:.2f}x)",
+            file=sys.stderr,
+        )
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} against {baseline_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
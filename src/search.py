@@ -0,0 +1,79 @@
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from nurture_feed.config import ARCHIVE_INDEX_FILE, SEARCH_INDEX_FILE
+from nurture_feed.search import SearchIndex
+from nurture_feed.storage import load_cache, parse_cached_item
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Search past announcements. Terms must all match; use "quoted phrases" and author:NAME.'
+    )
+    parser.add_argument("query", nargs="*", help='e.g. field trip "consent form" author:tan')
+    parser.add_argument("--author", help="Only announcements whose author contains these words.")
+    parser.add_argument("--limit", type=int, default=10, help="Results to show (default: 10).")
+    parser.add_argument("--index", default=str(SEARCH_INDEX_FILE), help=f"Index file (default: {SEARCH_INDEX_FILE}).")
+    parser.add_argument(
+        "--add-cache",
+        action="store_true",
+        help="First index everything in cache.json and the open archive page (one-time backfill).",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    return parser.parse_args()
+
+
+def backfill(index: SearchIndex) -> int:
+    items = load_cache()
+    try:
+        archive = json.loads(ARCHIVE_INDEX_FILE.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        archive = {}
+    if isinstance(archive, dict):
+        for entry in (archive.get("open_items") or []) + (archive.get("current") or []):
+            item = parse_cached_item(entry)
+            if item is not None:
+                items.append(item)
+    return index.update(items)
+
+
+def main() -> int:
+    args = parse_args()
+    started = time.perf_counter()
+    index = SearchIndex.load(Path(args.index))
+    load_ms = (time.perf_counter() - started) * 1000
+
+    if args.add_cache:
+        added = backfill(index)
+        if index.changed:
+            index.save()
+        print(f"Indexed {added} announcements from the cache", file=sys.stderr)
+
+    query = " ".join(args.query)
+    if not query and not args.author:
+        print(f"{len(index)} announcements indexed in {args.index}", file=sys.stderr)
+        return 0
+
+    started = time.perf_counter()
+    hits = index.search(query, author=args.author, limit=args.limit)
+    search_ms = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        print(json.dumps([asdict(hit) for hit in hits], indent=2, ensure_ascii=False))
+    else:
+        for hit in hits:
+            byline = " · ".join(part for part in (hit.author, hit.pub_date) if part)
+            print(f"{hit.score:7.3f}  {hit.title}\n         {byline}\n         {hit.link}")
+    print(
+        f"{len(hits)} result(s) from {len(index)} announcements; load {load_ms:.1f} ms, search {search_ms:.1f} ms",
+        file=sys.stderr,
+    )
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from nurture_feed.config import FEED_SERVER_HOST, FEED_SERVER_PORT
+from nurture_feed.feed_server import create_feed_server
+from nurture_feed.logging_utils import configure_logging, logger
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve generated feeds locally with ETag/Last-Modified revalidation and gzip."
+    )
+    parser.add_argument("--root", default=".", help="Directory containing feed.xml and friends (default: .).")
+    parser.add_argument("--host", default=FEED_SERVER_HOST, help=f"Bind address (default: {FEED_SERVER_HOST}).")
+    parser.add_argument("--port", type=int, default=FEED_SERVER_PORT, help=f"Bind port (default: {FEED_SERVER_PORT}).")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    configure_logging()
+    server = create_feed_server(Path(args.root), host=args.host, port=args.port)
+    logger.info(
+        "Feed server listening",
+        extra={"event": "feed_server_started", "url": f"http://{args.host}:{server.server_address[1]}/"},
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        counters = server.RequestHandlerClass.counters.snapshot()
+        logger.info(
+            "Feed server stopped; per-client hits: %s",
+            json.dumps(counters, ensure_ascii=True),
+            extra={"event": "feed_server_stopped", "count": len(counters)},
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+import json
+import os
+from pathlib import Path
+
+from nurture_feed.browser_profile import BrowserProfile
+
+
+def _write_auth(path: Path, token: str) -> None:
+    state = {
+        "cookies": [{"name": "sid", "value": token, "domain": "example.com", "path": "/"}],
+        "origins": [{"origin": "https://example.com", "localStorage": [{"name": "token", "value": token}]}],
+    }
+    path.write_text(json.dumps(state), encoding="utf-8")
+
+
+def test_seeding_follows_content_not_mtime(tmp_path: Path) -> None:
+    profile = BrowserProfile(tmp_path / "profile", max_bytes=1 << 20)
+    profile.path.mkdir()
+    auth = tmp_path / "auth.json"
+    _write_auth(auth, "one")
+
+    seed = profile.state_to_seed(str(auth))
+    assert seed is not None
+    assert seed["origins"][0]["localStorage"] == [{"name": "token", "value": "one"}]
+    profile.mark_seeded(str(auth))
+
+    # A rewrite with the same bytes and a newer mtime is not seeded again.
+    _write_auth(auth, "one")
+    os.utime(auth, (auth.stat().st_atime, auth.stat().st_mtime + 60))
+    assert profile.state_to_seed(str(auth)) is None
+
+    _write_auth(auth, "two")
+    assert profile.state_to_seed(str(auth)) is not None
+    # The run writing the profile's own state back counts as seeded.
+    profile.mark_seeded(str(auth), written_back=True)
+    assert profile.state_to_seed(str(auth)) is None
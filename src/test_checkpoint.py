@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from nurture_feed.checkpoint import RunCheckpoint
+from nurture_feed.config import CHECKPOINT_FLUSH_ITEMS
+from nurture_feed.models import Announcement
+
+
+def test_enriched_items_are_saved_in_batches(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "run_checkpoint.json"
+    checkpoint = RunCheckpoint(path, run_id="run")
+    writes = []
+    save = checkpoint.save
+    monkeypatch.setattr(checkpoint, "save", lambda: (writes.append(1), save()))
+
+    for number in range(CHECKPOINT_FLUSH_ITEMS * 2 + 3):
+        checkpoint.record_enriched(Announcement(id=str(number), title=f"Item {number}", link=f"https://x/{number}"))
+    assert len(writes) == 2
+    checkpoint.flush()
+    checkpoint.flush()
+    assert len(writes) == 3
+
+    resumed = RunCheckpoint.open(path)
+    assert resumed.resumed
+    assert len(resumed.enriched) == CHECKPOINT_FLUSH_ITEMS * 2 + 3
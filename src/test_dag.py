@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from nurture_feed.dag import Stage, StageGraph
+from nurture_feed.metrics import RunMetrics
+
+
+async def _value(_: dict) -> str:
+    return "ok"
+
+
+async def _boom(_: dict) -> None:
+    raise RuntimeError("boom")
+
+
+async def _after_boom(results: dict) -> str:
+    return results["optional"]
+
+
+def test_optional_stage_failure_does_not_cancel_others() -> None:
+    metrics = RunMetrics()
+    graph = StageGraph(
+        [
+            Stage("first", _value),
+            Stage("optional", _boom, after=("first",), essential=False),
+            Stage("dependent", _after_boom, after=("optional",)),
+            Stage("sibling", _value, after=("first",)),
+        ],
+        metrics=metrics,
+    )
+    for serial in (False, True):
+        results = asyncio.run(graph.execute(serial=serial))
+        assert results == {"first": "ok", "sibling": "ok"}
+    assert metrics.counters["optional_stage_failures"] == 2
+
+
+def test_essential_stage_failure_propagates() -> None:
+    graph = StageGraph([Stage("first", _boom), Stage("second", _value)])
+    with pytest.raises(RuntimeError):
+        asyncio.run(graph.execute())
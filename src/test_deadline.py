@@ -0,0 +1,60 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from nurture_feed import deadline as deadline_module
+from nurture_feed.deadline import RunDeadline, plan_enrichment
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(deadline_module, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+@pytest.fixture
+def run_deadline(monkeypatch: pytest.MonkeyPatch, clock: SimpleNamespace) -> RunDeadline:
+    run = RunDeadline()
+    run.start(600, reserve_seconds=120)
+    monkeypatch.setattr(deadline_module, "deadline", run)
+    return run
+
+
+def test_unstarted_deadline_never_clamps(monkeypatch: pytest.MonkeyPatch) -> None:
+    run = RunDeadline()
+    monkeypatch.setattr(deadline_module, "deadline", run)
+    assert run.available() == math.inf
+    assert run.clamp_timeout_ms(45000) == 45000
+    assert plan_enrichment(20, 3, per_page_seconds=10, minimum_seconds=30) == 20
+
+
+def test_clamp_timeout_near_and_past_the_reserve(run_deadline: RunDeadline, clock: SimpleNamespace) -> None:
+    assert run_deadline.clamp_timeout_ms(45000) == 45000
+    clock.value += 470  # 10 s of optional budget left, 130 s to the hard deadline
+    assert run_deadline.clamp_timeout_ms(45000) == 10000
+    assert run_deadline.clamp_timeout_ms(45000, essential=True) == 45000
+    clock.value += 20  # inside the reserve
+    assert run_deadline.available() == 0
+    assert run_deadline.clamp_timeout_ms(45000) == 1
+    assert run_deadline.clamp_timeout_ms(200000, essential=True) == 110000
+    clock.value += 500  # past the hard deadline
+    assert run_deadline.clamp_timeout_ms(45000, essential=True) == 1
+
+
+def test_plan_enrichment_runs_everything_with_time_to_spare(run_deadline: RunDeadline) -> None:
+    assert plan_enrichment(20, 3, per_page_seconds=10, minimum_seconds=30) == 20
+
+
+def test_plan_enrichment_shrinks_near_the_reserve(run_deadline: RunDeadline, clock: SimpleNamespace) -> None:
+    clock.value += 435  # 45 s left: four waves of three tabs
+    assert plan_enrichment(20, 3, per_page_seconds=10, minimum_seconds=30) == 12
+    assert plan_enrichment(5, 3, per_page_seconds=10, minimum_seconds=30) == 5
+
+
+def test_plan_enrichment_skips_past_the_reserve(run_deadline: RunDeadline, clock: SimpleNamespace) -> None:
+    clock.value += 455  # 25 s left, under the minimum
+    assert plan_enrichment(20, 3, per_page_seconds=10, minimum_seconds=30) == 0
+    clock.value += 100
+    assert plan_enrichment(20, 3, per_page_seconds=10, minimum_seconds=30) == 0
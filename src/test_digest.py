@@ -0,0 +1,90 @@
+import json
+from datetime import datetime, time, timedelta, timezone
+from pathlib import Path
+
+from nurture_feed.config import SITE_TIMEZONE
+from nurture_feed.digest import DigestQueue, parse_policy
+from nurture_feed.emailer import queue_email_notification
+from nurture_feed.models import Announcement
+from nurture_feed.outbox import Outbox, recipient_key
+
+NOW = datetime(2026, 3, 2, 1, 0, tzinfo=timezone.utc)
+
+
+def _item(number: int) -> Announcement:
+    return Announcement(
+        id=f"item-{number}",
+        title=f"Announcement {number}",
+        link=f"https://example.com/{number}",
+        pub_date=(NOW - timedelta(minutes=number)).isoformat(),
+    )
+
+
+def test_parse_policy() -> None:
+    assert parse_policy(None).immediate
+    assert parse_policy("immediate").immediate
+    policy = parse_policy("every:90, count:5, daily@07:30")
+    assert (policy.every_minutes, policy.max_items, policy.daily_at) == (90, 5, time(7, 30))
+    assert parse_policy("every:0").every_minutes == 1
+    assert parse_policy("bogus").immediate
+
+
+def test_policy_triggers() -> None:
+    every = parse_policy("every:60")
+    assert not every.is_due(queued=1, first_queued_at=NOW, last_flush_at=None, now=NOW + timedelta(minutes=59))
+    assert every.is_due(queued=1, first_queued_at=NOW, last_flush_at=None, now=NOW + timedelta(minutes=60))
+    assert not every.is_due(queued=0, first_queued_at=NOW, last_flush_at=None, now=NOW + timedelta(days=1))
+
+    count = parse_policy("count:3")
+    assert not count.is_due(queued=2, first_queued_at=NOW, last_flush_at=None, now=NOW)
+    assert count.is_due(queued=3, first_queued_at=NOW, last_flush_at=None, now=NOW)
+
+    daily = parse_policy("daily@08:00")
+    slot = datetime.combine(NOW.astimezone(SITE_TIMEZONE).date(), time(8, 0), tzinfo=SITE_TIMEZONE)
+    assert not daily.is_due(queued=1, first_queued_at=NOW, last_flush_at=None, now=slot - timedelta(minutes=1))
+    assert daily.is_due(queued=1, first_queued_at=NOW, last_flush_at=None, now=slot)
+    assert not daily.is_due(queued=1, first_queued_at=NOW, last_flush_at=slot, now=slot + timedelta(hours=1))
+
+
+def test_collect_due_keeps_items_until_marked(tmp_path: Path) -> None:
+    queue = DigestQueue(tmp_path / "digest_queue.json")
+    queue.add("a@example.com", [_item(1), _item(2)], now=NOW)
+    due = queue.collect_due(["a@example.com"], {}, parse_policy("immediate"), now=NOW)
+    assert [item.id for item in due["a@example.com"]] == ["item-1", "item-2"]
+    # Nothing is forgotten until the caller confirms the digest is safely queued.
+    assert queue.recipients[recipient_key("a@example.com")].items == ["item-1", "item-2"]
+
+    queue.add("a@example.com", [_item(3)], now=NOW)
+    queue.mark_flushed(due, now=NOW)
+    assert queue.recipients[recipient_key("a@example.com")].items == ["item-3"]
+
+
+def test_outbox_dedup_includes_recipients(tmp_path: Path) -> None:
+    outbox = Outbox(tmp_path / "outbox.json")
+    assert outbox.enqueue("subject", "plain", "<p>html</p>", ["a@example.com"], now=NOW) is not None
+    assert outbox.enqueue("subject", "plain", "<p>html</p>", ["A@example.com "], now=NOW) is None
+    assert outbox.enqueue("subject", "plain", "<p>html</p>", ["b@example.com"], now=NOW) is not None
+    assert len(outbox.messages) == 2
+
+
+def test_interval_digest_is_not_lost_to_an_earlier_immediate_mail(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("EMAIL_SENDER", "feed@example.com")
+    monkeypatch.setenv("EMAIL_PASSWORD", "secret")
+    monkeypatch.setenv("EMAIL_RECIPIENTS", "a@example.com,b@example.com")
+    monkeypatch.setenv("EMAIL_SUBSCRIPTIONS", json.dumps({"b@example.com": {"policy": "every:60"}}))
+    outbox = Outbox(tmp_path / "outbox.json")
+    queue = DigestQueue(tmp_path / "digest_queue.json")
+
+    # Run 1 mails A straight away; B's copy waits in the digest queue.
+    assert queue_email_notification([_item(1)], outbox=outbox, digest_queue=queue)
+    assert len(outbox.messages) == 1
+
+    # An hour later B's digest renders to the same bytes as A's mail, but it is a new message.
+    entry = queue.recipients[recipient_key("b@example.com")]
+    entry.first_queued_at = (datetime.now(timezone.utc) - timedelta(minutes=61)).isoformat()
+    assert queue_email_notification([], outbox=outbox, digest_queue=queue)
+    assert [message.pending for message in outbox.messages] == [
+        [recipient_key("a@example.com")],
+        [recipient_key("b@example.com")],
+    ]
+    assert entry.items == []
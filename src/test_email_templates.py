@@ -0,0 +1,42 @@
+from dataclasses import replace
+
+from benchmark_email import legacy_render, make_items
+from nurture_feed.email_templates import FragmentCache, render_digest
+from nurture_feed.models import Announcement
+
+
+def test_digest_matches_legacy_renderer() -> None:
+    items = make_items(5) + [Announcement(id="bare", title="No date & no author", link="https://x/?a=1&b=2")]
+    assert render_digest(items, cache=FragmentCache()) == legacy_render(items)
+
+
+def test_digest_is_identical_when_served_from_cache() -> None:
+    items = make_items(3)
+    cache = FragmentCache()
+    cold = render_digest(items, cache=cache)
+    assert render_digest(items, cache=cache) == cold
+    assert (cache.hits, cache.misses) == (3, 3)
+
+
+def test_changed_item_content_misses_the_cache() -> None:
+    item = make_items(1)[0]
+    cache = FragmentCache()
+    _, plain, page_html = render_digest([item], cache=cache)
+    edited = replace(item, title="Corrected title", description="New <details>")
+    _, edited_plain, edited_html = render_digest([edited], cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert "Corrected title" in edited_plain and item.title not in edited_plain
+    assert "New &lt;details&gt;" in edited_html
+    assert (edited_plain, edited_html) == legacy_render([edited])[1:]
+    assert render_digest([item], cache=cache)[1:] == (plain, page_html)
+    assert cache.hits == 1
+
+
+def test_cache_evicts_least_recently_used_fragment() -> None:
+    first, second, third = make_items(3)
+    cache = FragmentCache(max_size=2)
+    for item in (first, second, first, third):
+        cache.get(item)
+    cache.get(first)
+    cache.get(second)
+    assert (cache.hits, cache.misses) == (2, 4)
@@ -0,0 +1,43 @@
+import os
+import time
+from pathlib import Path
+
+from nurture_feed.feed_server import ArtifactStore
+
+
+def _write(path: Path, text: str, mtime: float) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_only_generated_artifacts_resolve(tmp_path: Path) -> None:
+    now = time.time()
+    for name in ("feed.xml", "feed.xml.gz", "atom.xml", "feed.json", "archive/feed-0001.xml", "auth.json", "cache.json"):
+        _write(tmp_path / name, "x", now)
+    _write(tmp_path / ".git" / "config", "x", now)
+    store = ArtifactStore(tmp_path)
+
+    assert store.resolve("/") == (tmp_path / "feed.xml").resolve()
+    for served in ("/feed.xml", "/feed.xml.gz", "/atom.xml", "/feed.json", "/archive/feed-0001.xml"):
+        assert store.resolve(served) is not None, served
+    for hidden in ("/auth.json", "/cache.json", "/.git/config", "/archive/../auth.json", "/%2e%2e/etc/passwd"):
+        assert store.resolve(hidden) is None, hidden
+
+
+def test_last_modified_moves_with_the_etag(tmp_path: Path) -> None:
+    path = tmp_path / "feed.xml"
+    _write(path, "<rss>one</rss>", 1_700_000_000)
+    store = ArtifactStore(tmp_path)
+    first = store.get(path)
+
+    # Same bytes rewritten later: nothing changed for clients.
+    _write(path, "<rss>one</rss>", 1_700_000_500)
+    same = store.get(path)
+    assert (same.etag, same.last_modified) == (first.etag, first.last_modified)
+
+    # An edited older item does not touch lastBuildDate, but the content changed.
+    _write(path, "<rss>one, edited</rss>", 1_700_000_000)
+    edited = store.get(path)
+    assert edited.etag != first.etag
+    assert edited.last_modified > first.last_modified
@@ -0,0 +1,25 @@
+import logging
+
+import pytest
+
+from nurture_feed.config import LOG_LEVEL
+from nurture_feed.logging_utils import configure_logging, shutdown_logging
+
+
+def test_misspelled_log_level_falls_back(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    monkeypatch.setenv("LOG_LEVEL", "verbose")
+    try:
+        configure_logging()
+        assert logging.getLogger().level == logging.getLevelNamesMapping()[LOG_LEVEL]
+    finally:
+        shutdown_logging()
+    assert '"event": "log_level_invalid"' in capsys.readouterr().out
+
+
+def test_log_level_is_case_insensitive(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LOG_LEVEL", " debug ")
+    try:
+        configure_logging()
+        assert logging.getLogger().level == logging.DEBUG
+    finally:
+        shutdown_logging()
@@ -0,0 +1,15 @@
+from nurture_feed.metrics import RunMetrics
+
+
+def test_annotations_are_nested() -> None:
+    metrics = RunMetrics()
+    metrics.annotate("deadline", {"budget_seconds": 60})
+    metrics.annotate("deadline", {"remaining_seconds": 5})
+    metrics.annotate("stages", {"clobbered": True})
+    report = metrics.report(exit_code=0)
+    assert report["annotations"] == {
+        "deadline": {"budget_seconds": 60, "remaining_seconds": 5},
+        "stages": {"clobbered": True},
+    }
+    # A section named like a built-in field no longer replaces it.
+    assert report["stages"] == {}
@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from nurture_feed import notifiers
+from nurture_feed.models import Announcement
+from nurture_feed.notifiers import EmailOutboxNotifier, Notifier, format_slack_payload, notify_channels
+
+
+def test_notifier_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        Notifier()
+
+
+def test_slack_link_is_escaped() -> None:
+    item = Announcement(id="1", title="Q&A <today>", link="https://example.com/?a=1&b=<2>|x")
+    text = format_slack_payload([item])[0]["blocks"][0]["text"]["text"]
+    assert text == "*<https://example.com/?a=1&amp;b=&lt;2&gt;%7Cx|Q&amp;A &lt;today&gt;>*"
+
+
+def test_email_notifier_reports_drain_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(notifiers, "drain_email_outbox", lambda **_: False)
+    assert asyncio.run(EmailOutboxNotifier().notify([])) is False
+
+
+def test_webhooks_have_their_own_switch(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("NOTIFY_WEBHOOKS", '[{"name": "hook", "url": "http://127.0.0.1:9/"}]')
+    monkeypatch.setattr(notifiers, "drain_email_outbox", lambda **_: True)
+    assert asyncio.run(notify_channels([], include_webhooks=False)) == {"email": True}
+    assert asyncio.run(notify_channels([], include_email=False)) == {"webhook:hook": True}
@@ -0,0 +1,88 @@
+import gzip
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from nurture_feed import rss_writer
+from nurture_feed.models import Announcement
+from nurture_feed.rss_writer import _rss_item, generate_rss_feed, xml_attr, xml_text
+from nurture_feed.settings import settings
+
+
+def _item(item_id: str, **fields: str) -> Announcement:
+    return Announcement(**{"id": item_id, "title": item_id, "link": f"https://x/{item_id}", **fields})
+
+
+def test_xml_text_escapes_markup_and_drops_control_characters() -> None:
+    assert xml_text("Q&A <b>\x00\x08\x0b ok\ttab\n") == "Q&amp;A &lt;b&gt; ok\ttab\n"
+    assert xml_attr('a&b "c"\n') == "a&amp;b &quot;c&quot;&#10;"
+
+
+def test_rss_item_is_well_formed_with_hostile_text() -> None:
+    item = _item("1&2", title="Fees & <dates>\x1f", description="line\x0cone <br> & two", author="A & B")
+    element = ElementTree.fromstring(
+        '<rss xmlns:dc="http://purl.org/dc/elements/1.1/">' + _rss_item(item, None) + "</rss>"
+    ).find("item")
+    assert element.findtext("title") == "Fees & <dates>"
+    assert element.findtext("description") == "lineone <br> & two"
+    assert element.findtext("guid") == "1&2"
+
+
+def test_identical_input_writes_identical_bytes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    items = [
+        _item("b", pub_date="2026-03-02T09:00:00+00:00", description="<p>second</p>"),
+        _item("a", pub_date="2026-03-01T09:00:00+00:00", author="Office & Co"),
+    ]
+    names = ("feed.xml", "atom.xml", "feed.json", "feed.xml.gz")
+    generate_rss_feed(items)
+    first = {name: Path(name).read_bytes() for name in names}
+    for name in names:
+        Path(name).unlink()
+    generate_rss_feed(items)
+    assert {name: Path(name).read_bytes() for name in names} == first
+    assert b"Office &amp; Co" in first["feed.xml"]
+
+
+class _FakeBrotli:
+    @staticmethod
+    def compress(data: bytes, quality: int) -> bytes:
+        return b"br:" + data
+
+
+def _dated(number: int) -> Announcement:
+    return _item(str(number), pub_date=f"2026-03-{number:02d}T09:00:00+00:00")
+
+
+def _links(path: str) -> dict[str, str]:
+    channel = ElementTree.parse(path).getroot().find("channel")
+    return {link.get("rel"): link.get("href") for link in channel.findall("{http://www.w3.org/2005/Atom}link")}
+
+
+def test_archive_pages_seal_and_link_back(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("FEED_BASE_URL", raising=False)
+    monkeypatch.setattr(rss_writer, "ARCHIVE_PAGE_SIZE", 2)
+    monkeypatch.setattr(rss_writer, "brotli", _FakeBrotli)
+    monkeypatch.setattr(settings, "max_feed_items", 2)
+
+    generate_rss_feed([_dated(n) for n in (5, 4, 3, 2, 1)])
+    first_page = Path("archive/feed-0001.xml").read_bytes()
+    assert b"<fh:archive/>" in first_page
+    assert [guid.text for guid in ElementTree.fromstring(first_page).iter("guid")] == ["2", "1"]
+    assert "prev-archive" not in _links("archive/feed-0001.xml")
+    assert _links("archive/feed-0002.xml") == {"current": "../feed.xml", "prev-archive": "feed-0001.xml"}
+    assert _links("feed.xml")["prev-archive"] == "archive/feed-0002.xml"
+    assert gzip.decompress(Path("archive/feed-0001.xml.gz").read_bytes()) == first_page
+    assert Path("archive/feed-0001.xml.br").read_bytes() == b"br:" + first_page
+
+    # The next run fills page two; page one is sealed and must not change.
+    generate_rss_feed([_dated(n) for n in (6, 5, 4, 3, 2, 1)])
+    assert Path("archive/feed-0001.xml").read_bytes() == first_page
+    second_page = ElementTree.parse("archive/feed-0002.xml").getroot()
+    assert [guid.text for guid in second_page.iter("guid")] == ["4", "3"]
+    assert not Path("archive/feed-0003.xml").exists()
+    assert _links("feed.xml")["prev-archive"] == "archive/feed-0002.xml"
+    assert gzip.decompress(Path("feed.xml.gz").read_bytes()) == Path("feed.xml").read_bytes()
+    assert Path("feed.xml.br").read_bytes() == b"br:" + Path("feed.xml").read_bytes()
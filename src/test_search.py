@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from nurture_feed.models import Announcement
+from nurture_feed.search import SearchIndex, parse_query, update_search_index
+
+
+def _item(item_id: str, title: str, description: str = "", author: str | None = None, day: int = 1) -> Announcement:
+    return Announcement(
+        id=item_id,
+        title=title,
+        link=f"https://x/{item_id}",
+        author=author,
+        description=description,
+        pub_date=f"2026-03-{day:02d}T00:00:00+00:00",
+    )
+
+
+def _index(tmp_path: Path) -> SearchIndex:
+    index = SearchIndex(tmp_path / "search_index.json")
+    index.update(
+        [
+            _item("title", "Sports day schedule", "Bring water.", author="Mrs Tan", day=1),
+            _item("body", "Weekly update", "The sports day is moved to Friday.", author="Mr Lim", day=2),
+            _item("other", "Library closed", "Books are due next week.", author="Mrs Tan", day=3),
+        ]
+    )
+    return index
+
+
+def test_parse_query() -> None:
+    parsed = parse_query('author:"Mrs Tan" "sports day" water')
+    assert parsed.author == ["mrs", "tan"]
+    assert parsed.phrases == [["sports", "day"]]
+    assert parsed.terms == ["water", "sports", "day"]
+
+
+def test_title_matches_rank_first(tmp_path: Path) -> None:
+    hits = _index(tmp_path).search("sports")
+    assert [hit.id for hit in hits] == ["title", "body"]
+    assert hits[0].score > hits[1].score > 0
+
+
+def test_phrase_author_and_missing_terms(tmp_path: Path) -> None:
+    index = _index(tmp_path)
+    assert [hit.id for hit in index.search('"day is moved"')] == ["body"]
+    assert [hit.id for hit in index.search('"moved day"')] == []
+    assert [hit.id for hit in index.search("author:tan")] == ["other", "title"]
+    assert index.search("sports unicorn") == []
+
+
+def test_reindexed_documents_keep_scores_positive(tmp_path: Path) -> None:
+    index = SearchIndex(tmp_path / "search_index.json")
+    index.update([_item(str(number), f"School notice {number}") for number in range(4)])
+    index.update([_item("0", "School notice 0", "Updated.")])
+    # The replaced posting is dead but not yet compacted; it must not make "school" look commoner
+    # than every live document.
+    assert len(index.docs) == 5 and len(index) == 4
+    hits = index.search("school")
+    assert len(hits) == 4
+    assert all(hit.score > 0 for hit in hits)
+
+
+def test_save_and_reload(tmp_path: Path) -> None:
+    index = _index(tmp_path)
+    index.save()
+    loaded = SearchIndex.load(index.path)
+    assert [hit.id for hit in loaded.search("library")] == ["other"]
+    assert loaded.update([]) == 0
+
+
+def test_list_page_copy_does_not_replace_enriched_document(tmp_path: Path) -> None:
+    path = tmp_path / "search_index.json"
+    enriched = _item("a", "Sports day schedule", "Bring water and a hat to the field.", author="Mrs Tan")
+    assert update_search_index([enriched], path) == 1
+    # The next run scrapes the same announcement from the list page only.
+    listed = _item("a", "Sports day schedule", "Bring water…")
+    new = _item("b", "Library closed", "Books are due next week.")
+    assert update_search_index([listed, new], path, reindex={"b"}) == 1
+
+    index = SearchIndex.load(path)
+    assert [hit.id for hit in index.search("author:tan")] == ["a"]
+    assert [hit.id for hit in index.search("hat")] == ["a"]
+    assert len(index.docs) == len(index) == 2
@@ -0,0 +1,35 @@
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from nurture_feed.session import SESSION_DEAD, SESSION_UNKNOWN, probe_session
+
+URL = "https://nurture.example.com/announcements"
+
+
+def _state(tmp_path: Path) -> Path:
+    path = tmp_path / "auth.json"
+    cookie = {"name": "sid", "value": "1", "domain": "nurture.example.com", "path": "/", "expires": -1}
+    path.write_text(json.dumps({"cookies": [cookie]}), encoding="utf-8")
+    return path
+
+
+def _respond_with(monkeypatch: pytest.MonkeyPatch, code: int, final_url: str) -> None:
+    def urlopen(request, timeout):
+        raise urllib.error.HTTPError(final_url, code, "denied", {}, None)
+
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+
+
+def test_bare_forbidden_is_unknown(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _respond_with(monkeypatch, 403, URL)
+    probe = probe_session(URL, storage_state_path=_state(tmp_path), timeout=1)
+    assert (probe.status, probe.http_status) == (SESSION_UNKNOWN, 403)
+
+
+def test_login_redirect_is_dead(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _respond_with(monkeypatch, 401, "https://nurture.example.com/login?next=/announcements")
+    assert probe_session(URL, storage_state_path=_state(tmp_path), timeout=1).status == SESSION_DEAD
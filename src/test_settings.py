@@ -0,0 +1,105 @@
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from nurture_feed import settings as settings_module
+from nurture_feed.config import DETAIL_ENRICH_LIMIT, SCRAPE_RETRIES
+from nurture_feed.settings import (
+    PROFILES,
+    Settings,
+    configure_settings,
+    parse_overrides,
+    resolve_settings,
+    settings,
+)
+
+
+def _write_config(tmp_path: Path, text: str) -> Path:
+    path = tmp_path / "nurture.toml"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_layers_apply_in_order(tmp_path: Path) -> None:
+    path = _write_config(
+        tmp_path,
+        "[settings]\nscrape_retries = 3\ndetail_enrich_limit = 7\nmax_feed_items = 40\n",
+    )
+    env = {"NURTURE_DETAIL_ENRICH_LIMIT": "9", "NURTURE_MAX_FEED_ITEMS": "30"}
+    resolved, sources, profile = resolve_settings(
+        profile="ci-fast", config_path=path, env=env, overrides={"max_feed_items": "20"}
+    )
+    assert profile == "ci-fast"
+    assert resolved.detail_navigation_timeout_ms == PROFILES["ci-fast"]["detail_navigation_timeout_ms"]
+    assert resolved.scrape_retries == 3
+    assert resolved.detail_enrich_limit == 9
+    assert resolved.max_feed_items == 20
+    assert resolved.max_cache_items == Settings().max_cache_items
+    assert sources["detail_navigation_timeout_ms"] == "profile:ci-fast"
+    assert sources["scrape_retries"] == f"file:{path}"
+    assert (sources["detail_enrich_limit"], sources["max_feed_items"], sources["max_cache_items"]) == (
+        "env",
+        "cli",
+        "default",
+    )
+
+
+def test_defaults_without_file_or_environment(tmp_path: Path) -> None:
+    resolved, sources, profile = resolve_settings(config_path=_write_config(tmp_path, ""), env={})
+    assert profile is None
+    assert (resolved.scrape_retries, resolved.detail_enrich_limit) == (SCRAPE_RETRIES, DETAIL_ENRICH_LIMIT)
+    assert set(sources.values()) == {"default"}
+
+
+def test_profile_can_come_from_file_and_environment(tmp_path: Path) -> None:
+    path = _write_config(tmp_path, 'profile = "backfill"\n[profiles.backfill]\ndetail_enrich_limit = 50\n')
+    resolved, _, profile = resolve_settings(config_path=path, env={})
+    assert (profile, resolved.detail_enrich_limit, resolved.scrape_retries) == ("backfill", 50, 5)
+    _, _, profile = resolve_settings(config_path=path, env={"NURTURE_PERF_PROFILE": "low-resource"})
+    assert profile == "low-resource"
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"scrape_retries": "0"},
+        {"scrape_retries": "two"},
+        {"scrape_retries": True},
+        {"run_deadline_seconds": "-1"},
+        {"no_such_setting": "1"},
+    ],
+)
+def test_invalid_values_are_rejected(tmp_path: Path, overrides: dict) -> None:
+    with pytest.raises(ValueError):
+        resolve_settings(config_path=_write_config(tmp_path, ""), env={}, overrides=overrides)
+
+
+def test_invalid_environment_value_and_unknown_profile_are_rejected(tmp_path: Path) -> None:
+    path = _write_config(tmp_path, "")
+    with pytest.raises(ValueError, match="detail_enrich_limit"):
+        resolve_settings(config_path=path, env={"NURTURE_DETAIL_ENRICH_LIMIT": "lots"})
+    with pytest.raises(ValueError, match="profile"):
+        resolve_settings(profile="turbo", config_path=path, env={})
+    with pytest.raises(ValueError, match="not found"):
+        resolve_settings(config_path=tmp_path / "missing.toml", env={})
+
+
+def test_parse_overrides() -> None:
+    assert parse_overrides(["max-feed-items=10", "scrape_retries=2"]) == {"max_feed_items": "10", "scrape_retries": "2"}
+    with pytest.raises(ValueError):
+        parse_overrides(["max_feed_items"])
+
+
+def test_configure_settings_updates_shared_object(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    for name, value in asdict(settings).items():
+        monkeypatch.setattr(settings, name, value)
+    for name in ("_sources", "_profile", "_configured"):
+        monkeypatch.setattr(settings_module, name, getattr(settings_module, name))
+    monkeypatch.setenv("NURTURE_SCRAPE_RETRIES", "4")
+    monkeypatch.delenv("NURTURE_PERF_PROFILE", raising=False)
+
+    configured = configure_settings(config_path=_write_config(tmp_path, ""), overrides={"max_feed_items": "12"})
+    assert configured is settings
+    assert (settings.scrape_retries, settings.max_feed_items) == (4, 12)
+    assert settings_module.settings_configured()
@@ -0,0 +1,93 @@
+import random
+from pathlib import Path
+
+from nurture_feed.models import Announcement
+from nurture_feed.simhash import FINGERPRINT_BITS, SimHashIndex, _band_masks, hamming_distance, link_reposts
+from nurture_feed.storage import anchor_dates, detect_new_items, load_cache, save_cache
+
+
+def _flip(value: int, bits: list[int]) -> int:
+    for bit in bits:
+        value ^= 1 << bit
+    return value
+
+
+def test_bands_cover_every_bit() -> None:
+    for max_distance in (0, 3, 6, 63, 100):
+        covered = 0
+        for shift, mask in _band_masks(max_distance):
+            assert covered >> shift & mask == 0
+            covered |= mask << shift
+        assert covered == (1 << FINGERPRINT_BITS) - 1
+
+
+def test_banded_lookup_matches_brute_force(tmp_path: Path) -> None:
+    rng = random.Random(7)
+    index = SimHashIndex(tmp_path / "index.json", max_distance=6)
+    base = rng.getrandbits(FINGERPRINT_BITS)
+    for number in range(300):
+        # Variants of one fingerprint at every distance up to 12, plus unrelated noise.
+        if number % 2:
+            index.add(f"id-{number}", _flip(base, rng.sample(range(FINGERPRINT_BITS), number % 13)))
+        else:
+            index.add(f"id-{number}", rng.getrandbits(FINGERPRINT_BITS))
+
+    for _ in range(50):
+        query = _flip(base, rng.sample(range(FINGERPRINT_BITS), rng.randint(0, 8)))
+        expected = min(
+            (hamming_distance(query, value) for value in index.fingerprints.values()),
+            default=None,
+        )
+        found = index.nearest(query)
+        if expected is None or expected > 6:
+            assert found is None
+        else:
+            assert found is not None and found[1] == expected
+
+
+def test_nearest_excludes_itself_and_survives_reload(tmp_path: Path) -> None:
+    path = tmp_path / "index.json"
+    index = SimHashIndex(path, max_distance=3)
+    index.add("a", 0b1011)
+    index.add("b", 0b1011 ^ (1 << 40) ^ (1 << 50))
+    assert index.nearest(0b1011, exclude="a") == ("b", 2)
+    index.reposts["b"] = "a"
+    index.save()
+
+    loaded = SimHashIndex.load(path, max_distance=3)
+    assert loaded.nearest(0b1011 ^ (1 << 60)) == ("a", 1)
+    assert loaded.original_of("b") == "a"
+
+
+def _notice(item_id: str, level: str) -> Announcement:
+    return Announcement(
+        id=item_id,
+        title=f"Reminder: {level} parents briefing",
+        link=f"https://x/{item_id}",
+        description=f"The {level} parents briefing is on Friday at 7pm in the school hall. Please register early.",
+        pub_date=f"2026-03-0{item_id[-1]}T00:00:00+00:00",
+    )
+
+
+def test_repost_link_survives_later_scrapes(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    def scrape() -> list[Announcement]:
+        # What the list page gives every run: no repost links.
+        return [_notice("post-2", "P3"), _notice("post-1", "P3")]
+
+    first = scrape()
+    cached_first = scrape()[1:]
+    assert save_cache(cached_first)
+    new_items = detect_new_items(first, load_cache())
+    assert [item.id for item in link_reposts(new_items, first)] == []
+    assert first[0].repost_of == "post-1"
+    anchor_dates(first, load_cache())
+    assert save_cache(first)
+
+    for _ in range(2):
+        again = scrape()
+        anchor_dates(again, load_cache())
+        assert detect_new_items(again, load_cache()) == []
+        assert again[0].repost_of == "post-1"
+        assert not save_cache(again)
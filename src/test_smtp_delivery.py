@@ -0,0 +1,64 @@
+import smtplib
+from email.message import EmailMessage
+
+from nurture_feed.smtp_delivery import SmtpSession, SmtpSettings, deliver_batch
+
+
+class FakeSmtp:
+    def __init__(self, *, drop_on: str, drops: int = 1) -> None:
+        self.drop_on = drop_on
+        self.drops = drops
+        self.data_calls = 0
+
+    def _maybe_drop(self, step: str) -> None:
+        if step == self.drop_on and self.drops:
+            self.drops -= 1
+            raise smtplib.SMTPServerDisconnected("connection closed")
+
+    def mail(self, from_addr: str) -> tuple[int, bytes]:
+        self._maybe_drop("mail")
+        return 250, b"ok"
+
+    def rcpt(self, address: str) -> tuple[int, bytes]:
+        return 250, b"ok"
+
+    def data(self, payload: bytes) -> tuple[int, bytes]:
+        self.data_calls += 1
+        self._maybe_drop("data")
+        return 250, b"queued"
+
+    def rset(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
+
+
+def _message() -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = "New announcements"
+    msg.set_content("hello")
+    return msg
+
+
+def _deliver(monkeypatch, fake: FakeSmtp):
+    monkeypatch.setattr(SmtpSession, "_connect", lambda self: fake)
+    return deliver_batch([(_message(), ["a@example.com"])], SmtpSettings(), from_addr="me@example.com")[0]
+
+
+def test_disconnect_before_data_is_retried(monkeypatch) -> None:
+    fake = FakeSmtp(drop_on="mail")
+    report = _deliver(monkeypatch, fake)
+    assert report.delivered == ["a@example.com"]
+    assert fake.data_calls == 1
+
+
+def test_disconnect_after_data_is_not_resent(monkeypatch) -> None:
+    fake = FakeSmtp(drop_on="data")
+    report = _deliver(monkeypatch, fake)
+    assert report.uncertain == ["a@example.com"]
+    assert not report.delivered and not report.failed
+    assert fake.data_calls == 1
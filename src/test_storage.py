@@ -0,0 +1,94 @@
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from nurture_feed.models import Announcement
+from nurture_feed.storage import RunLock, anchor_dates, merge_cache
+
+
+def _item(
+    item_id: str,
+    *,
+    first_seen: str | None = None,
+    pub_date: str | None = None,
+    pub_date_raw: str | None = None,
+) -> Announcement:
+    return Announcement(
+        id=item_id,
+        title=item_id,
+        link=f"https://x/{item_id}",
+        pub_date_raw=pub_date_raw,
+        pub_date=pub_date,
+        first_seen=first_seen,
+    )
+
+
+def test_run_lock_excludes_second_run(tmp_path: Path) -> None:
+    path = tmp_path / "run.lock"
+    first = RunLock(path, stale_after=timedelta(minutes=30))
+    second = RunLock(path, stale_after=timedelta(minutes=30))
+    assert first.acquire()
+    assert not second.acquire()
+    first.release()
+    assert not path.exists()
+    assert second.acquire()
+    second.release()
+
+
+def test_run_lock_takes_over_dead_owner(tmp_path: Path) -> None:
+    path = tmp_path / "run.lock"
+    old = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+    path.write_text(json.dumps({"token": "old", "acquired_at": old}), encoding="utf-8")
+    lock = RunLock(path, stale_after=timedelta(minutes=30))
+    assert lock.acquire()
+    assert lock.read_owner()["token"] == lock.token
+    lock.release()
+
+
+def test_run_lock_empty_file_is_held_until_stale(tmp_path: Path) -> None:
+    path = tmp_path / "run.lock"
+    path.write_text("", encoding="utf-8")
+    lock = RunLock(path, stale_after=timedelta(minutes=30))
+    assert not lock.acquire()
+    hour_ago = time.time() - 3600
+    os.utime(path, (hour_ago, hour_ago))
+    assert lock.acquire()
+    lock.release()
+
+
+def test_merge_cache_keeps_items_from_overlapping_run() -> None:
+    base = [_item("a"), _item("dropped")]
+    on_disk = [_item("a", first_seen="2026-01-01T00:00:00+00:00"), _item("dropped"), _item("other")]
+    mine = [_item("a", first_seen="2026-02-01T00:00:00+00:00"), _item("mine")]
+    merged = merge_cache(mine, on_disk, base)
+    assert {item.id for item in merged} == {"a", "mine", "other"}
+    assert next(item for item in merged if item.id == "a").first_seen == "2026-01-01T00:00:00+00:00"
+
+
+def test_anchor_dates_keeps_stored_relative_estimate() -> None:
+    seen_at = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+    cached = [
+        _item(
+            "a",
+            first_seen="2026-03-02T09:00:00+00:00",
+            pub_date="2026-03-02T06:00:00+00:00",
+            pub_date_raw="3 hours ago",
+        )
+    ]
+    current = [
+        _item("a", pub_date="2026-03-02T09:00:00+00:00", pub_date_raw="6 hours ago"),
+        _item("new", pub_date="2026-03-02T11:00:00+00:00", pub_date_raw="1 hour ago"),
+    ]
+    assert anchor_dates(current, cached, seen_at=seen_at) == 0
+    assert (current[0].pub_date, current[0].pub_date_raw) == ("2026-03-02T06:00:00+00:00", "3 hours ago")
+    assert current[0].first_seen == "2026-03-02T09:00:00+00:00"
+    assert current[1].first_seen == "2026-03-02T12:00:00+00:00"
+
+
+def test_anchor_dates_takes_more_precise_date() -> None:
+    cached = [_item("a", pub_date="2026-03-01T00:00:00+00:00", pub_date_raw="yesterday")]
+    current = [_item("a", pub_date="2026-03-01T14:30:00+00:00", pub_date_raw="March 1, 2026 2:30 PM")]
+    assert anchor_dates(current, cached) == 1
+    assert current[0].pub_date == "2026-03-01T14:30:00+00:00"
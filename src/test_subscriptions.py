@@ -0,0 +1,53 @@
+import json
+
+from nurture_feed.models import Announcement
+from nurture_feed.subscriptions import group_recipients_by_items, match_items_per_recipient, parse_subscriptions
+
+ITEMS = [
+    Announcement(id="1", title="P5 Science excursion", link="https://x/1", author="Ms Tan"),
+    Announcement(
+        id="2",
+        title="Reminder",
+        link="https://x/2",
+        author="Mr Lee",
+        description="Bring the signed consent form for the Science Centre trip.",
+    ),
+    Announcement(id="3", title="Canteen menu", link="https://x/3", author="Ms Tan Hui Min", description="P3 lunch"),
+]
+
+
+def _match(rules: dict, recipients: list[str]) -> dict[str, list[str]]:
+    matched = match_items_per_recipient(ITEMS, recipients, parse_subscriptions(json.dumps(rules)))
+    return {recipient: [item.id for item in items] for recipient, items in matched.items()}
+
+
+def test_keywords_match_title_and_description() -> None:
+    assert _match({"a@x": {"keywords": ["science"]}}, ["a@x"]) == {"a@x": ["1", "2"]}
+    assert _match({"a@x": {"keywords": ["consent form"]}}, ["a@x"]) == {"a@x": ["2"]}
+    # Phrases match whole consecutive tokens, not substrings.
+    assert _match({"a@x": {"keywords": ["consent science"]}}, ["a@x"]) == {}
+
+
+def test_author_matches_author_only() -> None:
+    assert _match({"a@x": {"author": "ms tan"}}, ["a@x"]) == {"a@x": ["1", "3"]}
+    assert _match({"a@x": {"author": "canteen"}}, ["a@x"]) == {}
+
+
+def test_rule_needs_every_field_and_any_rule_matches() -> None:
+    rules = {
+        "a@x": {"author": "Ms Tan", "classes": ["P5", "P6"]},
+        "b@x": [{"keywords": "menu"}, {"author": "Mr Lee"}],
+    }
+    assert _match(rules, ["A@x", "b@x", "everyone@x"]) == {
+        "A@x": ["1"],
+        "b@x": ["2", "3"],
+        "everyone@x": ["1", "2", "3"],
+    }
+
+
+def test_recipients_with_the_same_items_share_a_group() -> None:
+    matched = match_items_per_recipient(
+        ITEMS, ["a@x", "b@x", "c@x"], parse_subscriptions('{"a@x": {"keywords": "science"}, "b@x": {"keywords": "science"}}')
+    )
+    groups = [([item.id for item in items], recipients) for items, recipients in group_recipients_by_items(matched)]
+    assert groups == [(["1", "2"], ["a@x", "b@x"]), (["1", "2", "3"], ["c@x"])]
@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from nurture_feed import tab_pool
+from nurture_feed.tab_pool import TabPool
+
+
+class FakePage:
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.closed = False
+        self.broken = False
+        self.hung = False
+        self._handlers: dict[str, list] = {}
+
+    def on(self, event: str, handler) -> None:
+        self._handlers.setdefault(event, []).append(handler)
+
+    def crash(self) -> None:
+        for handler in self._handlers.get("crash", []):
+            handler(self)
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def evaluate(self, expression: str) -> int:
+        if self.hung:
+            await asyncio.sleep(10)
+        if self.broken:
+            raise RuntimeError("Target closed")
+        return 1
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.pages: list[FakePage] = []
+
+    async def new_page(self) -> FakePage:
+        page = FakePage(len(self.pages))
+        self.pages.append(page)
+        return page
+
+
+def _run(scenario) -> FakeContext:
+    context = FakeContext()
+    asyncio.run(scenario(context))
+    return context
+
+
+def test_idle_tab_is_reused() -> None:
+    async def scenario(context: FakeContext) -> None:
+        pool = TabPool(context, 2, max_uses=5)
+        page = await pool.acquire()
+        await pool.release(page)
+        assert await pool.acquire() is page
+
+    assert len(_run(scenario).pages) == 1
+
+
+def test_crashed_tab_is_replaced() -> None:
+    async def scenario(context: FakeContext) -> None:
+        pool = TabPool(context, 2, max_uses=5)
+        page = await pool.acquire()
+        page.crash()
+        await pool.release(page)
+        assert page.closed
+        assert await pool.acquire() is not page
+
+    assert len(_run(scenario).pages) == 2
+
+
+def test_crash_while_idle_fails_the_health_check() -> None:
+    async def scenario(context: FakeContext) -> None:
+        pool = TabPool(context, 2, max_uses=5)
+        page = await pool.acquire()
+        await pool.release(page)
+        page.crash()
+        assert await pool.acquire() is not page
+        assert page.closed
+
+    assert len(_run(scenario).pages) == 2
+
+
+@pytest.mark.parametrize("failure", ["broken", "hung", "closed"])
+def test_unhealthy_idle_tab_is_replaced(monkeypatch: pytest.MonkeyPatch, failure: str) -> None:
+    monkeypatch.setattr(tab_pool, "HEALTH_CHECK_TIMEOUT_SECONDS", 0.01)
+
+    async def scenario(context: FakeContext) -> None:
+        pool = TabPool(context, 2, max_uses=5)
+        page = await pool.acquire()
+        await pool.release(page)
+        setattr(page, failure, True)
+        fresh = await pool.acquire()
+        assert fresh is not page
+        assert page.closed
+
+    assert len(_run(scenario).pages) == 2
+
+
+def test_tab_is_retired_after_max_uses() -> None:
+    async def scenario(context: FakeContext) -> None:
+        pool = TabPool(context, 1, max_uses=2)
+        first = await pool.acquire()
+        await pool.release(first)
+        assert await pool.acquire() is first
+        await pool.release(first)
+        assert first.closed
+        assert await pool.acquire() is not first
+
+    assert len(_run(scenario).pages) == 2
+
+
+def test_release_with_replace_discards_the_tab() -> None:
+    async def scenario(context: FakeContext) -> None:
+        pool = TabPool(context, 2, max_uses=5)
+        page = await pool.acquire()
+        await pool.release(page, replace="login redirect")
+        assert page.closed
+        assert await pool.acquire() is not page
+
+    assert len(_run(scenario).pages) == 2
+
+
+def test_pool_keeps_at_most_size_idle_tabs() -> None:
+    async def scenario(context: FakeContext) -> None:
+        pool = TabPool(context, 1, max_uses=5)
+        first, second = await pool.acquire(), await pool.acquire()
+        await pool.release(first)
+        await pool.release(second)
+        assert second.closed and not first.closed
+        await pool.close()
+        assert first.closed
+
+    assert len(_run(scenario).pages) == 2